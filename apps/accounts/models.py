@@ -1,9 +1,10 @@
-import uuid
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from apps.common.ids import uuid7
+
 class User(AbstractUser):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     full_name = models.CharField(max_length=255, blank=True)
 
     def __str__(self):
@@ -0,0 +1,23 @@
+# apps/audit/admin.py
+from django.contrib import admin
+from . import models
+
+
+@admin.register(models.AuditEvent)
+class AuditEventAdmin(admin.ModelAdmin):
+    list_display = ("occurred_at", "action", "content_type", "object_pk", "company_id", "user")
+    list_filter = ("action", "content_type")
+    search_fields = ("object_pk",)
+    date_hierarchy = "occurred_at"
+    list_select_related = ("content_type", "user")
+    show_full_result_count = False  # count(*) sobre todas las particiones es caro
+
+    # sólo lectura: el log es append-only
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,15 @@
+# apps/audit/apps.py
+from django.apps import AppConfig
+
+
+class AuditConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.audit"
+    label = "audit"
+    verbose_name = "Audit"
+
+    def ready(self):
+        # Conecta los receivers de todos los TimeStampedModel
+        from . import signals
+
+        signals.connect_all()
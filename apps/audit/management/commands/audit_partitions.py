@@ -0,0 +1,18 @@
+# apps/audit/management/commands/audit_partitions.py
+from django.core.management.base import BaseCommand
+
+from apps.audit.partitions import ensure_partitions
+
+
+class Command(BaseCommand):
+    help = "Create upcoming monthly partitions of audit_event (PostgreSQL only). Run monthly from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=2)
+
+    def handle(self, *args, **opts):
+        created = ensure_partitions(opts["months_ahead"])
+        if not created:
+            self.stdout.write("Not PostgreSQL: audit_event is not partitioned.")
+        for name in created:
+            self.stdout.write(self.style.SUCCESS(name))
@@ -0,0 +1,25 @@
+# apps/audit/middleware.py
+from . import recorder
+
+
+class AuditMiddleware:
+    """
+    Acumula los eventos de auditoría del request y los escribe en un solo
+    INSERT al terminar. Va después de AuthenticationMiddleware.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        tokens = recorder.begin()
+        user_id = None
+        try:
+            response = self.get_response(request)
+            # request.user es perezoso: se resuelve al final (login incluido)
+            # y sólo si hubo cambios, para no leer la sesión de más
+            user = getattr(request, "user", None) if recorder.pending() else None
+            if user is not None and user.is_authenticated:
+                user_id = user.pk
+        finally:
+            recorder.end(tokens, user_id)
+        return response
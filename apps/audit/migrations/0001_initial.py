@@ -0,0 +1,98 @@
+# apps/audit/migrations/0001_initial.py
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+# En Postgres la tabla se particiona por mes sobre occurred_at; la PK debe
+# incluir la columna de partición. Otros motores (tests locales) usan la
+# tabla normal que describe el modelo.
+CREATE_PARTITIONED = """
+CREATE TABLE audit_event (
+    id bigint GENERATED BY DEFAULT AS IDENTITY,
+    occurred_at timestamp with time zone NOT NULL,
+    request_id uuid NULL,
+    user_id uuid NULL,
+    content_type_id integer NOT NULL,
+    object_pk varchar(64) NOT NULL,
+    company_id bigint NULL,
+    action varchar(10) NOT NULL,
+    changes jsonb NOT NULL,
+    PRIMARY KEY (id, occurred_at)
+) PARTITION BY RANGE (occurred_at);
+CREATE TABLE audit_event_default PARTITION OF audit_event DEFAULT;
+CREATE INDEX audit_event_object_idx ON audit_event (content_type_id, object_pk);
+CREATE INDEX audit_event_company_idx ON audit_event (company_id, occurred_at);
+"""
+
+
+def create_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.create_model(apps.get_model("audit", "AuditEvent"))
+        return
+    from apps.audit.partitions import ensure_partitions
+
+    schema_editor.execute(CREATE_PARTITIONED)
+    ensure_partitions(using=schema_editor.connection.alias)
+
+
+def drop_table(apps, schema_editor):
+    schema_editor.execute("DROP TABLE IF EXISTS audit_event CASCADE")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="AuditEvent",
+                    fields=[
+                        ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                        ("occurred_at", models.DateTimeField(default=django.utils.timezone.now)),
+                        ("request_id", models.UUIDField(blank=True, null=True)),
+                        ("object_pk", models.CharField(max_length=64)),
+                        ("company_id", models.BigIntegerField(blank=True, null=True)),
+                        ("action", models.CharField(
+                            choices=[("create", "Create"), ("update", "Update"),
+                                     ("delete", "Delete"), ("upsert", "Upsert")],
+                            max_length=10,
+                        )),
+                        ("changes", models.JSONField(
+                            default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder
+                        )),
+                        ("content_type", models.ForeignKey(
+                            db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING,
+                            related_name="+", to="contenttypes.contenttype",
+                        )),
+                        ("user", models.ForeignKey(
+                            blank=True, db_constraint=False, null=True,
+                            on_delete=django.db.models.deletion.DO_NOTHING,
+                            related_name="+", to=settings.AUTH_USER_MODEL,
+                        )),
+                    ],
+                    options={
+                        "verbose_name": "Audit event",
+                        "verbose_name_plural": "Audit events",
+                        "db_table": "audit_event",
+                        "ordering": ["-occurred_at"],
+                        "indexes": [
+                            models.Index(fields=["content_type", "object_pk"], name="audit_event_object_idx"),
+                            models.Index(fields=["company_id", "occurred_at"], name="audit_event_company_idx"),
+                        ],
+                    },
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_table, drop_table),
+            ],
+        ),
+    ]
@@ -0,0 +1,51 @@
+# apps/audit/models.py
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class AuditEvent(models.Model):
+    """
+    Cambio a nivel de campo sobre un TimeStampedModel. Sólo se inserta.
+
+    `changes` = {campo: [antes, después]} (JSONB). En Postgres la tabla está
+    particionada por mes sobre `occurred_at` (ver migración 0001 y el
+    comando audit_partitions); por eso la PK real es (id, occurred_at) y
+    las FKs no tienen constraint: borrar un usuario o tipo no toca el log.
+    """
+    class Action(models.TextChoices):
+        CREATE = "create", "Create"
+        UPDATE = "update", "Update"
+        DELETE = "delete", "Delete"
+        UPSERT = "upsert", "Upsert"  # escrituras en lote (bulk upsert de respuestas)
+
+    id = models.BigAutoField(primary_key=True)
+    occurred_at = models.DateTimeField(default=timezone.now)
+    request_id = models.UUIDField(null=True, blank=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True,
+        on_delete=models.DO_NOTHING, db_constraint=False, related_name="+",
+    )
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    object_pk = models.CharField(max_length=64)
+    # sin FK: el log sobrevive a la empresa
+    company_id = models.BigIntegerField(null=True, blank=True)
+    action = models.CharField(max_length=10, choices=Action.choices)
+    changes = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+
+    class Meta:
+        db_table = "audit_event"
+        verbose_name = "Audit event"
+        verbose_name_plural = "Audit events"
+        ordering = ["-occurred_at"]
+        indexes = [
+            models.Index(fields=["content_type", "object_pk"], name="audit_event_object_idx"),
+            models.Index(fields=["company_id", "occurred_at"], name="audit_event_company_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.occurred_at:%Y-%m-%d %H:%M} {self.action} {self.content_type_id}:{self.object_pk}"
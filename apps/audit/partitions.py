@@ -0,0 +1,58 @@
+# apps/audit/partitions.py
+"""
+Particiones mensuales de audit_event (sólo Postgres).
+
+La migración crea la tabla particionada con una partición DEFAULT para que
+un insert nunca falle; `ensure_partitions` crea por adelantado las de los
+próximos meses (comando audit_partitions, p. ej. desde cron).
+
+Si el cron no corrió, las filas del mes ya están en la DEFAULT y Postgres no
+deja crear la partición encima ("updated partition constraint for default
+partition would be violated"). En ese caso, en una transacción: se separa
+la DEFAULT, se crea el mes, se mueven sus filas y se vuelve a adjuntar.
+"""
+from datetime import date
+from typing import List
+
+from django.db import connections, transaction
+
+TABLE = "audit_event"
+DEFAULT = f"{TABLE}_default"
+
+
+def _month(d: date, offset: int) -> date:
+    index = d.year * 12 + d.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def ensure_partitions(months_ahead: int = 2, start: date = None, using: str = "default") -> List[str]:
+    """Crea (si faltan) las particiones desde el mes de `start` hasta `months_ahead` meses después."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return []
+    start = start or date.today()
+    created = []
+    for offset in range(months_ahead + 1):
+        lo, hi = _month(start, offset), _month(start, offset + 1)
+        name = f"{TABLE}_y{lo:%Y}m{lo:%m}"
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+            if not cursor.fetchone()[0]:
+                _create_partition(cursor, name, lo, hi)
+        created.append(name)
+    return created
+
+
+def _create_partition(cursor, name: str, lo: date, hi: date) -> None:
+    bounds = f"FOR VALUES FROM ('{lo.isoformat()}') TO ('{hi.isoformat()}')"
+    in_range = f"occurred_at >= '{lo.isoformat()}' AND occurred_at < '{hi.isoformat()}'"
+    cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT} WHERE {in_range})")
+    if not cursor.fetchone()[0]:
+        cursor.execute(f"CREATE TABLE {name} PARTITION OF {TABLE} {bounds}")
+        return
+    # DETACH bloquea audit_event hasta el commit: los inserts esperan, no fallan
+    cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT}")
+    cursor.execute(f"CREATE TABLE {name} PARTITION OF {TABLE} {bounds}")
+    cursor.execute(f"INSERT INTO {name} SELECT * FROM {DEFAULT} WHERE {in_range}")
+    cursor.execute(f"DELETE FROM {DEFAULT} WHERE {in_range}")
+    cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT} DEFAULT")
@@ -0,0 +1,88 @@
+# apps/audit/recorder.py
+"""
+Buffer de eventos de auditoría por request.
+
+Los receivers (signals.py) arman cada AuditEvent en memoria y lo agendan con
+transaction.on_commit: si la transacción hace rollback, el evento no existe.
+Dentro de un request (AuditMiddleware) los eventos confirmados se acumulan
+en un ContextVar y se escriben con UN bulk_create al final del request; fuera
+de un request (comandos, shell, workers) se escriben al confirmar.
+"""
+import logging
+import uuid
+from contextvars import ContextVar
+from functools import partial
+from typing import List, Optional
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from .models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+# None = no hay request activo
+_buffer: ContextVar[Optional[List[AuditEvent]]] = ContextVar("audit_buffer", default=None)
+_actor: ContextVar[tuple] = ContextVar("audit_actor", default=(None, None))  # (request_id, user_id)
+
+
+def begin(user_id=None):
+    """Abre el buffer del request. Devuelve los tokens para `end`."""
+    return _buffer.set([]), _actor.set((uuid.uuid4(), user_id))
+
+
+def pending() -> bool:
+    return bool(_buffer.get())
+
+
+def end(tokens, user_id=None) -> int:
+    """
+    Escribe lo acumulado (un solo INSERT) y cierra el buffer. `user_id`
+    completa los eventos sin usuario (el usuario se conoce al final del request).
+    """
+    events = _buffer.get() or []
+    buffer_token, actor_token = tokens
+    try:
+        for event in events:
+            if event.user_id is None:
+                event.user_id = user_id
+        _write(events)
+    finally:
+        _buffer.reset(buffer_token)
+        _actor.reset(actor_token)
+    return len(events)
+
+
+def _write(events: List[AuditEvent]):
+    if not events:
+        return
+    try:
+        AuditEvent.objects.bulk_create(events)
+    except Exception:
+        # la auditoría nunca debe tumbar la respuesta ya confirmada
+        logger.exception("No se pudieron escribir %s eventos de auditoría", len(events))
+
+
+def _collect(event: AuditEvent):
+    buffered = _buffer.get()
+    if buffered is None:
+        _write([event])
+    else:
+        buffered.append(event)
+
+
+def record(model, object_pk, action: str, changes: dict, company_id=None, using=None):
+    """Agenda un evento para cuando confirme la transacción en curso."""
+    if not changes:
+        return
+    request_id, user_id = _actor.get()
+    event = AuditEvent(
+        request_id=request_id,
+        user_id=user_id,
+        content_type=ContentType.objects.get_for_model(model),
+        object_pk=str(object_pk),
+        company_id=company_id,
+        action=action,
+        changes=changes,
+    )
+    transaction.on_commit(partial(_collect, event), using=using)
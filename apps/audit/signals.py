@@ -0,0 +1,104 @@
+# apps/audit/signals.py
+"""
+Diff a nivel de campo de todos los TimeStampedModel.
+
+El estado "antes" es el que dejó TimeStampedModel.from_db al leer la fila
+(`_loaded_values`, que TimeStampedModel.save actualiza después de post_save),
+así que auditar un save no cuesta ninguna consulta extra.
+Objetos construidos a mano (sin leer) se tratan como alta.
+"""
+from django.apps import apps as django_apps
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.signals import post_delete, post_save
+
+from apps.core.signals import companies_deleted, companies_merged
+from apps.inventory.models import TimeStampedModel
+from apps.profiles.models import Assessment, Response
+from apps.profiles.signals import responses_saved
+from . import recorder
+from .models import AuditEvent
+
+IGNORED = {"created_at", "updated_at", "search_vector"}  # search_vector: lo calcula un trigger
+
+# Modelos sin FK directa a la empresa: relación por la que se llega a ella
+COMPANY_VIA = ("equipment", "assessment")
+
+
+def _fields(model):
+    return [f for f in model._meta.concrete_fields if f.attname not in IGNORED and not f.primary_key]
+
+
+def _company_id(instance):
+    if hasattr(instance, "company_id"):
+        return instance.company_id
+    for name in COMPANY_VIA:
+        try:
+            field = instance._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        # sólo si la relación ya está en memoria: nada de consultas por save
+        if field.is_cached(instance):
+            return getattr(getattr(instance, name), "company_id", None)
+    return None
+
+
+def _saved(sender, instance, created=False, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    loaded = getattr(instance, "_loaded_values", None)
+    current = {f.attname: f.value_from_object(instance) for f in _fields(sender)}
+    if created or loaded is None:
+        action = AuditEvent.Action.CREATE
+        changes = {k: [None, v] for k, v in current.items() if v not in (None, "")}
+    else:
+        action = AuditEvent.Action.UPDATE
+        changes = {k: [loaded[k], v] for k, v in current.items() if k in loaded and loaded[k] != v}
+    recorder.record(sender, instance.pk, action, changes, _company_id(instance), using=using)
+
+
+def _deleted(sender, instance, using=None, **kwargs):
+    before = getattr(instance, "_loaded_values", None) or {
+        f.attname: f.value_from_object(instance) for f in _fields(sender)
+    }
+    pk = sender._meta.pk.attname
+    changes = {k: [v, None] for k, v in before.items() if k not in IGNORED and k != pk and v not in (None, "")}
+    recorder.record(sender, instance.pk, AuditEvent.Action.DELETE, changes, _company_id(instance), using=using)
+
+
+def _responses_upserted(sender, assessment, items=(), **kwargs):
+    # bulk upsert: no hay post_save ni valor anterior (no se lee antes de
+    # escribir). Un evento por escritura, sobre la evaluación.
+    changes = {
+        str(qid): [None, {"answer_value": value, "observations": observations}]
+        for qid, value, observations in items
+    }
+    recorder.record(Assessment, assessment.pk, AuditEvent.Action.UPSERT, changes, assessment.company_id)
+
+
+def _companies_deleted(sender, company_ids, report, **kwargs):
+    # borrado por conjuntos (apps.core.deletion): un evento por empresa con
+    # el conteo de la cascada en vez de uno por fila
+    counts = {label: count for label, count in report.deleted.items() if count}
+    for company_id in company_ids:
+        recorder.record(sender, company_id, AuditEvent.Action.DELETE, {"cascade": [counts, None]}, company_id)
+
+
+def _companies_merged(sender, target_id, source_ids, moved, **kwargs):
+    changes = {"merged_from": [None, source_ids]}
+    # filas de origen dadas de baja o borradas por chocar con las del destino (sin evento propio)
+    conflicts = {label[:-len(":conflicts")]: count for label, count in moved.items() if label.endswith(":conflicts")}
+    if conflicts:
+        changes["conflicts"] = [None, conflicts]
+    recorder.record(sender, target_id, AuditEvent.Action.UPDATE, changes, target_id)
+    for source_id in source_ids:
+        recorder.record(sender, source_id, AuditEvent.Action.DELETE, {"merged_into": [None, target_id]}, source_id)
+
+
+def connect_all():
+    for model in django_apps.get_models():
+        if issubclass(model, TimeStampedModel):
+            post_save.connect(_saved, sender=model, dispatch_uid=f"audit_save_{model._meta.label_lower}")
+            post_delete.connect(_deleted, sender=model, dispatch_uid=f"audit_delete_{model._meta.label_lower}")
+    responses_saved.connect(_responses_upserted, sender=Response, dispatch_uid="audit_responses_saved")
+    companies_deleted.connect(_companies_deleted, dispatch_uid="audit_companies_deleted")
+    companies_merged.connect(_companies_merged, dispatch_uid="audit_companies_merged")
@@ -0,0 +1,38 @@
+# apps/common/ids.py
+"""
+UUID ordenados por tiempo (versión 7, RFC 9562) para claves primarias.
+
+Los 48 bits altos son el instante en milisegundos: las filas nuevas caen al
+final del índice B-tree en vez de repartirse al azar como con uuid4, con
+menos divisiones de página y mejor localidad en caché. Siguen siendo UUID
+válidos, así que conviven con los uuid4 ya guardados.
+"""
+import secrets
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+_COUNTER_MAX = 0xFFF
+
+
+def uuid7() -> uuid.UUID:
+    """
+    48 bits de tiempo | versión | 12 bits de contador | variante | 62 aleatorios.
+    El contador (semilla aleatoria con margen) mantiene el orden dentro del
+    mismo milisegundo y si el reloj retrocede; al agotarse avanza el tiempo.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now = time.time_ns() // 1_000_000
+        if now > _last_ms:
+            _last_ms, _counter = now, secrets.randbits(11)
+        elif _counter < _COUNTER_MAX:
+            _counter += 1
+        else:
+            _last_ms, _counter = _last_ms + 1, secrets.randbits(11)
+        ms, counter = _last_ms, _counter
+    value = (ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | secrets.randbits(62)
+    return uuid.UUID(int=value)
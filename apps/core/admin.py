@@ -1,7 +1,9 @@
 from typing import Any, Dict
-from django.contrib import admin
+from django.apps import apps
+from django.contrib import admin, messages
 from django.contrib.auth import get_user_model
 from django.http import HttpRequest
+from .deletion import DeletionBlocked, delete_companies
 from .models import Organization, Company, AnalystCompany
 from .selectors import get_allowed_company_ids
 
@@ -81,6 +83,37 @@ class CompanyAdmin(CompanyScopedAdmin):
             data.setdefault("advisor", request.user.pk)
         return data
 
+    # Borrado por conjuntos (apps.core.deletion): el Collector cargaría en
+    # memoria todo el inventario y las respuestas de la empresa.
+    def get_deleted_objects(self, objs, request: HttpRequest):
+        try:
+            report = delete_companies([obj.pk for obj in objs], dry_run=True)
+        except DeletionBlocked as exc:
+            # la página de confirmación lo muestra como "protegido" y no deja borrar
+            return [], {}, set(), [str(exc)]
+        model_count, perms_needed = {}, set()
+        for label, count in report.deleted.items():
+            if not count:
+                continue
+            opts = apps.get_model(label)._meta
+            model_count[opts.verbose_name_plural] = count
+            if not request.user.has_perm(f"{opts.app_label}.delete_{opts.model_name}"):
+                perms_needed.add(opts.verbose_name)
+        deleted = [f"{name}: {count}" for name, count in model_count.items()]
+        return deleted, model_count, perms_needed, []
+
+    def delete_model(self, request: HttpRequest, obj: Company):
+        try:
+            delete_companies([obj.pk])
+        except DeletionBlocked as exc:
+            self.message_user(request, str(exc), messages.ERROR)
+
+    def delete_queryset(self, request: HttpRequest, queryset):
+        try:
+            delete_companies(list(queryset.values_list("pk", flat=True)))
+        except DeletionBlocked as exc:
+            self.message_user(request, str(exc), messages.ERROR)
+
     def save_model(self, request: HttpRequest, obj: Company, form, change: bool):
         """
         Garantiza que 'advisor' quede asignado al usuario actual si vino vacío.
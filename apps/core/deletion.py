@@ -0,0 +1,172 @@
+# apps/core/deletion.py
+"""
+Borrado en cascada por conjuntos, sin el Collector de Django.
+
+`delete()` sobre una empresa carga en memoria cada fila hija (equipos,
+mantenimientos, respuestas...) para emitir signals y resolver la cascada.
+Aquí el plan sale de los metadatos de los modelos (on_delete) y se ejecuta
+con DELETE por lotes de pk, hijos antes que padres: memoria constante y
+cada lote en su propia transacción. Como no hay signals por fila, los
+resúmenes derivados se mantienen con companies_deleting / companies_deleted.
+"""
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+
+from .signals import companies_deleted, companies_deleting
+
+COMPANY_MODEL = getattr(settings, "COMPANY_MODEL", "core.Company")
+CHUNK_SIZE = 5000
+
+
+class DeletionBlocked(ValueError):
+    pass
+
+
+@dataclass
+class DeletionReport:
+    deleted: Dict[str, int] = field(default_factory=dict)    # "app.Model" -> filas
+    nullified: Dict[str, int] = field(default_factory=dict)  # "app.Model.campo" -> filas
+    dry_run: bool = False
+
+    @property
+    def total(self) -> int:
+        return sum(self.deleted.values())
+
+    def summary(self) -> str:
+        prefix = "[simulación] " if self.dry_run else ""
+        return f"{prefix}{self.total} filas borradas en {len([n for n in self.deleted.values() if n])} tablas"
+
+
+@dataclass
+class _Plan:
+    paths: Dict[type, str]                          # modelo -> lookup hasta la pk raíz
+    order: List[type]                               # hijos antes que padres
+    nullify: List[Tuple[type, str, str]]            # (modelo, campo, lookup)
+    protected: List[Tuple[type, str]]               # (modelo, lookup)
+
+
+def reverse_relations(model):
+    # include_hidden: también las FK con related_name="+" y los through automáticos
+    return [
+        f for f in model._meta.get_fields(include_hidden=True)
+        if f.auto_created and not f.concrete and (f.one_to_many or f.one_to_one)
+    ]
+
+
+def build_plan(root) -> _Plan:
+    paths = {root: "pk"}
+    nullify, protected = [], []
+    queue = deque([root])
+    while queue:
+        parent = queue.popleft()
+        for rel in reverse_relations(parent):
+            child, lookup = rel.related_model, f"{rel.field.name}__{paths[parent]}"
+            if rel.on_delete is models.CASCADE:
+                if child not in paths:  # BFS: se queda con la ruta más corta
+                    paths[child] = lookup
+                    queue.append(child)
+            elif rel.on_delete is models.SET_NULL:
+                nullify.append((child, rel.field.name, lookup))
+            elif rel.on_delete in (models.PROTECT, models.RESTRICT):
+                protected.append((child, lookup))
+
+    # Orden: quien tenga una FK (con cualquier on_delete) hacia otro modelo
+    # del plan se borra antes que él
+    children = defaultdict(list)
+    for parent in paths:
+        for rel in reverse_relations(parent):
+            if rel.related_model in paths and rel.related_model is not parent:
+                children[parent].append(rel.related_model)
+
+    order, seen = [], set()
+
+    def visit(model):
+        if model in seen:
+            return
+        seen.add(model)
+        for child in children[model]:
+            visit(child)
+        order.append(model)
+
+    visit(root)
+    return _Plan(paths, order, nullify, protected)
+
+
+def check_protected(model, pks: Iterable, using: str = DEFAULT_DB_ALIAS, plan: Optional[_Plan] = None) -> None:
+    """
+    DeletionBlocked si alguna fila en PROTECT/RESTRICT que no se va a borrar
+    apunta al conjunto. Se revisa antes de avisar a nadie del borrado.
+    """
+    pks = list(pks)
+    plan = plan or build_plan(model)
+    for target, lookup in plan.protected:
+        qs = target._base_manager.using(using).filter(**{f"{lookup}__in": pks})
+        if target in plan.paths:
+            qs = qs.exclude(**{f"{plan.paths[target]}__in": pks})
+        if qs.exists():
+            raise DeletionBlocked(f"{target._meta.label} protege filas que se iban a borrar.")
+
+
+def bulk_delete(
+    model, pks: Iterable, dry_run: bool = False, chunk_size: int = CHUNK_SIZE, using: str = DEFAULT_DB_ALIAS
+) -> DeletionReport:
+    """
+    Borra las filas `pks` de `model` y todo lo que cuelga de ellas en CASCADE
+    (SET_NULL se resuelve con UPDATE). `dry_run` sólo cuenta.
+    """
+    pks = list(pks)
+    plan = build_plan(model)
+    report = DeletionReport(dry_run=dry_run)
+
+    def rows(target, lookup):
+        return target._base_manager.using(using).filter(**{f"{lookup}__in": pks})
+
+    def surviving(target, lookup):
+        # filas que apuntan al conjunto pero no caen en él
+        qs = rows(target, lookup)
+        return qs.exclude(**{f"{plan.paths[target]}__in": pks}) if target in plan.paths else qs
+
+    check_protected(model, pks, using, plan)
+
+    for target, name, lookup in plan.nullify:
+        qs = surviving(target, lookup)
+        label = f"{target._meta.label}.{name}"
+        report.nullified[label] = qs.count() if dry_run else qs.update(**{name: None})
+
+    for target in plan.order:
+        qs = rows(target, plan.paths[target])
+        label = target._meta.label
+        if dry_run:
+            report.deleted[label] = qs.count()
+            continue
+        report.deleted[label] = 0
+        while True:
+            with transaction.atomic(using=using):
+                batch = list(qs.values_list("pk", flat=True)[:chunk_size])
+                if not batch:
+                    break
+                # _raw_delete: un DELETE ... WHERE pk IN (...) sin Collector ni signals
+                report.deleted[label] += target._base_manager.using(using).filter(pk__in=batch)._raw_delete(using)
+    return report
+
+
+def delete_companies(
+    company_ids: Iterable[int], dry_run: bool = False, chunk_size: int = CHUNK_SIZE
+) -> DeletionReport:
+    """Borra empresas con todo su inventario, evaluaciones y resúmenes."""
+    Company = django_apps.get_model(COMPANY_MODEL)
+    company_ids = list(company_ids)
+    if dry_run:
+        return bulk_delete(Company, company_ids, dry_run=True)
+    # antes de la señal: si algo protege las filas, los receivers no deben
+    # haber tocado resúmenes de empresas que van a seguir existiendo
+    check_protected(Company, company_ids)
+    companies_deleting.send(sender=Company, company_ids=company_ids)
+    report = bulk_delete(Company, company_ids, chunk_size=chunk_size)
+    companies_deleted.send(sender=Company, company_ids=company_ids, report=report)
+    return report
@@ -1,5 +1,6 @@
 from django import forms
 from .models import Company
+from .nit import normalize_nit
 
 MUNICIPALITY_CHOICES = [
     ("Bogotá", "Bogotá"),
@@ -37,5 +38,8 @@ class CompanyForm(forms.ModelForm):
 
     def clean_tax_id(self):
         tax_id = self.cleaned_data["tax_id"].strip()
-        # Agrega reglas específicas si lo deseas
+        # mismo NIT escrito con o sin DV / separadores (ver core.nit)
+        normalized = normalize_nit(tax_id)
+        if normalized and Company.objects.filter(tax_id_normalized=normalized).exclude(pk=self.instance.pk).exists():
+            raise forms.ValidationError("Ya existe una empresa con este NIT.")
         return tax_id
@@ -0,0 +1,191 @@
+# apps/core/guards.py
+"""
+Límites de consultas por tipo de endpoint (settings.QUERY_GUARDS).
+
+Cada request se clasifica como "htmx" (tabs y fragmentos), "page",
+"admin" o "export" (vistas marcadas con @query_guard("export")) y recibe:
+
+- statement_timeout (Postgres, SET LOCAL) en los requests de lectura
+  (GET/HEAD), que corren en una transacción para que el límite no
+  sobreviva a la conexión reutilizada. Las escrituras NO se envuelven: eso
+  equivaldría a ATOMIC_REQUESTS en todo el sitio y, p. ej., el borrado de
+  empresas desde el admin dejaría de confirmar cada lote por separado. Sólo
+  heredan el límite si ya corren en la transacción de CompanyRLSMiddleware.
+- un máximo de filas: las listas que pasan por limit_rows() piden
+  max_rows + 1 filas (LIMIT en la consulta) y cortan con TooManyRows. Como
+  respaldo, cualquier SELECT que devuelva más de max_rows también se corta,
+  pero eso es DESPUÉS de que psycopg trajo todo el resultado: sólo evita
+  construir los objetos, no la lectura. Los .iterator() con cursor de
+  servidor no cuentan (las exportaciones por streaming pasan).
+
+Cada disparo se registra con el SQL en el logger "apps.core.guards" y el
+usuario recibe un mensaje en lugar de un 500.
+"""
+import logging
+from contextlib import ExitStack
+from typing import Optional
+
+from django.conf import settings
+from django.db import DatabaseError, DEFAULT_DB_ALIAS, connections, transaction
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.urls import Resolver404, resolve
+
+from . import replica
+
+logger = logging.getLogger(__name__)
+
+# SQLSTATE de Postgres para "canceling statement due to statement timeout"
+QUERY_CANCELED = "57014"
+
+DEFAULT_GUARDS = {
+    "htmx": {"timeout_ms": 5000, "max_rows": 20000},
+    "page": {"timeout_ms": 15000, "max_rows": 50000},
+    "admin": {"timeout_ms": 15000, "max_rows": 20000},
+    "export": {"timeout_ms": 120000, "max_rows": None},
+}
+
+
+class QueryGuardError(DatabaseError):
+    """Una consulta pasó el límite de su tipo de endpoint."""
+
+
+class TooManyRows(QueryGuardError):
+    pass
+
+
+class StatementTimeout(QueryGuardError):
+    pass
+
+
+def query_guard(endpoint_class: str):
+    """Asigna el tipo de endpoint de una vista (p. ej. "export" para descargas)."""
+    def decorator(view_func):
+        view_func.query_guard = endpoint_class
+        return view_func
+    return decorator
+
+
+def limits(endpoint_class: str) -> dict:
+    guards = getattr(settings, "QUERY_GUARDS", DEFAULT_GUARDS) or {}
+    return guards.get(endpoint_class) or {}
+
+
+def limit_rows(request, qs):
+    """
+    Evalúa `qs` con LIMIT max_rows + 1 según el tipo de endpoint del request;
+    TooManyRows si no cabe. Devuelve una lista (o el queryset, sin límite).
+    """
+    max_rows = getattr(request, "query_guard_max_rows", None)
+    if not max_rows:
+        return qs
+    limited = qs[:max_rows + 1]
+    rows = list(limited)
+    if len(rows) > max_rows:
+        logger.warning(
+            "Query guard (%s, rows) %s %s: más de %s filas | SQL: %s",
+            getattr(request, "query_guard", "?"), request.method, request.path, max_rows, limited.query,
+        )
+        request.query_guard_tripped = "rows"
+        raise TooManyRows(
+            f"La lista tiene más de {max_rows} filas; usa filtros más específicos."
+        )
+    return rows
+
+
+def endpoint_class(request) -> str:
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        match = None
+    explicit = getattr(match.func, "query_guard", None) if match else None
+    if explicit:
+        return explicit
+    if match and match.namespace == "admin":
+        return "admin"
+    if request.headers.get("HX-Request"):
+        return "htmx"
+    return "page"
+
+
+class _Guard:
+    """execute_wrapper: traduce timeouts y corta resultados demasiado grandes."""
+
+    def __init__(self, request, endpoint: str, max_rows: Optional[int]):
+        self.request = request
+        self.endpoint = endpoint
+        self.max_rows = max_rows
+
+    def _trip(self, kind: str, sql: str, detail: str) -> None:
+        logger.warning(
+            "Query guard (%s, %s) %s %s: %s | SQL: %s",
+            self.endpoint, kind, self.request.method, self.request.path, detail, sql,
+        )
+        self.request.query_guard_tripped = kind
+
+    def __call__(self, execute, sql, params, many, context):
+        try:
+            result = execute(sql, params, many, context)
+        except DatabaseError as exc:
+            if getattr(exc.__cause__, "sqlstate", None) == QUERY_CANCELED:
+                self._trip("timeout", sql, str(exc).strip())
+                raise StatementTimeout(
+                    f"La consulta superó el tiempo máximo de {self.endpoint}."
+                ) from exc
+            raise
+        cursor = context["cursor"]
+        if self.max_rows and cursor.description is not None and cursor.rowcount > self.max_rows:
+            self._trip("rows", sql, f"{cursor.rowcount} filas > {self.max_rows}")
+            raise TooManyRows(
+                f"La consulta devuelve {cursor.rowcount} filas (máximo {self.max_rows}); usa filtros más específicos."
+            )
+        return result
+
+
+class QueryGuardMiddleware:
+    """
+    Va después de CompanyRLSMiddleware y ReplicaMiddleware: se une a sus
+    transacciones (savepoint=False) y cubre también la réplica cuando el
+    request lee de ella.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        endpoint = endpoint_class(request)
+        conf = limits(endpoint)
+        if not conf:
+            return self.get_response(request)
+
+        aliases = [DEFAULT_DB_ALIAS]
+        if replica.reading_replica():
+            aliases.append(replica.REPLICA)
+        request.query_guard = endpoint
+        request.query_guard_max_rows = conf.get("max_rows")
+        guard = _Guard(request, endpoint, conf.get("max_rows"))
+        timeout = conf.get("timeout_ms")
+        reading = request.method in ("GET", "HEAD")
+
+        with ExitStack() as stack:
+            for alias in aliases:
+                conn = connections[alias]
+                # escrituras: sólo si ya hay transacción (RLS), sin abrir otra
+                if timeout and conn.vendor == "postgresql" and (reading or conn.in_atomic_block):
+                    stack.enter_context(transaction.atomic(using=alias, savepoint=False))
+                    with conn.cursor() as cursor:
+                        cursor.execute("SELECT set_config('statement_timeout', %s, true)", [str(int(timeout))])
+                stack.enter_context(conn.execute_wrapper(guard))
+            response = self.get_response(request)
+            if response.status_code >= 500 or getattr(request, "query_guard_tripped", None):
+                for alias in aliases:
+                    if connections[alias].in_atomic_block:
+                        transaction.set_rollback(True, using=alias)
+        return response
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, QueryGuardError):
+            return None
+        status = 503 if isinstance(exception, StatementTimeout) else 422
+        html = render_to_string("components/_query_guard.html", {"message": str(exception)}, request)
+        # HTMX no intercambia respuestas de error: el aviso va con 200 al target
+        return HttpResponse(html, status=200 if request.headers.get("HX-Request") else status)
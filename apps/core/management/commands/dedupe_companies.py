@@ -0,0 +1,38 @@
+# apps/core/management/commands/dedupe_companies.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.dedup import NAME_SIMILARITY, MergeError, find_candidates, merge_companies
+from apps.core.models import Company
+
+
+class Command(BaseCommand):
+    help = (
+        "List duplicate company candidates (same normalized NIT or similar names), "
+        "or merge companies into one with --merge TARGET SOURCE [SOURCE ...]."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threshold", type=float, default=NAME_SIMILARITY, help="Name trigram similarity.")
+        parser.add_argument("--merge", nargs="+", type=int, metavar="ID", help="Target id followed by source ids.")
+
+    def handle(self, *args, **opts):
+        if opts["merge"]:
+            target, *sources = opts["merge"]
+            try:
+                moved = merge_companies(target, sources)
+            except MergeError as exc:
+                raise CommandError(str(exc))
+            for label, count in moved.items():
+                if count:
+                    self.stdout.write(f"  {label}: {count}")
+            self.stdout.write(self.style.SUCCESS(f"Merged {sources} into {target}."))
+            return
+
+        candidates = find_candidates(opts["threshold"])
+        names = dict(
+            Company.objects.filter(pk__in={pk for c in candidates for pk in c.company_ids}).values_list("pk", "name")
+        )
+        for candidate in candidates:
+            a, b = candidate.company_ids
+            self.stdout.write(f"{candidate.reason:<4} {candidate.score:.2f}  {a}: {names[a]}  <->  {b}: {names[b]}")
+        self.stdout.write(self.style.SUCCESS(f"{len(candidates)} candidate pairs."))
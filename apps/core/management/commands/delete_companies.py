@@ -0,0 +1,29 @@
+# apps/core/management/commands/delete_companies.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.deletion import CHUNK_SIZE, DeletionBlocked, delete_companies
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete companies with all their inventory, assessments and summaries using set-based "
+        "deletes in chunks (no per-row signals). Use --dry-run to see the row counts first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("company_ids", nargs="+", type=int)
+        parser.add_argument("--dry-run", action="store_true", help="Only count the rows.")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **opts):
+        try:
+            report = delete_companies(opts["company_ids"], dry_run=opts["dry_run"], chunk_size=opts["chunk_size"])
+        except DeletionBlocked as exc:
+            raise CommandError(str(exc))
+        for label, count in report.deleted.items():
+            if count or opts["verbosity"] > 1:
+                self.stdout.write(f"  {label}: {count}")
+        for label, count in report.nullified.items():
+            if count:
+                self.stdout.write(f"  {label} -> NULL: {count}")
+        self.stdout.write(self.style.SUCCESS(report.summary()))
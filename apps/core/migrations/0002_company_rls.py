@@ -0,0 +1,71 @@
+from django.db import migrations
+
+# Sólo Postgres: políticas RLS por empresa. Leen app.allowed_company_ids
+# (ver apps/core/rls.py); sin valor no restringen. FORCE para que apliquen
+# también al dueño de las tablas, que es el usuario de la app.
+SCOPE = (
+    "coalesce(current_setting('app.allowed_company_ids', true), '') = '' "
+    "OR {column} = ANY (string_to_array(current_setting('app.allowed_company_ids', true), ',')::bigint[])"
+)
+# tabla -> condición; las tablas hijas delegan en la política del padre
+POLICIES = {
+    "core_company": SCOPE.format(column="id"),
+    "core_analystcompany": SCOPE.format(column="company_id"),
+    "inventory_equipment": SCOPE.format(column="company_id"),
+    "inventory_technicalservice": SCOPE.format(column="company_id"),
+    "inventory_workmethod": SCOPE.format(column="company_id"),
+    "inventory_plantlayout": SCOPE.format(column="company_id"),
+    "inventory_softwareasset": SCOPE.format(column="company_id"),
+    "inventory_disciplineassessment": SCOPE.format(column="company_id"),
+    "inventory_workforceprofile": SCOPE.format(column="company_id"),
+    "inventory_material": SCOPE.format(column="company_id"),
+    "inventory_investment": SCOPE.format(column="company_id"),
+    "inventory_equipmentmaintenance":
+        "EXISTS (SELECT 1 FROM inventory_equipment e WHERE e.id = equipment_id)",
+    "inventory_equipmentenergy":
+        "EXISTS (SELECT 1 FROM inventory_equipment e WHERE e.id = equipment_id)",
+    "profiles_assessment": SCOPE.format(column="company_id"),
+    "profiles_response":
+        "EXISTS (SELECT 1 FROM profiles_assessment a WHERE a.id = assessment_id)",
+    "reports_energy_mix": SCOPE.format(column="company_id"),
+    "reports_investment_rollup": SCOPE.format(column="company_id"),
+    "reports_dimension_score": SCOPE.format(column="company_id"),
+    "reports_inventory_snapshot": SCOPE.format(column="company_id"),
+}
+
+
+def create_policies(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, condition in POLICIES.items():
+        schema_editor.execute(f"""
+            ALTER TABLE {table} ENABLE ROW LEVEL SECURITY;
+            ALTER TABLE {table} FORCE ROW LEVEL SECURITY;
+            CREATE POLICY company_scope ON {table}
+                USING ({condition}) WITH CHECK ({condition});
+        """)
+
+
+def drop_policies(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in POLICIES:
+        schema_editor.execute(f"""
+            DROP POLICY IF EXISTS company_scope ON {table};
+            ALTER TABLE {table} NO FORCE ROW LEVEL SECURITY;
+            ALTER TABLE {table} DISABLE ROW LEVEL SECURITY;
+        """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('inventory', '0007_suggested_values'),
+        ('profiles', '0002_alter_question_sub_dimension'),
+        ('reports', '0004_inventory_snapshots'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_policies, drop_policies),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:04
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    from apps.core.nit import normalize_nit
+
+    Company = apps.get_model("core", "Company")
+    rows = [
+        Company(pk=pk, tax_id_normalized=normalize_nit(tax_id))
+        for pk, tax_id in Company.objects.values_list("pk", "tax_id").iterator()
+    ]
+    Company.objects.bulk_update(rows, ["tax_id_normalized"], batch_size=1000)
+
+
+def create_name_index(apps, schema_editor):
+    # Sólo Postgres: trigramas sobre el nombre para los candidatos de core.dedup
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("""
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX core_company_name_trgm_idx ON core_company USING gin (name gin_trgm_ops);
+    """)
+
+
+def drop_name_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS core_company_name_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_company_rls'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='tax_id_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RunPython(create_name_index, drop_name_index),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+# Sólo Postgres. El alcance del request (app.allowed_company_ids) se calcula
+# antes de que exista la empresa que el asesor está creando, así que
+# company_scope rechazaría el INSERT (y el RETURNING id, que pasa por la
+# política de SELECT). Estas políticas permiten ver y crear las empresas
+# cuyo asesor es el usuario del request (app.user_id, ver apps/core/rls.py),
+# igual que get_allowed_company_ids.
+ADVISOR = "advisor_id::text = current_setting('app.user_id', true)"
+
+
+def create_policies(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"""
+        CREATE POLICY company_advisor_insert ON core_company FOR INSERT WITH CHECK ({ADVISOR});
+        CREATE POLICY company_advisor_select ON core_company FOR SELECT USING ({ADVISOR});
+    """)
+
+
+def drop_policies(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("""
+        DROP POLICY IF EXISTS company_advisor_insert ON core_company;
+        DROP POLICY IF EXISTS company_advisor_select ON core_company;
+    """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_company_tax_id_normalized'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_policies, drop_policies),
+    ]
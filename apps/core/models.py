@@ -2,6 +2,8 @@
 from django.conf import settings
 from django.db import models
 
+from .nit import normalize_nit
+
 
 class Organization(models.Model):
     name = models.CharField(max_length=255)
@@ -30,6 +32,8 @@ class Company(models.Model):
     assessment_date = models.DateField(null=True, blank=True, verbose_name="Fecha")
     name = models.CharField(max_length=255, verbose_name="Nombre de la empresa")
     tax_id = models.CharField(max_length=64, unique=True, verbose_name="NIT")
+    # NIT sin separadores ni dígito de verificación (ver core.nit); bloque de deduplicación
+    tax_id_normalized = models.CharField(max_length=64, blank=True, db_index=True, editable=False)
     municipality = models.CharField(max_length=128, verbose_name="Municipio")
 
     contact_name = models.CharField(max_length=255, verbose_name="Nombre de contacto")
@@ -63,6 +67,13 @@ class Company(models.Model):
     def __str__(self):
         return f"{self.name} ({self.tax_id})"
 
+    def save(self, *args, **kwargs):
+        self.tax_id_normalized = normalize_nit(self.tax_id)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "tax_id" in update_fields:
+            kwargs["update_fields"] = set(update_fields) | {"tax_id_normalized"}
+        super().save(*args, **kwargs)
+
 
 class AnalystCompany(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="assigned_companies")
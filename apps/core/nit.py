@@ -0,0 +1,34 @@
+# apps/core/nit.py
+"""
+Normalización del NIT colombiano para detectar empresas duplicadas.
+
+'900.123.456-8', '900123456-8', '9001234568' y '900123456' son la misma
+empresa: se guarda la base sin separadores, sin ceros a la izquierda y sin
+dígito de verificación (DV). Sin guion, el último dígito sólo se toma por
+DV si cuadra con el cálculo de la DIAN.
+"""
+import re
+
+_NON_DIGITS = re.compile(r"\D")
+# Pesos de la DIAN, desde el dígito menos significativo
+_WEIGHTS = (3, 7, 13, 17, 19, 23, 29, 37, 41, 43, 47, 53, 59, 67, 71)
+
+
+def check_digit(base: str) -> int:
+    total = sum(int(d) * w for d, w in zip(reversed(base), _WEIGHTS))
+    rest = total % 11
+    return rest if rest < 2 else 11 - rest
+
+
+def normalize_nit(value: str) -> str:
+    value = (value or "").strip()
+    if not value:
+        return ""
+    if "-" in value:
+        base = _NON_DIGITS.sub("", value.rsplit("-", 1)[0])
+    else:
+        base = _NON_DIGITS.sub("", value)
+        # 9 dígitos de NIT de persona jurídica + DV pegado
+        if len(base) == 10 and check_digit(base[:-1]) == int(base[-1]):
+            base = base[:-1]
+    return base.lstrip("0")
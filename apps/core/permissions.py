@@ -18,6 +18,9 @@ class CompanyScopeMixin(View):
 
     @cached_property
     def _allowed_ids(self) -> Set[int]:
+        cached = getattr(self.request, "allowed_company_ids", None)
+        if cached is not None:
+            return cached
         user = getattr(self.request, "user", None)
         return get_allowed_company_ids(user)
 
@@ -59,7 +62,9 @@ def require_company_access(get_company_id):
             user = request.user
             if user.is_superuser:
                 return view_func(request, *args, **kwargs)
-            allowed = get_allowed_company_ids(user)
+            allowed = getattr(request, "allowed_company_ids", None)
+            if allowed is None:
+                allowed = get_allowed_company_ids(user)
             cid = get_company_id(request, *args, **kwargs)
             if cid in allowed:
                 return view_func(request, *args, **kwargs)
@@ -0,0 +1,176 @@
+# apps/core/replica.py
+"""
+Réplica de lectura opcional (alias "replica" en DATABASES).
+
+Sólo leen de la réplica los requests GET a vistas marcadas con
+@replica_reads (reportes y descargas) y los listados del admin; todo lo
+demás, en particular los tabs HTMX de CRUD, sigue en la primaria.
+
+- Si la réplica va más atrasada que REPLICA_MAX_LAG_SECONDS, o no responde,
+  esas lecturas vuelven a la primaria (se revisa cada REPLICA_CHECK_SECONDS).
+- Tras una escritura (POST/PUT/PATCH/DELETE) el navegador queda "anclado"
+  a la primaria durante REPLICA_MAX_LAG_SECONDS (cookie), para que vea lo
+  que acaba de guardar.
+- En código, `with use_primary():` fuerza la primaria aunque el request
+  esté en modo réplica.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, Error as DatabaseError, connections, transaction
+from django.urls import Resolver404, resolve
+
+from . import rls
+
+logger = logging.getLogger(__name__)
+
+REPLICA = "replica"
+PIN_COOKIE = "db_primary_pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_mode: ContextVar[Optional[str]] = ContextVar("db_read_mode", default=None)
+_health = {"checked_at": 0.0, "available": False}
+
+# En Postgres: segundos de atraso en aplicar WAL (0 si está al día o no es standby)
+LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+def configured() -> bool:
+    return REPLICA in settings.DATABASES
+
+
+def max_lag() -> float:
+    return getattr(settings, "REPLICA_MAX_LAG_SECONDS", 5)
+
+
+@contextmanager
+def use_replica():
+    """Lecturas a la réplica (si está sana), salvo dentro de use_primary()."""
+    if _mode.get() == "primary":
+        yield
+        return
+    token = _mode.set("replica")
+    try:
+        yield
+    finally:
+        _mode.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Todas las lecturas a la primaria, p. ej. justo después de escribir."""
+    token = _mode.set("primary")
+    try:
+        yield
+    finally:
+        _mode.reset(token)
+
+
+def replica_lag() -> Optional[float]:
+    """Atraso de la réplica en segundos, o None si no responde."""
+    conn = connections[REPLICA]
+    try:
+        with conn.cursor() as cursor:
+            # fuera de Postgres (tests) sólo comprobamos que responda
+            cursor.execute(LAG_SQL if conn.vendor == "postgresql" else "SELECT 0")
+            return float(cursor.fetchone()[0])
+    except DatabaseError:
+        logger.warning("Réplica no disponible; las lecturas van a la primaria", exc_info=True)
+        conn.close()
+        return None
+
+
+def replica_available() -> bool:
+    if not configured():
+        return False
+    now = time.monotonic()
+    if now - _health["checked_at"] >= getattr(settings, "REPLICA_CHECK_SECONDS", 5):
+        lag = replica_lag()
+        _health["available"] = lag is not None and lag <= max_lag()
+        _health["checked_at"] = now
+        if lag is not None and not _health["available"]:
+            logger.warning("Réplica atrasada %.1fs; las lecturas van a la primaria", lag)
+    return _health["available"]
+
+
+def reading_replica() -> bool:
+    """¿Las lecturas de este contexto van a la réplica?"""
+    return _mode.get() == "replica" and replica_available()
+
+
+def replica_reads(view_func):
+    """Marca una vista de sólo lectura (reporte, exportación) para leer de la réplica."""
+    view_func.replica_reads = True
+    return view_func
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if reading_replica():
+            return REPLICA
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # también para objetos leídos de la réplica (si no, Django usaría su _state.db)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        dbs = {DEFAULT_DB_ALIAS, REPLICA}
+        if obj1._state.db in dbs and obj2._state.db in dbs:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA
+
+
+class ReplicaMiddleware:
+    """
+    Decide por request si las lecturas van a la réplica. Va después de
+    CompanyRLSMiddleware: con RLS activo fija el mismo alcance en una
+    transacción de la réplica (las políticas también existen allá).
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _wants_replica(self, request) -> bool:
+        if request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES:
+            return False
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        if getattr(match.func, "replica_reads", False):
+            return True
+        return match.namespace == "admin" and (match.url_name or "").endswith("_changelist")
+
+    def __call__(self, request):
+        if not configured():
+            return self.get_response(request)
+
+        if not self._wants_replica(request) or not replica_available():
+            response = self.get_response(request)
+        else:
+            with use_replica():
+                allowed = getattr(request, "allowed_company_ids", None)
+                replica = connections[REPLICA]
+                if allowed is not None and rls.enabled(replica):
+                    with transaction.atomic(using=REPLICA):
+                        rls.set_scope(allowed, request.user.pk, using=replica)
+                        response = self.get_response(request)
+                else:
+                    response = self.get_response(request)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(PIN_COOKIE, "1", max_age=max(1, int(max_lag() + 1)), httponly=True, samesite="Lax")
+        return response
@@ -0,0 +1,67 @@
+# apps/core/rls.py
+"""
+Seguridad por filas (RLS) en Postgres, opcional con settings.COMPANY_RLS.
+
+Las políticas (migración core 0002) filtran cada tabla con empresa por la
+variable de sesión `app.allowed_company_ids`. Sin valor, no restringen nada:
+comandos, workers, migraciones y callbacks on_commit siguen viendo todo.
+Las altas de empresas no pueden estar en esa lista (aún no tienen id):
+core 0004 las permite cuando el asesor es el usuario de `app.user_id`.
+El middleware abre una transacción por request y fija las variables con
+SET LOCAL, así que no sobrevive al request aunque la conexión se reutilice
+(CONN_MAX_AGE o pgbouncer en modo transacción).
+"""
+from django.conf import settings
+from django.db import connection, transaction
+
+from .selectors import get_allowed_company_ids
+
+SETTING = "app.allowed_company_ids"
+USER_SETTING = "app.user_id"
+# ningún id real es 0: un usuario sin empresas no ve ninguna fila
+NO_COMPANIES = "0"
+
+
+def scope_value(company_ids) -> str:
+    return ",".join(str(int(cid)) for cid in sorted(company_ids)) or NO_COMPANIES
+
+
+def set_scope(company_ids, user_id=None, using=connection):
+    """Fija el alcance (y el usuario, para sus altas) hasta el final de la transacción en curso."""
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT set_config(%s, %s, true), set_config(%s, %s, true)",
+            [SETTING, scope_value(company_ids), USER_SETTING, "" if user_id is None else str(user_id)],
+        )
+
+
+def enabled(using=connection) -> bool:
+    return getattr(settings, "COMPANY_RLS", False) and using.vendor == "postgresql"
+
+
+class CompanyRLSMiddleware:
+    """
+    Envuelve el request en una transacción con el alcance del usuario.
+    El superusuario no fija la variable (sin filtro). Deja los ids en
+    request.allowed_company_ids para que los chequeos en Python no los
+    vuelvan a consultar.
+    Va después de AuditMiddleware, para que los eventos se confirmen
+    con la transacción del request.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user = getattr(request, "user", None)
+        if not enabled() or user is None or not user.is_authenticated or user.is_superuser:
+            return self.get_response(request)
+
+        allowed = get_allowed_company_ids(user)
+        with transaction.atomic():
+            set_scope(allowed, user.pk)
+            request.allowed_company_ids = allowed
+            response = self.get_response(request)
+            # las excepciones de la vista ya llegan aquí como respuesta 500
+            if response.status_code >= 500:
+                transaction.set_rollback(True)
+        return response
@@ -0,0 +1,14 @@
+# apps/core/signals.py
+from django.dispatch import Signal
+
+# Borrado masivo de empresas (apps.core.deletion): sin pre/post_delete por fila.
+# companies_deleting -> kwargs: company_ids (antes de borrar; las filas aún existen)
+# companies_deleted  -> kwargs: company_ids, report (DeletionReport)
+companies_deleting = Signal()
+companies_deleted = Signal()
+
+# Fusión de empresas (apps.core.dedup), dentro de la transacción de la fusión.
+# companies_merging -> kwargs: target_id, source_ids (antes de reasignar)
+# companies_merged  -> kwargs: target_id, source_ids, moved (filas por tabla)
+companies_merging = Signal()
+companies_merged = Signal()
@@ -0,0 +1,83 @@
+# apps/core/tests.py
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from . import replica
+from .models import Company
+
+
+@skipUnless(replica.REPLICA in settings.DATABASES, "Sin réplica configurada (DB_REPLICA_HOST)")
+class ReplicaRoutingTests(TestCase):
+    """
+    Corre con dos BDs locales: la de prueba de "default" y otra de "replica".
+    Las migraciones no corren en la réplica (allow_migrate), así que aquí
+    sólo se mira a qué alias va cada lectura, sin consultar tablas allá.
+    """
+    databases = {"default", replica.REPLICA}
+
+    def setUp(self):
+        replica._health.update(checked_at=0.0, available=False)
+        self.router = replica.ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def test_reads_go_to_primary_outside_use_replica(self):
+        self.assertEqual(self.router.db_for_read(Company), "default")
+        self.assertEqual(Company.objects.all().db, "default")
+
+    def test_reads_go_to_replica_inside_use_replica(self):
+        with replica.use_replica():
+            self.assertEqual(self.router.db_for_read(Company), replica.REPLICA)
+            self.assertEqual(Company.objects.all().db, replica.REPLICA)
+        self.assertEqual(Company.objects.all().db, "default")
+
+    def test_writes_always_go_to_primary(self):
+        with replica.use_replica():
+            self.assertEqual(self.router.db_for_write(Company), "default")
+
+    def test_falls_back_when_replica_does_not_answer(self):
+        with mock.patch.object(replica, "replica_lag", return_value=None), replica.use_replica():
+            self.assertEqual(self.router.db_for_read(Company), "default")
+
+    def test_falls_back_when_replica_lags(self):
+        lag = settings.REPLICA_MAX_LAG_SECONDS + 1
+        with mock.patch.object(replica, "replica_lag", return_value=lag), replica.use_replica():
+            self.assertEqual(self.router.db_for_read(Company), "default")
+
+    def test_use_primary_overrides_replica_mode(self):
+        with replica.use_replica():
+            with replica.use_primary():
+                self.assertEqual(self.router.db_for_read(Company), "default")
+                with replica.use_replica():
+                    self.assertEqual(self.router.db_for_read(Company), "default")
+            self.assertEqual(self.router.db_for_read(Company), replica.REPLICA)
+
+    def _reads_replica(self, request):
+        seen = {}
+
+        def view(req):
+            seen["replica"] = replica.reading_replica()
+            return HttpResponse()
+
+        response = replica.ReplicaMiddleware(view)(request)
+        return seen["replica"], response
+
+    def test_report_get_reads_from_replica(self):
+        reads, _ = self._reads_replica(self.factory.get("/reports/capability/"))
+        self.assertTrue(reads)
+
+    def test_post_pins_the_browser_to_primary(self):
+        reads, response = self._reads_replica(self.factory.post("/reports/capability/"))
+        self.assertFalse(reads)
+        self.assertIn(replica.PIN_COOKIE, response.cookies)
+
+        request = self.factory.get("/reports/capability/")
+        request.COOKIES[replica.PIN_COOKIE] = response.cookies[replica.PIN_COOKIE].value
+        reads, _ = self._reads_replica(request)
+        self.assertFalse(reads)
+
+    def test_htmx_crud_stays_on_primary(self):
+        reads, _ = self._reads_replica(self.factory.get("/inventory/equipment/1/list/", HTTP_HX_REQUEST="true"))
+        self.assertFalse(reads)
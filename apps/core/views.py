@@ -12,6 +12,8 @@ from django.shortcuts import redirect
 from .models import Company
 from .permissions import CompanyScopeMixin
 from .forms import CompanyForm
+from apps.reports.benchmarks import company_benchmarks
+from apps.reports.snapshots import company_snapshots
 
 @login_required(login_url="/admin/login/")
 def company_list(request):
@@ -46,6 +48,12 @@ class CompanyDetailView(LoginRequiredMixin, PermissionRequiredMixin, CompanyScop
     template_name = "core/company_detail.html"
     is_company_model = True
 
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["benchmarks"] = company_benchmarks(self.object.pk)
+        ctx["snapshots"] = company_snapshots(self.object.pk)
+        return ctx
+
 class CompanyCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     permission_required = "core.add_company"
     model = Company
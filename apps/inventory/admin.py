@@ -7,7 +7,8 @@ from . import models
 class EquipmentMaintenanceInline(admin.TabularInline):
     model = models.EquipmentMaintenance
     extra = 1
-    fields = ("maintenance_type", "frequency", "last_date", "notes")
+    fields = ("maintenance_type", "frequency", "last_date", "next_due_date", "notes")
+    readonly_fields = ("next_due_date",)
     show_change_link = True
 
 
@@ -132,3 +133,11 @@ class EquipmentEnergyAdmin(admin.ModelAdmin):
     search_fields = ("equipment__name", "energy_source__name", "notes")
     raw_id_fields = ("equipment", "energy_source")
     readonly_fields = ("created_at", "updated_at")
+
+
+@admin.register(models.SuggestedValue)
+class SuggestedValueAdmin(admin.ModelAdmin):
+    list_display = ("value", "kind", "usage_count", "updated_at")
+    list_filter = ("kind",)
+    search_fields = ("normalized", "value")
+    ordering = ("kind", "-usage_count")
@@ -6,3 +6,6 @@ class InventoryConfig(AppConfig):
     name = "apps.inventory"   # <- IMPORTANTÍSIMO: ruta completa del paquete
     label = "inventory"       # (opcional) el app label para "makemigrations inventory"
     verbose_name = "Inventory"
+
+    def ready(self):
+        from . import signals  # noqa: F401
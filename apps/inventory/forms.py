@@ -13,7 +13,11 @@ from .models import (
     Investment,
 )
 from datetime import date
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.html import format_html
+
+from .options import energy_source_choices, equipment_choices
 
 BASE_INPUT = (
     "block w-full rounded-lg border border-gray-300 bg-white "
@@ -37,6 +41,29 @@ BASE_DATE = (
 BASE_SELECT_MULTI = BASE_SELECT + " h-36"
 
 
+class SuggestInput(forms.TextInput):
+    """
+    TextInput con <datalist> que se llena vía HTMX con valores ya usados en
+    el portafolio (inventory.suggestions), para no escribir variantes nuevas.
+    """
+    def __init__(self, kind, attrs=None):
+        self.kind = kind
+        super().__init__(attrs)
+
+    def render(self, name, value, attrs=None, renderer=None):
+        attrs = dict(attrs or {})
+        list_id = f"{attrs.get('id') or name}-suggestions"
+        attrs.update({
+            "list": list_id,
+            "autocomplete": "off",
+            "hx-get": reverse("inventory:suggest", args=[self.kind]),
+            "hx-trigger": "input changed delay:150ms",
+            "hx-target": f"#{list_id}",
+            "hx-sync": "this:replace",
+        })
+        return super().render(name, value, attrs, renderer) + format_html('<datalist id="{}"></datalist>', list_id)
+
+
 class EquipmentForm(forms.ModelForm):
     class Meta:
         model = Equipment
@@ -93,6 +120,9 @@ class EquipmentForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # opciones desde caché; el queryset del campo sigue validando el POST
+        selected = [getattr(v, "pk", v) for v in self.initial.get("energy_sources") or ()]
+        self.fields["energy_sources"].choices = energy_source_choices(selected)
         # defaults suaves
         self.fields["quantity"].initial = self.fields["quantity"].initial or 1
         self.fields["purchase_year"].initial = (
@@ -129,12 +159,12 @@ class TechnicalServiceForm(forms.ModelForm):
             "service_location": forms.Select(
                 attrs={"class": BASE_SELECT, "data-placeholder": "Selecciona el lugar"}
             ),
-            "provider_name": forms.TextInput(
+            "provider_name": SuggestInput(
+                "provider",
                 attrs={
                     "class": BASE_INPUT,
                     "placeholder": "Nombre del proveedor",
-                    "autocomplete": "off",
-                }
+                },
             ),
             "service_description": forms.TextInput(
                 attrs={
@@ -223,16 +253,18 @@ class MaintenanceForm(forms.ModelForm):
         company = kwargs.pop("company", None)
         super().__init__(*args, **kwargs)
 
-        # Filtra equipos por empresa si se pasó `company`
+        # Filtra equipos por empresa si se pasó `company`; las opciones salen
+        # de caché y el queryset sólo se usa para validar el POST
         if company is not None:
             self.fields["equipment"].queryset = Equipment.objects.filter(  # type: ignore
                 company=company
             ).order_by(
                 "name"
             )
-
-        # Etiquetas vacías amigables
-        self.fields["equipment"].empty_label = "---------"  # type: ignore
+            self.fields["equipment"].choices = [("", "---------")] + equipment_choices(company.pk)
+        else:
+            # Etiquetas vacías amigables
+            self.fields["equipment"].empty_label = "---------"  # type: ignore
         self.fields["frequency"].required = False  # ya está blank=True, explicitamos
 
     def clean_last_date(self):
@@ -285,7 +317,7 @@ class SoftwareAssetForm(forms.ModelForm):
         fields = ["usage", "name", "description", "area"]
         widgets = {
             "usage": forms.Select(attrs={"class": BASE_SELECT}),
-            "name": forms.TextInput(attrs={"class": BASE_INPUT, "placeholder": "Nombre del software"}),
+            "name": SuggestInput("software", attrs={"class": BASE_INPUT, "placeholder": "Nombre del software"}),
             "description": forms.Textarea(
                 attrs={"class": BASE_TEXTAREA, "rows": 3, "placeholder": "Notas o alcance"}
             ),
@@ -349,7 +381,7 @@ class MaterialForm(forms.ModelForm):
         ]
         widgets = {
             "category": forms.Select(attrs={"class": BASE_SELECT}),
-            "name": forms.TextInput(attrs={"class": BASE_INPUT, "placeholder": "Nombre del material"}),
+            "name": SuggestInput("material", attrs={"class": BASE_INPUT, "placeholder": "Nombre del material"}),
             "origin": forms.Select(attrs={"class": BASE_SELECT}),
             "inventory_management": forms.Select(attrs={"class": BASE_SELECT}),
             "cost_share_pct": forms.NumberInput(
@@ -386,7 +418,9 @@ class InvestmentForm(forms.ModelForm):
                 attrs={"class": BASE_INPUT, "min": 0, "step": 0.01}
             ),
             "funding_source": forms.Select(attrs={"class": BASE_SELECT}),
-            "funding_entity": forms.TextInput(attrs={"class": BASE_INPUT, "placeholder": "Entidad (opcional)"}),
+            "funding_entity": SuggestInput(
+                "funding_entity", attrs={"class": BASE_INPUT, "placeholder": "Entidad (opcional)"}
+            ),
             "investment_date": forms.DateInput(
                 attrs={"type": "date", "class": BASE_DATE}
             ),
@@ -406,6 +440,8 @@ class InvestmentForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         if company is not None:
             self.fields["equipment"].queryset = Equipment.objects.filter(company=company).order_by("name")  # type: ignore
+            # opciones desde caché (sin la vacía: se agrega abajo)
+            self.fields["equipment"].choices = equipment_choices(company.pk)
         # Provide friendly empty option for optional selects
         for name in ("status", "equipment", "equipment_category"):
             if name in self.fields and not self.fields[name].required:
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventory.suggestions import SOURCES, rebuild_suggestions
+
+
+class Command(BaseCommand):
+    help = "Rebuild autocomplete values (providers, software, materials, funding entities) from live rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kinds", nargs="*", help=f"Kinds: {', '.join(SOURCES)} (default: all).")
+
+    def handle(self, *args, **options):
+        unknown = set(options["kinds"]) - set(SOURCES)
+        if unknown:
+            raise CommandError(f"Unknown kinds: {', '.join(sorted(unknown))}")
+        written = rebuild_suggestions(options["kinds"] or None)
+        self.stdout.write(self.style.SUCCESS(f"Suggested values rebuilt: {written}."))
@@ -0,0 +1,21 @@
+from django.db import migrations
+from django.db.models.functions import ExtractYear
+
+
+def backfill_investment_year(apps, schema_editor):
+    # Un solo UPDATE: el año efectivo sale de la fecha cuando existe
+    Investment = apps.get_model("inventory", "Investment")
+    Investment.objects.filter(investment_date__isnull=False).update(
+        investment_year=ExtractYear("investment_date")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_alter_equipment_purchase_origin'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_investment_year, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:32
+
+from django.db import migrations, models
+
+# Backfill set-based: mismo cálculo que inventory.scheduling.compute_next_due_date
+BACKFILL_NEXT_DUE_DATE = """
+UPDATE inventory_equipmentmaintenance
+SET next_due_date = (last_date + CASE frequency
+    WHEN 'DAILY' THEN interval '1 day'
+    WHEN 'WEEKLY' THEN interval '7 days'
+    WHEN 'MONTHLY' THEN interval '1 month'
+    WHEN 'QUARTERLY' THEN interval '3 months'
+    WHEN 'SEMIANNUAL' THEN interval '6 months'
+    WHEN 'ANNUAL' THEN interval '12 months'
+END)::date
+WHERE last_date IS NOT NULL
+  AND frequency IN ('DAILY', 'WEEKLY', 'MONTHLY', 'QUARTERLY', 'SEMIANNUAL', 'ANNUAL');
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_backfill_investment_year'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmentmaintenance',
+            name='next_due_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentmaintenance',
+            index=models.Index(condition=models.Q(('next_due_date__isnull', False)), fields=['next_due_date'], name='inv_maint_next_due_idx'),
+        ),
+        migrations.RunSQL(BACKFILL_NEXT_DUE_DATE, migrations.RunSQL.noop),
+    ]
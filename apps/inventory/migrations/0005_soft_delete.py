@@ -0,0 +1,128 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('inventory', '0004_maintenance_next_due_date'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='material',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='softwareasset',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='workforceprofile',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='disciplineassessment',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='equipmentmaintenance',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='investment',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='material',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='plantlayout',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='softwareasset',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='technicalservice',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='workforceprofile',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='workmethod',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='disciplineassessment',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['company'], name='inv_discipline_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['company'], name='inv_equipment_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentmaintenance',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['equipment'], name='inv_maint_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['company'], name='inv_investment_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['company'], name='inv_material_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plantlayout',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['company'], name='inv_layout_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='softwareasset',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['company'], name='inv_software_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='technicalservice',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['company'], name='inv_service_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workforceprofile',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['company'], name='inv_workforce_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workmethod',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['company'], name='inv_method_live_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='material',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('company', 'name'), name='uq_material_company_name_live'),
+        ),
+        migrations.AddConstraint(
+            model_name='softwareasset',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('company', 'name'), name='uq_software_company_name_live'),
+        ),
+        migrations.AddConstraint(
+            model_name='workforceprofile',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('company', 'area'), name='uq_workforce_company_area_live'),
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:50
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Sólo Postgres: trigger que mantiene search_vector, backfill e índices GIN
+# (tsvector y trigram sobre el título), ambos parciales sobre filas vivas.
+# tabla -> (columna título, [(columna, peso), ...])
+DOCUMENTS = {
+    "inventory_equipment": ("name", [("name", "A"), ("description", "B")]),
+    "inventory_material": ("name", [("name", "A"), ("notes", "B")]),
+    "inventory_softwareasset": ("name", [("name", "A"), ("description", "B"), ("area", "C")]),
+    "inventory_technicalservice": (
+        "provider_name", [("provider_name", "A"), ("service_description", "B"), ("notes", "C")]
+    ),
+    "inventory_investment": ("item_name", [("item_name", "A"), ("notes", "B"), ("funding_entity", "C")]),
+}
+CONFIG = "spanish"
+
+
+def _vector(columns, prefix=""):
+    return " || ".join(
+        f"setweight(to_tsvector('{CONFIG}', coalesce({prefix}{col}, '')), '{weight}')"
+        for col, weight in columns
+    )
+
+
+def create_search(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, (title, columns) in DOCUMENTS.items():
+        watched = ", ".join(col for col, _ in columns)
+        schema_editor.execute(f"""
+            CREATE OR REPLACE FUNCTION {table}_search_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {_vector(columns, "NEW.")};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER {table}_search
+                BEFORE INSERT OR UPDATE OF {watched} ON {table}
+                FOR EACH ROW EXECUTE FUNCTION {table}_search_update();
+
+            UPDATE {table} SET search_vector = {_vector(columns)};
+
+            CREATE INDEX {table}_search_idx ON {table}
+                USING gin (search_vector) WHERE deleted_at IS NULL;
+            CREATE INDEX {table}_trgm_idx ON {table}
+                USING gin ({title} gin_trgm_ops) WHERE deleted_at IS NULL;
+        """)
+
+
+def drop_search(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in DOCUMENTS:
+        schema_editor.execute(f"""
+            DROP INDEX IF EXISTS {table}_trgm_idx;
+            DROP INDEX IF EXISTS {table}_search_idx;
+            DROP TRIGGER IF EXISTS {table}_search ON {table};
+            DROP FUNCTION IF EXISTS {table}_search_update();
+        """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0005_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipment',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='investment',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='material',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='softwareasset',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='technicalservice',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search, drop_search),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:52
+
+from collections import Counter, defaultdict
+
+from django.db import migrations, models
+
+# tipo -> (modelo, campo); mismo mapeo que inventory.suggestions.SOURCES
+SOURCES = {
+    "provider": ("TechnicalService", "provider_name"),
+    "software": ("SoftwareAsset", "name"),
+    "material": ("Material", "name"),
+    "funding_entity": ("Investment", "funding_entity"),
+}
+
+
+def backfill(apps, schema_editor):
+    from apps.inventory.suggestions import _display, normalize
+
+    SuggestedValue = apps.get_model("inventory", "SuggestedValue")
+    for kind, (model_name, field) in SOURCES.items():
+        spellings = defaultdict(Counter)
+        rows = apps.get_model("inventory", model_name).objects.filter(
+            deleted_at__isnull=True, **{f"{field}__isnull": False}
+        ).values_list(field, flat=True)
+        for value in rows.iterator():
+            if normalize(value):
+                spellings[normalize(value)][_display(value)] += 1
+        SuggestedValue.objects.bulk_create(
+            [
+                SuggestedValue(kind=kind, normalized=key, value=c.most_common(1)[0][0], usage_count=sum(c.values()))
+                for key, c in spellings.items()
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0006_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SuggestedValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('provider', 'Service provider'), ('software', 'Software name'), ('material', 'Material name'), ('funding_entity', 'Funding entity')], max_length=20)),
+                ('normalized', models.CharField(max_length=200)),
+                ('value', models.CharField(max_length=200)),
+                ('usage_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Suggested value',
+                'verbose_name_plural': 'Suggested values',
+                'db_table': 'inventory_suggested_value',
+                'indexes': [models.Index(fields=['kind', 'normalized'], name='inv_suggest_prefix_idx', opclasses=['text_pattern_ops', 'text_pattern_ops'])],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'normalized'), name='uq_suggested_value_kind_normalized')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
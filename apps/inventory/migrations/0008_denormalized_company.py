@@ -0,0 +1,99 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:59
+
+import apps.inventory.models
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 5000
+TABLES = {
+    "EquipmentMaintenance": "inventory_equipmentmaintenance",
+    "EquipmentEnergy": "inventory_equipmentenergy",
+}
+# Políticas RLS (core 0002): con la columna propia ya no hace falta el EXISTS
+SCOPE = (
+    "coalesce(current_setting('app.allowed_company_ids', true), '') = '' "
+    "OR company_id = ANY (string_to_array(current_setting('app.allowed_company_ids', true), ',')::bigint[])"
+)
+PARENT = "EXISTS (SELECT 1 FROM inventory_equipment e WHERE e.id = equipment_id)"
+
+
+def backfill(apps, schema_editor):
+    """Copia equipment.company_id por rangos de pk: cada lote es su propio UPDATE/commit."""
+    Equipment = apps.get_model("inventory", "Equipment")
+    company = Subquery(Equipment._base_manager.filter(pk=OuterRef("equipment_id")).values("company_id")[:1])
+    for model_name in TABLES:
+        manager = apps.get_model("inventory", model_name)._base_manager
+        last = manager.order_by("-pk").values_list("pk", flat=True).first() or 0
+        for start in range(0, last + 1, BATCH_SIZE):
+            manager.filter(pk__gte=start, pk__lt=start + BATCH_SIZE, company__isnull=True).update(company_id=company)
+
+
+def _replace_policies(schema_editor, condition):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in TABLES.values():
+        schema_editor.execute(f"""
+            DO $$ BEGIN
+                IF EXISTS (SELECT 1 FROM pg_policies WHERE tablename = '{table}' AND policyname = 'company_scope') THEN
+                    DROP POLICY company_scope ON {table};
+                    CREATE POLICY company_scope ON {table} USING ({condition}) WITH CHECK ({condition});
+                END IF;
+            END $$;
+        """)
+
+
+def direct_policies(apps, schema_editor):
+    _replace_policies(schema_editor, SCOPE)
+
+
+def parent_policies(apps, schema_editor):
+    _replace_policies(schema_editor, PARENT)
+
+
+class Migration(migrations.Migration):
+    # el backfill va por lotes con commit propio, sin bloquear toda la tabla
+    atomic = False
+
+    dependencies = [
+        ('core', '0002_company_rls'),
+        ('inventory', '0007_suggested_values'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmentenergy',
+            name='company',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='equipment_energies', to='core.company'),
+        ),
+        migrations.AddField(
+            model_name='equipmentmaintenance',
+            name='company',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='equipment_maintenances', to='core.company'),
+        ),
+        migrations.AlterField(
+            model_name='equipment',
+            name='energy_sources',
+            field=apps.inventory.models.EnergySourcesField(blank=True, related_name='equipments', through='inventory.EquipmentEnergy', to='inventory.energysource'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='equipmentenergy',
+            name='company',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='equipment_energies', to='core.company'),
+        ),
+        migrations.AlterField(
+            model_name='equipmentmaintenance',
+            name='company',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='equipment_maintenances', to='core.company'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentenergy',
+            index=models.Index(fields=['company', 'energy_source'], name='inventory_e_company_bfe60e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentmaintenance',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['company'], name='inv_maint_company_live_idx'),
+        ),
+        migrations.RunPython(direct_policies, parent_policies),
+    ]
@@ -1,6 +1,8 @@
 # inventory/models.py
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator  # type: ignore
 from django.utils import timezone
 
@@ -19,6 +21,71 @@ class TimeStampedModel(models.Model):
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Valores tal como se leyeron: la auditoría (apps.audit) diffea contra
+        # esto al guardar, sin volver a consultar la fila.
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if value is not models.DEFERRED
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # post_save ya vio los valores anteriores; desde aquí lo guardado pasa
+        # a ser lo "leído" (el siguiente save se compara contra esto)
+        update_fields = kwargs.get("update_fields")
+        self._loaded_values = {
+            **getattr(self, "_loaded_values", {}),
+            **{
+                f.attname: getattr(self, f.attname)
+                for f in self._meta.concrete_fields
+                if update_fields is None or f.name in update_fields or f.attname in update_fields
+            },
+        }
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def soft_delete(self, when=None):
+        """Marca como borradas en un solo UPDATE (sin signals)."""
+        when = when or timezone.now()
+        return self.update(deleted_at=when, updated_at=when)
+
+
+class LiveManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Manager por defecto: oculta las filas borradas (índices parciales *_live_idx)."""
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+# Base del inventario de una empresa: borrar = marcar `deleted_at`, así los
+# snapshots y el histórico no pierden filas. `all_objects` incluye borradas.
+LIVE = models.Q(deleted_at__isnull=True)
+
+
+class SoftDeleteModel(TimeStampedModel):
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = LiveManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
+    class Meta(TimeStampedModel.Meta):
+        abstract = True
+
+    @property
+    def is_deleted(self):
+        return self.deleted_at is not None
+
+    def soft_delete(self, when=None):
+        # save() y no update(): emite post_save (resúmenes, auditoría)
+        self.deleted_at = when or timezone.now()
+        self.save(update_fields=["deleted_at", "updated_at"])
+
+    def restore(self):
+        self.deleted_at = None
+        self.save(update_fields=["deleted_at", "updated_at"])
+
 
 # -------------------------
 # Catálogos y Choices
@@ -174,7 +241,17 @@ class EnergySource(TimeStampedModel):
         return f"{getattr(self, 'get_code_display')()}"
 
 
-class Equipment(TimeStampedModel):
+class EnergySourcesField(models.ManyToManyField):
+    """
+    M2M de Equipment hacia EnergySource. Los ModelForm (portal, admin, sync)
+    guardan con set(), que crea las filas puente con bulk_create sin pasar
+    por save(): aquí se les pasa la empresa desnormalizada del equipo.
+    """
+    def save_form_data(self, instance, data):
+        getattr(instance, self.attname).set(data, through_defaults={"company_id": instance.company_id})
+
+
+class Equipment(SoftDeleteModel):
     company = models.ForeignKey(COMPANY_MODEL, on_delete=models.CASCADE, related_name="equipments")
     name = models.CharField(max_length=200)
     category = models.CharField(max_length=20, choices=EquipmentCategory.choices, db_index=True)
@@ -191,14 +268,17 @@ class Equipment(TimeStampedModel):
     description = models.TextField(blank=True, null=True)
 
     # M2M explícito vía tabla puente
-    energy_sources = models.ManyToManyField(
+    energy_sources = EnergySourcesField(
         EnergySource, through="EquipmentEnergy", related_name="equipments", blank=True
     )
+    # Mantenido por trigger en Postgres (ver inventory.search)
+    search_vector = SearchVectorField(null=True, editable=False)
 
-    class Meta(TimeStampedModel.Meta):
+    class Meta(SoftDeleteModel.Meta):
         verbose_name = "Equipment"
         verbose_name_plural = "Equipments"
         indexes = [
+            models.Index(fields=["company"], name="inv_equipment_live_idx", condition=LIVE),
             models.Index(fields=["company", "category"]),
             models.Index(fields=["company", "name"]),
         ]
@@ -224,10 +304,38 @@ class Equipment(TimeStampedModel):
     def __str__(self):
         return f"{self.name} ({getattr(self, 'get_category_display')()})"
 
+    def save(self, *args, **kwargs):
+        moved_from = getattr(self, "_loaded_values", {}).get("company_id")
+        if moved_from is None or moved_from == self.company_id:
+            return super().save(*args, **kwargs)
+        # Cambió de empresa: la copia en las tablas hijas se actualiza en la
+        # misma transacción y antes del post_save, que recalcula resúmenes.
+        with transaction.atomic(using=kwargs.get("using")):
+            EquipmentMaintenance.all_objects.filter(equipment=self).update(company_id=self.company_id)
+            EquipmentEnergy.objects.filter(equipment=self).update(company_id=self.company_id)
+            super().save(*args, **kwargs)
+
+    def soft_delete(self, when=None):
+        # Igual que el CASCADE: sus mantenimientos se marcan con la misma
+        # fecha, para que restore() devuelva exactamente esos.
+        when = when or timezone.now()
+        self.maintenances.soft_delete(when)
+        super().soft_delete(when)
+
+    def restore(self):
+        EquipmentMaintenance.all_objects.filter(equipment=self, deleted_at=self.deleted_at).update(
+            deleted_at=None, updated_at=timezone.now()
+        )
+        super().restore()
+
 
 class EquipmentEnergy(TimeStampedModel):
     equipment = models.ForeignKey(Equipment, on_delete=models.CASCADE, related_name="equipment_energies")
     energy_source = models.ForeignKey(EnergySource, on_delete=models.CASCADE, related_name="energy_equipments")
+    # Copia de equipment.company_id para filtrar por empresa sin join
+    company = models.ForeignKey(
+        COMPANY_MODEL, on_delete=models.CASCADE, related_name="equipment_energies", editable=False
+    )
     notes = models.CharField(max_length=200, blank=True, null=True)
 
     class Meta(TimeStampedModel.Meta):
@@ -236,108 +344,168 @@ class EquipmentEnergy(TimeStampedModel):
         constraints = [
             models.UniqueConstraint(fields=["equipment", "energy_source"], name="uq_equipment_energy_source")
         ]
+        indexes = [
+            models.Index(fields=["company", "energy_source"]),
+        ]
 
     def __str__(self):
         return f"{self.equipment} - {self.energy_source}"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "equipment" in update_fields:
+            self.company_id = self.equipment.company_id
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | {"company"}
+        super().save(*args, **kwargs)
+
 
-class TechnicalService(TimeStampedModel):
+class TechnicalService(SoftDeleteModel):
     company = models.ForeignKey(COMPANY_MODEL, on_delete=models.CASCADE, related_name="technical_services")
     service_type = models.CharField(max_length=50, choices=ServiceType.choices)
     provider_name = models.CharField(max_length=200)
     service_description = models.CharField(max_length=300, blank=True, null=True)
     service_location = models.CharField(max_length=100, choices=ServiceLocation.choices, blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
+    # Mantenido por trigger en Postgres (ver inventory.search)
+    search_vector = SearchVectorField(null=True, editable=False)
 
-    class Meta(TimeStampedModel.Meta):
+    class Meta(SoftDeleteModel.Meta):
         verbose_name = "Technical service"
         verbose_name_plural = "Technical services"
-        indexes = [models.Index(fields=["company", "service_type"])]
+        indexes = [
+            models.Index(fields=["company"], name="inv_service_live_idx", condition=LIVE),
+            models.Index(fields=["company", "service_type"]),
+        ]
 
     def __str__(self):
         return f"{self.provider_name} - {getattr(self, 'get_service_type_display')()}"
 
 
-class EquipmentMaintenance(TimeStampedModel):
+class EquipmentMaintenance(SoftDeleteModel):
     equipment = models.ForeignKey(Equipment, on_delete=models.CASCADE, related_name="maintenances")
+    # Copia de equipment.company_id para filtrar por empresa sin join
+    company = models.ForeignKey(
+        COMPANY_MODEL, on_delete=models.CASCADE, related_name="equipment_maintenances", editable=False
+    )
     maintenance_type = models.CharField(max_length=50, choices=MaintenanceType.choices)
     frequency = models.CharField(max_length=50, choices=MaintenanceFrequency.choices, blank=True, null=True)
     last_date = models.DateField(blank=True, null=True)
+    # Derivado de last_date + frequency (ver inventory.scheduling)
+    next_due_date = models.DateField(blank=True, null=True, editable=False)
     notes = models.TextField(blank=True, null=True)
 
-    class Meta(TimeStampedModel.Meta):
+    class Meta(SoftDeleteModel.Meta):
         verbose_name = "Equipment maintenance"
         verbose_name_plural = "Equipment maintenances"
-        indexes = [models.Index(fields=["equipment", "maintenance_type"])]
+        indexes = [
+            models.Index(fields=["equipment"], name="inv_maint_live_idx", condition=LIVE),
+            models.Index(fields=["company"], name="inv_maint_company_live_idx", condition=LIVE),
+            models.Index(fields=["equipment", "maintenance_type"]),
+            models.Index(
+                fields=["next_due_date"], name="inv_maint_next_due_idx",
+                condition=models.Q(next_due_date__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.equipment} - {getattr(self, 'get_maintenance_type_display')()}"
 
+    def save(self, *args, **kwargs):
+        from .scheduling import compute_next_due_date
+
+        self.next_due_date = compute_next_due_date(self.last_date, self.frequency)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "equipment" in update_fields:
+            self.company_id = self.equipment.company_id
+        if update_fields is not None and {"last_date", "frequency"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"next_due_date"}
+        if update_fields is not None and "equipment" in update_fields:
+            kwargs["update_fields"] = set(kwargs["update_fields"]) | {"company"}
+        super().save(*args, **kwargs)
 
-class WorkMethod(TimeStampedModel):
+
+class WorkMethod(SoftDeleteModel):
     company = models.ForeignKey(COMPANY_MODEL, on_delete=models.CASCADE, related_name="work_methods")
     modality = models.CharField(max_length=150, choices=WorkModality.choices)
     description = models.TextField(blank=True, null=True)
     shift_pattern = models.CharField(max_length=120, blank=True, null=True)
     shifts_count = models.PositiveSmallIntegerField(blank=True, null=True, validators=[MinValueValidator(0)])
 
-    class Meta(TimeStampedModel.Meta):
+    class Meta(SoftDeleteModel.Meta):
         verbose_name = "Work method"
         verbose_name_plural = "Work methods"
-        indexes = [models.Index(fields=["company", "modality"])]
+        indexes = [
+            models.Index(fields=["company"], name="inv_method_live_idx", condition=LIVE),
+            models.Index(fields=["company", "modality"]),
+        ]
 
     def __str__(self):
         return f"{getattr(self, 'get_modality_display')()}"
 
 
-class PlantLayout(TimeStampedModel):
+class PlantLayout(SoftDeleteModel):
     company = models.ForeignKey(COMPANY_MODEL, on_delete=models.CASCADE, related_name="plant_layouts")
     layout_type = models.CharField(max_length=80, choices=LayoutType.choices)
     description = models.TextField(blank=True, null=True)
 
-    class Meta(TimeStampedModel.Meta):
+    class Meta(SoftDeleteModel.Meta):
         verbose_name = "Plant layout"
         verbose_name_plural = "Plant layouts"
-        indexes = [models.Index(fields=["company", "layout_type"])]
+        indexes = [
+            models.Index(fields=["company"], name="inv_layout_live_idx", condition=LIVE),
+            models.Index(fields=["company", "layout_type"]),
+        ]
 
     def __str__(self):
         return f"{getattr(self, 'get_layout_type_display')()}"
 
 
-class SoftwareAsset(TimeStampedModel):
+class SoftwareAsset(SoftDeleteModel):
     company = models.ForeignKey(COMPANY_MODEL, on_delete=models.CASCADE, related_name="software_assets")
     usage = models.CharField(max_length=120, choices=SoftwareUsage.choices)
     name = models.CharField(max_length=150)
     description = models.TextField(blank=True, null=True)
     area = models.CharField(max_length=100, blank=True, null=True)
+    # Mantenido por trigger en Postgres (ver inventory.search)
+    search_vector = SearchVectorField(null=True, editable=False)
 
-    class Meta(TimeStampedModel.Meta):
+    class Meta(SoftDeleteModel.Meta):
         verbose_name = "Software asset"
         verbose_name_plural = "Software assets"
-        unique_together = (("company", "name"),)
-        indexes = [models.Index(fields=["company", "usage"])]
+        # sólo entre filas vivas: un borrado no bloquea volver a crear el nombre
+        constraints = [
+            models.UniqueConstraint(fields=["company", "name"], condition=LIVE, name="uq_software_company_name_live"),
+        ]
+        indexes = [
+            models.Index(fields=["company"], name="inv_software_live_idx", condition=LIVE),
+            models.Index(fields=["company", "usage"]),
+        ]
 
     def __str__(self):
         return f"{self.name} ({getattr(self, 'get_usage_display')()})"
 
 
-class DisciplineAssessment(TimeStampedModel):
+class DisciplineAssessment(SoftDeleteModel):
     company = models.ForeignKey(COMPANY_MODEL, on_delete=models.CASCADE, related_name="discipline_assessments")
     item = models.CharField(max_length=150)
     importance_score = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
     adoption_level = models.PositiveSmallIntegerField(validators=[MinValueValidator(0), MaxValueValidator(4)])
     notes = models.TextField(blank=True, null=True)
 
-    class Meta(TimeStampedModel.Meta):
+    class Meta(SoftDeleteModel.Meta):
         verbose_name = "Discipline assessment"
         verbose_name_plural = "Discipline assessments"
-        indexes = [models.Index(fields=["company", "item"])]
+        indexes = [
+            models.Index(fields=["company"], name="inv_discipline_live_idx", condition=LIVE),
+            models.Index(fields=["company", "item"]),
+        ]
 
     def __str__(self):
         return f"{self.item} (Imp:{self.importance_score} / Adopt:{self.adoption_level})"
 
 
-class WorkforceProfile(TimeStampedModel):
+class WorkforceProfile(SoftDeleteModel):
     company = models.ForeignKey(COMPANY_MODEL, on_delete=models.CASCADE, related_name="workforce_profiles")
     area = models.CharField(max_length=100)
     people_count = models.PositiveIntegerField(validators=[MinValueValidator(0)])
@@ -358,17 +526,22 @@ class WorkforceProfile(TimeStampedModel):
                                                validators=[MinValueValidator(0)])
     notes = models.TextField(blank=True, null=True)
 
-    class Meta(TimeStampedModel.Meta):
+    class Meta(SoftDeleteModel.Meta):
         verbose_name = "Workforce profile"
         verbose_name_plural = "Workforce profiles"
-        unique_together = (("company", "area"),)
-        indexes = [models.Index(fields=["company", "area"])]
+        constraints = [
+            models.UniqueConstraint(fields=["company", "area"], condition=LIVE, name="uq_workforce_company_area_live"),
+        ]
+        indexes = [
+            models.Index(fields=["company"], name="inv_workforce_live_idx", condition=LIVE),
+            models.Index(fields=["company", "area"]),
+        ]
 
     def __str__(self):
         return f"{self.area} - {self.people_count} ppl"
 
 
-class Material(TimeStampedModel):
+class Material(SoftDeleteModel):
     company = models.ForeignKey(COMPANY_MODEL, on_delete=models.CASCADE, related_name="materials")
     category = models.CharField(max_length=20, choices=MaterialCategory.choices)
     name = models.CharField(max_length=150)
@@ -379,12 +552,17 @@ class Material(TimeStampedModel):
         help_text="Share of total material cost (0-100)"
     )
     notes = models.TextField(blank=True, null=True)
+    # Mantenido por trigger en Postgres (ver inventory.search)
+    search_vector = SearchVectorField(null=True, editable=False)
 
-    class Meta(TimeStampedModel.Meta):
+    class Meta(SoftDeleteModel.Meta):
         verbose_name = "Material"
         verbose_name_plural = "Materials"
-        unique_together = (("company", "name"),)
+        constraints = [
+            models.UniqueConstraint(fields=["company", "name"], condition=LIVE, name="uq_material_company_name_live"),
+        ]
         indexes = [
+            models.Index(fields=["company"], name="inv_material_live_idx", condition=LIVE),
             models.Index(fields=["company", "category"]),
             models.Index(fields=["company", "name"]),
         ]
@@ -393,7 +571,7 @@ class Material(TimeStampedModel):
         return f"{self.name} ({getattr(self, 'get_category_display')()})"
 
 
-class Investment(TimeStampedModel):
+class Investment(SoftDeleteModel):
     company = models.ForeignKey(COMPANY_MODEL, on_delete=models.CASCADE, related_name="investments")
     category = models.CharField(max_length=30, choices=InvestmentCategory.choices)
     item_name = models.CharField(max_length=200)
@@ -418,11 +596,14 @@ class Investment(TimeStampedModel):
     )
 
     notes = models.TextField(blank=True, null=True)
+    # Mantenido por trigger en Postgres (ver inventory.search)
+    search_vector = SearchVectorField(null=True, editable=False)
 
-    class Meta(TimeStampedModel.Meta):
+    class Meta(SoftDeleteModel.Meta):
         verbose_name = "Investment"
         verbose_name_plural = "Investments"
         indexes = [
+            models.Index(fields=["company"], name="inv_investment_live_idx", condition=LIVE),
             models.Index(fields=["company", "category"]),
             models.Index(fields=["company", "motive"]),
         ]
@@ -431,3 +612,62 @@ class Investment(TimeStampedModel):
     def __str__(self):
         return f"{self.item_name} - {getattr(self, 'get_category_display')()} ({self.amount_cop} COP)"
 
+    def clean(self):
+        super().clean()
+        # Si hay fecha exacta, el año debe coincidir con ella
+        if self.investment_date and self.investment_year and self.investment_year != self.investment_date.year:
+            raise ValidationError(
+                {"investment_year": "El año no coincide con la fecha de la inversión."}
+            )
+
+    def save(self, *args, **kwargs):
+        # La fecha exacta manda: investment_year siempre queda como el año efectivo,
+        # así reportes y orden no dependen de cuál de los dos campos se llenó.
+        if self.investment_date:
+            self.investment_year = self.investment_date.year
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "investment_date" in update_fields:
+                kwargs["update_fields"] = set(update_fields) | {"investment_year"}
+        super().save(*args, **kwargs)
+
+
+class SuggestedValue(models.Model):
+    """
+    Valores distintos de los campos de texto libre (proveedor, software,
+    material, entidad financiadora) para autocompletar.
+
+    `normalized` (minúsculas, sin tildes ni espacios repetidos) agrupa las
+    variantes de escritura; `value` es la forma que se sugiere y
+    `usage_count` el número de filas vivas que la usan. Se mantiene fila a
+    fila desde signals (inventory.suggestions) y se busca por prefijo con
+    un índice text_pattern_ops.
+    """
+    class Kind(models.TextChoices):
+        PROVIDER = "provider", "Service provider"
+        SOFTWARE = "software", "Software name"
+        MATERIAL = "material", "Material name"
+        FUNDING_ENTITY = "funding_entity", "Funding entity"
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    normalized = models.CharField(max_length=200)
+    value = models.CharField(max_length=200)
+    usage_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "inventory_suggested_value"
+        verbose_name = "Suggested value"
+        verbose_name_plural = "Suggested values"
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "normalized"], name="uq_suggested_value_kind_normalized")
+        ]
+        indexes = [
+            # LIKE 'prefijo%' usa el índice aunque la collation no sea "C"
+            models.Index(
+                fields=["kind", "normalized"], name="inv_suggest_prefix_idx",
+                opclasses=["text_pattern_ops", "text_pattern_ops"],
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.value} ({self.usage_count})"
@@ -0,0 +1,61 @@
+# apps/inventory/options.py
+"""
+Opciones cacheadas de los selects de los modales.
+
+Abrir un modal de equipo listaba EnergySource y uno de mantenimiento o
+inversión volvía a listar los equipos de la empresa. Aquí se guardan como
+listas (pk, etiqueta) en la caché: las fuentes de energía para todos y los
+equipos por empresa. Los signals (inventory.signals) borran la entrada al
+confirmar cualquier escritura. La validación del POST sigue usando el
+queryset del campo, así que una opción vieja nunca se acepta si ya no existe.
+"""
+from typing import Iterable, List, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import EnergySource, Equipment
+
+CACHE_TTL = 60 * 60 * 24
+
+Choice = Tuple[int, str]
+_ENERGY_KEY = "inventory:options:energy_sources"
+
+
+def _equipment_key(company_id: int) -> str:
+    return f"inventory:options:equipment:{company_id}"
+
+
+def energy_sources() -> List[Tuple[int, str, bool]]:
+    """(pk, etiqueta, is_active) de todas las fuentes, en orden de código."""
+    found = cache.get(_ENERGY_KEY)
+    if found is None:
+        found = [(s.pk, str(s), s.is_active) for s in EnergySource.objects.order_by("code")]
+        cache.set(_ENERGY_KEY, found, CACHE_TTL)
+    return found
+
+
+def energy_source_choices(selected: Iterable[int] = ()) -> List[Choice]:
+    """Fuentes activas, más las inactivas que el equipo ya tenga asignadas."""
+    selected = set(selected)
+    return [(pk, label) for pk, label, active in energy_sources() if active or pk in selected]
+
+
+def equipment_choices(company_id: int) -> List[Choice]:
+    """Equipos vivos de la empresa, por nombre, con la etiqueta de Equipment.__str__."""
+    key = _equipment_key(company_id)
+    found = cache.get(key)
+    if found is None:
+        found = [(e.pk, str(e)) for e in Equipment.objects.filter(company_id=company_id).order_by("name")]
+        cache.set(key, found, CACHE_TTL)
+    return found
+
+
+def invalidate_energy_sources() -> None:
+    transaction.on_commit(lambda: cache.delete(_ENERGY_KEY))
+
+
+def invalidate_equipment(*company_ids) -> None:
+    keys = [_equipment_key(cid) for cid in {c for c in company_ids if c}]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,67 @@
+# apps/inventory/scheduling.py
+"""
+Programación de mantenimientos: próxima fecha a partir de la frecuencia.
+
+`EquipmentMaintenance.next_due_date` se guarda (indexado) al salvar, así los
+listados de vencidos / por vencer son un rango sobre el índice y no
+aritmética de fechas en Python fila por fila.
+"""
+import calendar
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+from django.utils import timezone
+
+from .models import EquipmentMaintenance, MaintenanceFrequency
+
+# Frecuencia -> (días, meses). USAGE_BASED no tiene fecha calendario.
+FREQUENCY_STEP = {
+    MaintenanceFrequency.DAILY: (1, 0),
+    MaintenanceFrequency.WEEKLY: (7, 0),
+    MaintenanceFrequency.MONTHLY: (0, 1),
+    MaintenanceFrequency.QUARTERLY: (0, 3),
+    MaintenanceFrequency.SEMIANNUAL: (0, 6),
+    MaintenanceFrequency.ANNUAL: (0, 12),
+}
+
+DUE_SOON_DAYS = 30
+
+
+def add_months(d: date, months: int) -> date:
+    """Suma meses recortando al último día del mes (igual que `date + interval` en Postgres)."""
+    month_index = d.month - 1 + months
+    year, month = d.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(d.day, calendar.monthrange(year, month)[1]))
+
+
+def compute_next_due_date(last_date: Optional[date], frequency: Optional[str]) -> Optional[date]:
+    """Próxima fecha de mantenimiento, o None si no hay base para calcularla."""
+    if not last_date or frequency not in FREQUENCY_STEP:
+        return None
+    days, months = FREQUENCY_STEP[frequency]
+    return add_months(last_date, months) + timedelta(days=days)
+
+
+def maintenance_due(
+    company_ids: Optional[Iterable[int]] = None,
+    within_days: int = DUE_SOON_DAYS,
+    today: Optional[date] = None,
+):
+    """
+    Mantenimientos vencidos o que vencen en los próximos `within_days` días,
+    ordenados por fecha. `company_ids=None` = todo el portafolio.
+    """
+    today = today or timezone.localdate()
+    qs = EquipmentMaintenance.objects.filter(next_due_date__lte=today + timedelta(days=within_days))
+    if company_ids is not None:
+        qs = qs.filter(company_id__in=list(company_ids))
+    return qs.select_related("equipment", "company").order_by("next_due_date")
+
+
+def split_due(maintenances, today: Optional[date] = None):
+    """Separa un listado de `maintenance_due` en (vencidos, por vencer)."""
+    today = today or timezone.localdate()
+    overdue, due_soon = [], []
+    for m in maintenances:
+        (overdue if m.next_due_date < today else due_soon).append(m)
+    return overdue, due_soon
@@ -0,0 +1,128 @@
+# apps/inventory/search.py
+"""
+Búsqueda global en el inventario (equipos, materiales, software, servicios
+e inversiones) sobre las empresas visibles para el usuario.
+
+En Postgres cada tabla tiene una columna `search_vector` (tsvector, config
+'spanish') que mantiene un trigger BEFORE INSERT/UPDATE (migración 0006),
+con índice GIN parcial sobre filas vivas, y un índice GIN trigram sobre el
+título para tolerar errores de tipeo. Cada término se busca por prefijo
+("torn" encuentra "torno") y una fila entra si coincide el texto completo
+O el título es trigram-similar; el rank es el mayor de los dos puntajes.
+Las cinco búsquedas van en una sola consulta (UNION ALL de subconsultas
+con su propio LIMIT). Otros motores caen a icontains sobre el título.
+"""
+import re
+from typing import Iterable, List, NamedTuple, Optional
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import CharField, F, FloatField, Q, Value
+from django.db.models.functions import Greatest
+
+from .models import Equipment, Investment, Material, SoftwareAsset, TechnicalService
+
+SEARCH_CONFIG = "spanish"
+MIN_LENGTH = 2
+MAX_TERMS = 6
+PER_ENTITY = 8
+
+
+class Searchable(NamedTuple):
+    model: type
+    title: str          # campo mostrado y con índice trigram
+    detail: str         # texto secundario del resultado
+    label: str
+
+
+# Claves = tabs de InventoryManageView
+SEARCHABLE = {
+    "equipment": Searchable(Equipment, "name", "description", "Equipo"),
+    "materials": Searchable(Material, "name", "notes", "Material"),
+    "software": Searchable(SoftwareAsset, "name", "description", "Software"),
+    "services": Searchable(TechnicalService, "provider_name", "service_description", "Servicio técnico"),
+    "investments": Searchable(Investment, "item_name", "notes", "Inversión"),
+}
+
+
+class SearchResult(NamedTuple):
+    entity: str
+    pk: int
+    company_id: int
+    company_name: str
+    title: str
+    detail: Optional[str]
+    rank: float
+
+    @property
+    def label(self) -> str:
+        return SEARCHABLE[self.entity].label
+
+
+def _terms(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())[:MAX_TERMS]
+
+
+def _prefix_query(terms: List[str]) -> SearchQuery:
+    # términos ya saneados (\w+): seguro armar el tsquery crudo
+    return SearchQuery(" & ".join(f"{t}:*" for t in terms), search_type="raw", config=SEARCH_CONFIG)
+
+
+def _entity_qs(entity: str, text: str, terms: List[str], company_ids: Optional[Iterable[int]], postgres: bool):
+    spec = SEARCHABLE[entity]
+    qs = spec.model.objects.all()
+    if company_ids is not None:
+        qs = qs.filter(company_id__in=company_ids)
+    if postgres:
+        query = _prefix_query(terms)
+        qs = qs.filter(Q(search_vector=query) | Q(**{f"{spec.title}__trigram_similar": text})).annotate(
+            rank=Greatest(
+                SearchRank(F("search_vector"), query),
+                TrigramSimilarity(spec.title, text),
+                output_field=FloatField(),
+            )
+        )
+    else:
+        qs = qs.filter(**{f"{spec.title}__icontains": text}).annotate(rank=Value(1.0, output_field=FloatField()))
+    return (
+        qs.annotate(
+            entity=Value(entity, output_field=CharField()),
+            result_title=F(spec.title),
+            result_detail=F(spec.detail),
+        )
+        .order_by("-rank")
+        .values_list("entity", "pk", "company_id", "company__name", "result_title", "result_detail", "rank")
+        [:PER_ENTITY]
+    )
+
+
+def search_inventory(
+    text: str, company_ids: Optional[Iterable[int]] = None, entities: Optional[Iterable[str]] = None
+) -> List[SearchResult]:
+    """
+    Resultados ordenados por relevancia. `company_ids` None = sin filtro
+    (superuser); un conjunto vacío no devuelve nada.
+    """
+    text = (text or "").strip()
+    terms = _terms(text)
+    if len(text) < MIN_LENGTH or not terms:
+        return []
+    if company_ids is not None:
+        company_ids = list(company_ids)
+        if not company_ids:
+            return []
+
+    postgres = connection.vendor == "postgresql"
+    querysets = [
+        _entity_qs(entity, text, terms, company_ids, postgres)
+        for entity in (entities or SEARCHABLE)
+        if entity in SEARCHABLE
+    ]
+    if not querysets:
+        return []
+    if connection.features.supports_slicing_ordering_in_compound:
+        rows = querysets[0].union(*querysets[1:], all=True).order_by("-rank")
+    else:
+        rows = [row for qs in querysets for row in qs]
+        rows.sort(key=lambda r: r[-1], reverse=True)
+    return [SearchResult(*row) for row in rows]
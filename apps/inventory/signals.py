@@ -0,0 +1,67 @@
+# apps/inventory/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.dedup import merge_conflicts
+from apps.core.signals import companies_deleted, companies_deleting, companies_merged, companies_merging
+from .models import EnergySource, Equipment
+from .options import invalidate_energy_sources, invalidate_equipment
+from .suggestions import SOURCES, forget_companies, forget_rows, track_delete, track_save
+
+
+def _saved(kind):
+    def receiver(sender, instance, created=False, raw=False, **kwargs):
+        if not raw:
+            track_save(kind, instance, created)
+    return receiver
+
+
+def _deleted(kind):
+    def receiver(sender, instance, **kwargs):
+        track_delete(kind, instance)
+    return receiver
+
+
+# Autocompletado: un receiver por campo de texto libre
+for _kind, _source in SOURCES.items():
+    post_save.connect(_saved(_kind), sender=_source.model, weak=False, dispatch_uid=f"suggest_save_{_kind}")
+    post_delete.connect(_deleted(_kind), sender=_source.model, weak=False, dispatch_uid=f"suggest_delete_{_kind}")
+
+
+# Opciones cacheadas de los modales (inventory.options)
+@receiver(post_save, sender=EnergySource)
+@receiver(post_delete, sender=EnergySource)
+def _energy_source_changed(sender, **kwargs):
+    invalidate_energy_sources()
+
+
+@receiver(post_save, sender=Equipment)
+@receiver(post_delete, sender=Equipment)
+def _equipment_changed(sender, instance, **kwargs):
+    # también la empresa anterior si el equipo cambió de empresa
+    previous = (getattr(instance, "_loaded_values", None) or {}).get("company_id")
+    invalidate_equipment(instance.company_id, previous)
+
+
+# Borrado masivo de empresas (apps.core.deletion)
+@receiver(companies_deleting)
+def _companies_deleting(sender, company_ids, **kwargs):
+    forget_companies(company_ids)
+
+
+@receiver(companies_deleted)
+def _companies_deleted(sender, company_ids, **kwargs):
+    invalidate_equipment(*company_ids)
+
+
+# Fusión de empresas (apps.core.dedup)
+@receiver(companies_merging)
+def _companies_merging(sender, target_id, source_ids, **kwargs):
+    # las filas que chocan (mismo nombre) salen con un UPDATE, sin post_save
+    for kind, source in SOURCES.items():
+        forget_rows(kind, merge_conflicts(source.model, "company", target_id, source_ids))
+
+
+@receiver(companies_merged)
+def _companies_merged(sender, target_id, source_ids, **kwargs):
+    invalidate_equipment(target_id, *source_ids)
@@ -0,0 +1,182 @@
+# apps/inventory/suggestions.py
+"""
+Autocompletado de campos de texto libre con valores ya usados en el portafolio.
+
+`SuggestedValue` guarda un valor por (tipo, forma normalizada) con el número
+de filas vivas que lo usan. Cada save/borrado de las fuentes ajusta sólo los
+contadores que cambian (viejo -1, nuevo +1), comparando contra los valores
+leídos (TimeStampedModel._loaded_values): sin consultas extra. `suggest`
+busca por prefijo sobre el índice text_pattern_ops y cachea el resultado;
+la caché se invalida subiendo una versión por tipo al confirmar cambios.
+"""
+import hashlib
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from .models import Investment, Material, SoftwareAsset, SuggestedValue, TechnicalService
+
+Kind = SuggestedValue.Kind
+
+MIN_PREFIX = 2
+LIMIT = 8
+CACHE_TTL = 60 * 10
+MAX_LENGTH = SuggestedValue._meta.get_field("normalized").max_length
+
+
+class Source(NamedTuple):
+    model: type
+    field: str
+
+
+SOURCES: Dict[str, Source] = {
+    Kind.PROVIDER: Source(TechnicalService, "provider_name"),
+    Kind.SOFTWARE: Source(SoftwareAsset, "name"),
+    Kind.MATERIAL: Source(Material, "name"),
+    Kind.FUNDING_ENTITY: Source(Investment, "funding_entity"),
+}
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(value: Optional[str]) -> str:
+    """'  Tornos  S.A.S ' y 'tornos s.a.s' -> 'tornos s.a.s'; tildes fuera."""
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join(ch for ch in value if not unicodedata.combining(ch))
+    return _SPACES.sub(" ", value).strip().lower()[:MAX_LENGTH]
+
+
+def _display(value: str) -> str:
+    return _SPACES.sub(" ", value).strip()[:MAX_LENGTH]
+
+
+# ---------------- mantenimiento incremental ----------------
+
+def _version_key(kind: str) -> str:
+    return f"inventory:suggest:{kind}:v"
+
+
+def _invalidate(kind: str) -> None:
+    try:
+        cache.incr(_version_key(kind))
+    except ValueError:
+        cache.set(_version_key(kind), 2, None)
+
+
+def _bump(kind: str, normalized: str, delta: int, value: str = "") -> None:
+    rows = SuggestedValue.objects.filter(kind=kind, normalized=normalized)
+    updated = rows.update(usage_count=F("usage_count") + delta)
+    if not updated and delta > 0:
+        _, created = SuggestedValue.objects.get_or_create(
+            kind=kind, normalized=normalized, defaults={"value": _display(value), "usage_count": delta}
+        )
+        if not created:
+            # otra transacción lo insertó entre el UPDATE y el INSERT: sumamos sobre su fila
+            rows.update(usage_count=F("usage_count") + delta)
+    transaction.on_commit(lambda: _invalidate(kind))
+
+
+def _live_key(value, deleted_at) -> str:
+    return normalize(value) if deleted_at is None else ""
+
+
+def track_save(kind: str, instance, created: bool) -> None:
+    field = SOURCES[kind].field
+    loaded = None if created else getattr(instance, "_loaded_values", None)
+    new_value = getattr(instance, field)
+    new_key = _live_key(new_value, instance.deleted_at)
+    if loaded is None:
+        old_key = ""
+    elif field not in loaded:
+        return  # campo diferido al leer: no sabemos el valor anterior
+    else:
+        old_key = _live_key(loaded[field], loaded.get("deleted_at"))
+    if old_key == new_key:
+        return
+    if old_key:
+        _bump(kind, old_key, -1)
+    if new_key:
+        _bump(kind, new_key, +1, new_value)
+
+
+def track_delete(kind: str, instance) -> None:
+    key = _live_key(getattr(instance, SOURCES[kind].field), instance.deleted_at)
+    if key:
+        _bump(kind, key, -1)
+
+
+def forget_rows(kind: str, rows) -> None:
+    """Descuenta los valores vivos de `rows` (queryset de la fuente) que salen sin post_delete."""
+    field = SOURCES[kind].field
+    counts = Counter(
+        _live_key(value, deleted_at)
+        for value, deleted_at in rows.exclude(**{f"{field}__isnull": True}).values_list(
+            field, "deleted_at"
+        ).iterator()
+    )
+    for key, count in counts.items():
+        if key:
+            _bump(kind, key, -count)
+
+
+def forget_companies(company_ids: Iterable[int]) -> None:
+    """Descuenta los valores vivos de empresas que se borran en bloque (sin post_delete)."""
+    company_ids = list(company_ids)
+    for kind, source in SOURCES.items():
+        forget_rows(kind, source.model.objects.filter(company_id__in=company_ids))
+
+
+def rebuild_suggestions(kinds: Optional[Iterable[str]] = None) -> int:
+    """
+    Recalcula desde las tablas vivas. La forma sugerida de cada grupo es la
+    escritura más usada. Devuelve el número de valores escritos.
+    """
+    written = 0
+    for kind in kinds or SOURCES:
+        source = SOURCES[kind]
+        spellings = defaultdict(Counter)
+        for value in source.model.objects.exclude(**{f"{source.field}__isnull": True}).values_list(
+            source.field, flat=True
+        ).iterator():
+            key = normalize(value)
+            if key:
+                spellings[key][_display(value)] += 1
+        objs = [
+            SuggestedValue(
+                kind=kind, normalized=key, value=counter.most_common(1)[0][0], usage_count=sum(counter.values())
+            )
+            for key, counter in spellings.items()
+        ]
+        with transaction.atomic():
+            SuggestedValue.objects.filter(kind=kind).delete()
+            SuggestedValue.objects.bulk_create(objs, batch_size=1000)
+            transaction.on_commit(lambda kind=kind: _invalidate(kind))
+        written += len(objs)
+    return written
+
+
+# ---------------- lectura ----------------
+
+def suggest(kind: str, prefix: str, limit: int = LIMIT) -> List[str]:
+    """Valores más usados que empiezan por `prefix` (normalizado)."""
+    prefix = normalize(prefix)
+    if kind not in SOURCES or len(prefix) < MIN_PREFIX:
+        return []
+    version = cache.get_or_set(_version_key(kind), 1, None)
+    key = f"inventory:suggest:{kind}:{version}:{hashlib.md5(prefix.encode()).hexdigest()}"
+    found = cache.get(key)
+    if found is None:
+        found = list(
+            SuggestedValue.objects.filter(kind=kind, normalized__startswith=prefix, usage_count__gt=0)
+            .order_by("-usage_count", "normalized")
+            .values_list("value", flat=True)[:limit]
+        )
+        cache.set(key, found, CACHE_TTL)
+    return found
@@ -0,0 +1,313 @@
+# apps/inventory/sync.py
+"""
+Sincronización en lote de cambios capturados sin conexión.
+
+El cliente (ver templates/components/_offline_sync.html) encola en IndexedDB
+las altas, ediciones y bajas de las diez entidades del inventario y las
+respuestas de los diagnósticos, y las manda todas juntas a `apply_batch`:
+
+    {"ops": [
+      {"id": "c1", "user": "<uuid>", "entity": "equipment", "op": "create", "company_id": 3,
+       "ref": "tmp:ab12", "data": {...}},
+      {"id": "c2", "entity": "maintenance", "op": "create", "company_id": 3,
+       "data": {"equipment": "tmp:ab12", ...}},
+      {"id": "c3", "entity": "materials", "op": "update", "pk": 41,
+       "updated_at": "2025-03-02T15:04:05.123456+00:00", "data": {...}},
+      {"id": "c4", "entity": "responses", "company_id": 3, "assessment_id": "...",
+       "question_id": "...", "data": {"answer_value": "3", "observations": ""}}
+    ]}
+
+Cada op lleva el id del usuario que la capturó; las de otro usuario (una
+cola que quedó en el navegador tras cambiar de sesión) se rechazan.
+
+Todo corre en una transacción:
+  - los objetos a editar/borrar se cargan con un in_bulk por entidad;
+  - ediciones/bajas con `updated_at` distinto al que vio el cliente se
+    rechazan como conflicto (el cliente decide qué hacer);
+  - altas y ediciones pasan por el mismo ModelForm que el modal, para no
+    saltarse validaciones ni Model.save() (investment_year, next_due_date);
+  - las bajas son borrados lógicos (soft_delete, como en el modal) y las
+    respuestas se escriben con un upsert por evaluación.
+Los refresh de resúmenes que disparan los signals se agendan una sola vez
+por empresa al commit (ver reports.signals._refresh_on_commit).
+"""
+from collections import defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional, Set
+from uuid import UUID
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils.datastructures import MultiValueDict
+from django.utils.dateparse import parse_datetime
+
+from apps.profiles.models import Assessment
+from apps.profiles.responses import InvalidResponse, clean_items, upsert_responses
+from .forms import (
+    DisciplineAssessmentForm,
+    EquipmentForm,
+    InvestmentForm,
+    MaintenanceForm,
+    MaterialForm,
+    PlantLayoutForm,
+    SoftwareAssetForm,
+    TechnicalServiceForm,
+    WorkforceProfileForm,
+    WorkMethodForm,
+)
+
+COMPANY_MODEL = getattr(settings, "COMPANY_MODEL", "core.Company")
+
+MAX_OPS = 500
+
+APPLIED = "applied"
+CONFLICT = "conflict"
+INVALID = "invalid"
+NOT_FOUND = "not_found"
+FORBIDDEN = "forbidden"
+
+
+class Entity(NamedTuple):
+    form_class: type
+    company_field: str                                  # ruta a la empresa desde el objeto
+    form_kwargs: Optional[Callable] = None              # def(company) -> dict
+
+    @property
+    def model(self):
+        return self.form_class._meta.model
+
+
+def _with_company(company):
+    return {"company": company}
+
+
+# Claves = prefijo de URL de cada CRUD en inventory/urls.py
+ENTITIES: Dict[str, Entity] = {
+    "equipment": Entity(EquipmentForm, "company"),
+    "services": Entity(TechnicalServiceForm, "company"),
+    "maintenance": Entity(MaintenanceForm, "company", _with_company),
+    "methods": Entity(WorkMethodForm, "company"),
+    "layout": Entity(PlantLayoutForm, "company"),
+    "software": Entity(SoftwareAssetForm, "company"),
+    "materials": Entity(MaterialForm, "company"),
+    "investments": Entity(InvestmentForm, "company", _with_company),
+    "workforce": Entity(WorkforceProfileForm, "company"),
+    "disciplines": Entity(DisciplineAssessmentForm, "company"),
+}
+RESPONSES = "responses"
+
+
+class SyncError(ValueError):
+    pass
+
+
+def _manager(entity: Entity):
+    related = "__".join(entity.company_field.split("__")[:-1])
+    return entity.model.objects.select_related(related) if related else entity.model.objects
+
+
+def _company_id_of(obj, company_field: str) -> int:
+    for part in company_field.split("__")[:-1]:
+        obj = getattr(obj, part)
+    return getattr(obj, f"{company_field.split('__')[-1]}_id")
+
+
+def _form_data(data: dict, refs: Dict[str, int]) -> MultiValueDict:
+    """JSON -> MultiValueDict como el de un POST, resolviendo ids temporales."""
+    def resolve(value):
+        return refs.get(value, value) if isinstance(value, str) else value
+
+    return MultiValueDict({
+        key: [resolve(v) for v in value] if isinstance(value, list) else [resolve(value)]
+        for key, value in (data or {}).items()
+    })
+
+
+def _uuid_or_none(value) -> Optional[UUID]:
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _same_version(obj, seen: Optional[str]) -> bool:
+    if not seen:
+        return True  # el cliente no mandó versión: último en escribir gana
+    parsed = parse_datetime(seen)
+    return parsed is not None and obj.updated_at == parsed
+
+
+_SCALAR_KEYS = ("id", "user", "entity", "op", "company_id", "pk", "ref", "assessment_id", "question_id", "updated_at")
+
+
+def _malformed(op) -> bool:
+    """Op que no es un dict, con ids no escalares (listas, dicts) o `data` que no es un dict."""
+    if not isinstance(op, dict):
+        return True
+    if any(not isinstance(op.get(key), (str, int, float, type(None))) for key in _SCALAR_KEYS):
+        return True
+    return not isinstance(op.get("data") or {}, dict)
+
+
+def _result(op, status: str, **extra) -> dict:
+    op_id = op.get("id") if isinstance(op, dict) and isinstance(op.get("id"), (str, int)) else None
+    return {"id": op_id, "status": status, **extra}
+
+
+def apply_batch(ops: List[dict], allowed: Optional[Set[int]], user_id) -> List[dict]:
+    """
+    Aplica `ops` en orden, en una sola transacción. `allowed` = ids de
+    empresa permitidos (None = sin restricción); `user_id` = usuario de la
+    sesión, que debe coincidir con el de cada op. Devuelve un resultado por op.
+    """
+    if len(ops) > MAX_OPS:
+        raise SyncError(f"Máximo {MAX_OPS} cambios por sincronización.")
+
+    results: List[Optional[dict]] = [None] * len(ops)
+    for i, op in enumerate(ops):
+        if _malformed(op):
+            results[i] = _result(op, INVALID, errors={"__all__": ["Operación mal formada."]})
+    ops = [op if results[i] is None else {} for i, op in enumerate(ops)]
+
+    refs: Dict[str, int] = {}
+
+    def ref_pk(value):
+        return refs.get(value, value) if isinstance(value, str) else value
+
+    # -------- precarga: empresas, objetos a editar/borrar, evaluaciones --------
+    Company = django_apps.get_model(COMPANY_MODEL)
+    companies = Company.objects.in_bulk(
+        {op["company_id"] for op in ops if isinstance(op.get("company_id"), int)}
+    )
+    pks_by_entity = defaultdict(set)
+    for op in ops:
+        if op.get("entity") in ENTITIES and op.get("op") in ("update", "delete"):
+            if isinstance(op.get("pk"), int):
+                pks_by_entity[op["entity"]].add(op["pk"])
+    objects = {name: _manager(ENTITIES[name]).in_bulk(pks) for name, pks in pks_by_entity.items()}
+    assessments = Assessment.objects.in_bulk(
+        {_uuid_or_none(op.get("assessment_id")) for op in ops if op.get("entity") == RESPONSES} - {None}
+    )
+
+    def can(company_id) -> bool:
+        return allowed is None or company_id in allowed
+
+    def company_for(company_id):
+        if company_id not in companies:
+            companies[company_id] = Company.objects.get(pk=company_id)
+        return companies[company_id]
+
+    deletes = []                          # [(index, obj)]
+    answers = defaultdict(list)           # assessment_id -> [(index, [items])]
+
+    with transaction.atomic():
+        for i, op in enumerate(ops):
+            if results[i] is not None:
+                continue  # mal formada
+            entity_name, kind = op.get("entity"), op.get("op")
+            if op.get("user") != str(user_id):
+                results[i] = _result(op, FORBIDDEN)
+                continue
+
+            # ---- respuestas: se acumulan y se escriben por evaluación ----
+            if entity_name == RESPONSES:
+                a = assessments.get(_uuid_or_none(op.get("assessment_id")))
+                if a is None:
+                    results[i] = _result(op, NOT_FOUND)
+                elif not can(a.company_id):
+                    results[i] = _result(op, FORBIDDEN)
+                else:
+                    try:
+                        qid = UUID(str(op.get("question_id")))
+                        items = clean_items(a, {qid: op.get("data") or {}})
+                    except (ValueError, InvalidResponse) as exc:
+                        results[i] = _result(op, INVALID, errors={"__all__": [str(exc)]})
+                    else:
+                        answers[a.pk].append((i, items))
+                continue
+
+            entity = ENTITIES.get(entity_name)
+            if entity is None or kind not in ("create", "update", "delete"):
+                results[i] = _result(op, INVALID, errors={"__all__": ["Operación desconocida."]})
+                continue
+
+            # ---- altas ----
+            if kind == "create":
+                company = companies.get(op.get("company_id"))
+                if company is None:
+                    results[i] = _result(op, NOT_FOUND)
+                    continue
+                if not can(company.pk):
+                    results[i] = _result(op, FORBIDDEN)
+                    continue
+                kw = entity.form_kwargs(company) if entity.form_kwargs else {}
+                form = entity.form_class(_form_data(op.get("data"), refs), **kw)
+                if not form.is_valid():
+                    results[i] = _result(op, INVALID, errors=form.errors.get_json_data())
+                    continue
+                try:
+                    with transaction.atomic():
+                        obj = form.save(commit=False)
+                        if entity.company_field == "company":
+                            obj.company = company
+                        obj.save()
+                        form.save_m2m()
+                except IntegrityError as exc:
+                    results[i] = _result(op, INVALID, errors={"__all__": [str(exc)]})
+                    continue
+                if op.get("ref"):
+                    refs[op["ref"]] = obj.pk
+                results[i] = _result(op, APPLIED, pk=obj.pk, updated_at=obj.updated_at.isoformat())
+                continue
+
+            # ---- ediciones y bajas ----
+            pk = ref_pk(op.get("pk"))
+            obj = objects.get(entity_name, {}).get(pk)
+            if obj is None and isinstance(pk, int) and op.get("pk") != pk:
+                # creado en este mismo lote (id temporal)
+                obj = _manager(entity).filter(pk=pk).first()
+            if obj is None:
+                results[i] = _result(op, NOT_FOUND)
+                continue
+            company_id = _company_id_of(obj, entity.company_field)
+            if not can(company_id):
+                results[i] = _result(op, FORBIDDEN)
+                continue
+            if op.get("pk") == pk and not _same_version(obj, op.get("updated_at")):
+                results[i] = _result(op, CONFLICT, pk=pk, updated_at=obj.updated_at.isoformat())
+                continue
+
+            if kind == "delete":
+                deletes.append((i, obj))
+                continue
+
+            kw = entity.form_kwargs(company_for(company_id)) if entity.form_kwargs else {}
+            form = entity.form_class(_form_data(op.get("data"), refs), instance=obj, **kw)
+            if not form.is_valid():
+                results[i] = _result(op, INVALID, errors=form.errors.get_json_data())
+                continue
+            try:
+                with transaction.atomic():
+                    obj = form.save()
+            except IntegrityError as exc:
+                results[i] = _result(op, INVALID, errors={"__all__": [str(exc)]})
+                continue
+            results[i] = _result(op, APPLIED, pk=obj.pk, updated_at=obj.updated_at.isoformat())
+
+        # ---- bajas y respuestas ----
+        # las bajas al final, para que ediciones del mismo lote no revivan lo borrado
+        for i, obj in deletes:
+            obj.soft_delete()
+            results[i] = _result(ops[i], APPLIED, pk=obj.pk)
+
+        for assessment_id, items in answers.items():
+            # una pregunta repetida en el lote: gana la última
+            latest = {}
+            for i, found in items:
+                for item in found:
+                    latest[item[0]] = item
+            upsert_responses(assessments[assessment_id], latest.values())
+            for i, _ in items:
+                results[i] = _result(ops[i], APPLIED)
+
+    return results
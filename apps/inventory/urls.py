@@ -14,6 +14,7 @@ from .views import (
     maintenance_create,
     maintenance_update,
     maintenance_delete,
+    maintenance_due_view,
     # New endpoints
     method_list,
     method_create,
@@ -43,6 +44,9 @@ from .views import (
     discipline_create,
     discipline_update,
     discipline_delete,
+    sync_view,
+    search_view,
+    suggest_view,
 )
 
 app_name = "inventory"
@@ -64,6 +68,7 @@ urlpatterns = [
     path("maintenance/<int:company_id>/new/", maintenance_create, name="maintenance_create"),
     path("maintenance/<int:pk>/edit/", maintenance_update, name="maintenance_update"),
     path("maintenance/<int:pk>/delete/", maintenance_delete, name="maintenance_delete"),
+    path("maintenance/<int:company_id>/due/", maintenance_due_view, name="maintenance_due"),
 
     # --- Métodos de trabajo (HTMX) ---
     path("methods/<int:company_id>/list/", method_list, name="method_list"),
@@ -107,4 +112,11 @@ urlpatterns = [
     path("disciplines/<int:pk>/edit/", discipline_update, name="discipline_update"),
     path("disciplines/<int:pk>/delete/", discipline_delete, name="discipline_delete"),
 
+    # --- Sincronización offline (lote JSON) ---
+    path("sync/", sync_view, name="sync"),
+
+    # --- Búsqueda global (fragmento HTMX) ---
+    path("search/", search_view, name="search"),
+    path("suggest/<str:kind>/", suggest_view, name="suggest"),
+
 ]
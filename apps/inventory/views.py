@@ -10,7 +10,10 @@ from django.apps import apps as django_apps
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, render
-from django.http import HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from django.views.generic import TemplateView
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_protect
@@ -27,6 +30,14 @@ from .models import (
     Material,
     Investment,
 )
+from apps.core.selectors import get_allowed_company_ids
+from apps.core.guards import limit_rows
+from apps.reports.capability import company_capability, top_gaps
+from apps.reports.energy import company_energy_mix
+from .scheduling import maintenance_due, split_due, DUE_SOON_DAYS
+from .search import MIN_LENGTH, search_inventory
+from .suggestions import SOURCES as SUGGESTION_SOURCES, suggest
+from .sync import SyncError, apply_batch
 from .forms import (
     EquipmentForm,
     TechnicalServiceForm,
@@ -78,6 +89,11 @@ class InventoryManageView(LoginRequiredMixin, TemplateView):
             partial=f"inventory/tabs/_{current_tab}.html",
             page_title=f"Inventario tecnológico — {company.name}",  # type: ignore
         )
+        if current_tab == "summary":
+            # Lee la tabla resumen, no el M2M Equipment↔EnergySource
+            ctx["energy_mix"] = company_energy_mix(company.pk)
+            ctx["capability"] = company_capability(company.pk)
+            ctx["top_gaps"] = top_gaps(company.pk)
         return ctx
 
     def get(self, request: HttpRequest, *args, **kwargs):
@@ -138,7 +154,8 @@ def crud_factory(
     @require_http_methods(["GET"])
     def list_view(request: HttpRequest, company_id: int) -> HttpResponse:
         company = get_company(company_id)
-        qs = qs_by_company(company)
+        # con LIMIT: una empresa con miles de filas corta con un aviso (apps.core.guards)
+        qs = limit_rows(request, qs_by_company(company))
         ctx = {"company": company, "object_list": qs}
         return render(request, list_template, ctx)
 
@@ -193,14 +210,18 @@ def crud_factory(
             "action": "update",
             "object": obj,
         }
-        return render(request, form_template, ctx)
+        resp = render(request, form_template, ctx)
+        # versión que el cliente usa para detectar conflictos al sincronizar offline
+        resp["X-Object-Updated-At"] = obj.updated_at.isoformat()
+        return resp
 
     @with_login
     @csrf_protect
     @require_http_methods(["POST", "DELETE"])
     def delete_view(request: HttpRequest, pk: int) -> HttpResponse:
         obj = get_object_or_404(model, pk=pk)
-        obj.delete()
+        # borrado lógico: la fila sigue para snapshots e histórico
+        obj.soft_delete()
         return _hx_trigger(event_name, True)
 
     return list_view, create_view, update_view, delete_view
@@ -245,14 +266,29 @@ maintenance_list, maintenance_create, maintenance_update, maintenance_delete = c
     form_template="inventory/maintenance/_form_modal.html",
     event_name="maintenance:refresh",
     qs_by_company=lambda company: EquipmentMaintenance.objects.filter(
-        equipment__company=company
-    ).select_related("equipment").order_by("equipment__name", "-last_date", "maintenance_type"),
-    company_from_obj=lambda obj: obj.equipment.company,
+        company=company
+    ).select_related("equipment").annotate(
+        is_overdue=ExpressionWrapper(Q(next_due_date__lt=timezone.localdate()), output_field=BooleanField())
+    ).order_by("equipment__name", "-last_date", "maintenance_type"),
+    company_from_obj=lambda obj: obj.company,
     # Pasamos la compañía al form para filtrar equipos
     form_kwargs_fn=lambda company, instance=None: {"company": company},
 )
 
 
+@login_required
+@require_http_methods(["GET"])
+def maintenance_due_view(request: HttpRequest, company_id: int) -> HttpResponse:
+    """
+    Fragmento HTMX: mantenimientos vencidos y por vencer de la empresa.
+    Se apoya en el índice de next_due_date (sin cálculo por fila).
+    """
+    company = get_object_or_404(Company, pk=company_id)
+    overdue, due_soon = split_due(maintenance_due([company.pk]))
+    ctx = {"company": company, "overdue": overdue, "due_soon": due_soon, "within_days": DUE_SOON_DAYS}
+    return render(request, "inventory/maintenance/_due.html", ctx)
+
+
 # ---------------- Métodos de trabajo ----------------
 
 method_list, method_create, method_update, method_delete = crud_factory(
@@ -352,3 +388,62 @@ discipline_list, discipline_create, discipline_update, discipline_delete = crud_
     company_from_obj=lambda obj: obj.company,
     before_create=lambda obj, company, form: setattr(obj, "company", company),
 )
+
+
+# ---------------- Sincronización offline ----------------
+
+@login_required
+@csrf_protect
+@require_http_methods(["POST"])
+def sync_view(request: HttpRequest) -> HttpResponse:
+    """
+    Recibe en un solo POST (JSON) la cola de cambios hechos sin conexión
+    y devuelve el resultado de cada uno (ver inventory/sync.py).
+    """
+    try:
+        payload = json.loads(request.body or b"{}")
+        ops = payload["ops"]
+        if not isinstance(ops, list):
+            raise ValueError
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({"error": "Se esperaba {\"ops\": [...]}"}, status=400)
+
+    allowed = None if request.user.is_superuser else get_allowed_company_ids(request.user)
+    try:
+        results = apply_batch(ops, allowed, request.user.pk)
+    except SyncError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    return JsonResponse({"results": results})
+
+
+# ---------------- Búsqueda global ----------------
+
+@login_required
+@require_http_methods(["GET"])
+def search_view(request: HttpRequest) -> HttpResponse:
+    """
+    Fragmento HTMX con los resultados de ?q= en equipos, materiales,
+    software, servicios e inversiones de las empresas visibles.
+    """
+    q = (request.GET.get("q") or "").strip()[:100]
+    allowed = None if request.user.is_superuser else get_allowed_company_ids(request.user)
+    ctx = {"q": q, "results": search_inventory(q, allowed), "min_length": MIN_LENGTH}
+    return render(request, "inventory/_search_results.html", ctx)
+
+
+# ---------------- Autocompletado ----------------
+
+@login_required
+@require_http_methods(["GET"])
+def suggest_view(request: HttpRequest, kind: str) -> HttpResponse:
+    """
+    <option>s para el <datalist> de un campo de texto libre (ver forms.SuggestInput).
+    El input manda su propio valor con el nombre del campo.
+    """
+    source = SUGGESTION_SOURCES.get(kind)
+    if source is None:
+        raise Http404
+    prefix = request.GET.get(source.field) or request.GET.get("q") or ""
+    resp = render(request, "inventory/_suggestions.html", {"values": suggest(kind, prefix[:100])})
+    patch_cache_control(resp, private=True, max_age=60)
+    return resp
@@ -0,0 +1,26 @@
+# apps/jobs/admin.py
+from django.contrib import admin, messages
+from django.utils import timezone
+
+from . import models
+
+
+@admin.register(models.Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "status", "company", "attempts", "progress_done", "progress_total", "created_at", "finished_at")
+    list_filter = ("status", "name")
+    search_fields = ("name",)
+    raw_id_fields = ("company", "created_by")
+    list_select_related = ("company",)
+    readonly_fields = (
+        "locked_by", "heartbeat_at", "progress_done", "progress_total", "progress_message",
+        "result", "error", "created_at", "started_at", "finished_at",
+    )
+    actions = ("retry",)
+
+    @admin.action(description="Reintentar los trabajos fallidos seleccionados")
+    def retry(self, request, queryset):
+        count = queryset.filter(status=models.Job.Status.FAILED).update(
+            status=models.Job.Status.QUEUED, attempts=0, run_after=timezone.now(), locked_by="", finished_at=None
+        )
+        self.message_user(request, f"{count} trabajo(s) de nuevo en cola.", messages.SUCCESS)
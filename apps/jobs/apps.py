@@ -0,0 +1,15 @@
+# apps/jobs/apps.py
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.jobs"
+    label = "jobs"
+    verbose_name = "Jobs"
+
+    def ready(self):
+        # Cada app registra sus tareas en su propio tasks.py
+        from django.utils.module_loading import autodiscover_modules
+
+        autodiscover_modules("tasks")
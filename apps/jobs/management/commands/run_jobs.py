@@ -0,0 +1,68 @@
+import os
+import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.jobs.queue import claim, heartbeat, registered, requeue_stale, run_job
+
+
+def _run(job):
+    try:
+        return run_job(job)
+    finally:
+        # cada hilo abre su propia conexión; no la dejamos colgada
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs from the jobs_job table with a thread pool. "
+        "Start several of these (e.g. one per core) for more throughput; "
+        "they share the queue through FOR UPDATE SKIP LOCKED."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=2, help="Jobs run concurrently by this worker.")
+        parser.add_argument("--poll", type=float, default=2.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Drain the queue and exit.")
+
+    def handle(self, *args, **opts):
+        threads = max(1, opts["threads"])
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        stop = threading.Event()
+
+        def shutdown(signum, frame):
+            self.stdout.write("Stopping after the running jobs finish...")
+            stop.set()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+
+        self.stdout.write(f"Worker {worker}: {threads} thread(s), tasks: {', '.join(registered()) or '-'}")
+        running = {}
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            while not stop.is_set():
+                for future in [f for f in running if f.done()]:
+                    job = running.pop(future)
+                    exc = future.exception()
+                    self.stdout.write(f"#{job.pk} {job.name}: {exc or job.status}")
+
+                heartbeat(worker, (job.pk for job in running.values()))
+                stale = requeue_stale()
+                if stale:
+                    self.stdout.write(self.style.WARNING(f"Requeued {stale} stale job(s)."))
+
+                claimed = claim(worker, threads - len(running)) if len(running) < threads else []
+                for job in claimed:
+                    running[pool.submit(_run, job)] = job
+
+                if opts["once"] and not claimed and not running:
+                    break
+                if not claimed:
+                    stop.wait(opts["poll"])
+            # al salir, el executor espera a los que siguen corriendo
+        connection.close()
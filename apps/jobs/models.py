@@ -0,0 +1,103 @@
+# apps/jobs/models.py
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+COMPANY_MODEL = getattr(settings, "COMPANY_MODEL", "core.Company")
+
+
+class Job(models.Model):
+    """
+    Trabajo en segundo plano (exportaciones, reconstrucciones, snapshots...).
+
+    La cola es la propia tabla: el worker (manage.py run_jobs) reclama filas
+    con SELECT ... FOR UPDATE SKIP LOCKED, así que no hace falta broker.
+    `name` es la tarea registrada en algún tasks.py (ver apps.jobs.queue).
+    """
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    id = models.BigAutoField(primary_key=True)
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(encoder=DjangoJSONEncoder, default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    priority = models.SmallIntegerField(default=0, help_text="Menor = antes.")
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+
+    # quién lo tiene y cuándo dio señales de vida por última vez
+    locked_by = models.CharField(max_length=100, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(default=0)
+    progress_message = models.CharField(max_length=200, blank=True)
+    result = models.JSONField(encoder=DjangoJSONEncoder, null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    company = models.ForeignKey(
+        COMPANY_MODEL, null=True, blank=True, on_delete=models.CASCADE, related_name="jobs"
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "jobs_job"
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        ordering = ["-created_at"]
+        indexes = [
+            # lo único que recorre el worker: la cola pendiente y los que corren
+            models.Index(
+                fields=["priority", "run_after", "id"],
+                condition=Q(status="queued"),
+                name="jobs_job_queued_idx",
+            ),
+            models.Index(
+                fields=["heartbeat_at"],
+                condition=Q(status="running"),
+                name="jobs_job_running_idx",
+            ),
+            models.Index(fields=["company", "created_at"], name="jobs_job_company_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.name} ({self.status})"
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (self.Status.DONE, self.Status.FAILED)
+
+    @property
+    def percent(self) -> int:
+        if self.status == self.Status.DONE:
+            return 100
+        if not self.progress_total:
+            return 0
+        return min(100, int(self.progress_done * 100 / self.progress_total))
+
+    def progress(self, done: int, total: int, message: str = "") -> None:
+        """
+        Avance visible desde la UI (y latido del worker). Se escribe con un
+        UPDATE directo: si la tarea lo llama dentro de su propio atomic(),
+        no se verá hasta el commit.
+        """
+        self.progress_done, self.progress_total = done, total
+        self.progress_message = message[:200]
+        Job.objects.filter(pk=self.pk).update(
+            progress_done=done,
+            progress_total=total,
+            progress_message=self.progress_message,
+            heartbeat_at=timezone.now(),
+        )
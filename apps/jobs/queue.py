@@ -0,0 +1,166 @@
+# apps/jobs/queue.py
+"""
+Cola de trabajos sobre la tabla jobs_job (sin broker externo).
+
+    @task("reports.take_snapshots")
+    def take_snapshots(job, period, company_ids=None): ...
+
+    enqueue("reports.take_snapshots", {"period": "2025"}, company=..., user=...)
+
+Las tareas reciben el Job (para `job.progress(...)`) y el payload como
+kwargs, y devuelven algo serializable a JSON que queda en `result`. Si
+fallan se reintentan con espera exponencial hasta `max_attempts`, salvo
+con ValueError (los errores de validación del portal): reintentar no
+cambia el dato.
+
+El worker (manage.py run_jobs) reclama con FOR UPDATE SKIP LOCKED: varios
+hilos o procesos pueden sacar trabajos a la vez sin pisarse. Un trabajo
+"running" cuyo worker dejó de latir más de JOBS_LEASE_SECONDS vuelve a la
+cola (el worker murió a mitad).
+"""
+import logging
+import traceback
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+LEASE_SECONDS = getattr(settings, "JOBS_LEASE_SECONDS", 300)
+RETRY_DELAY_SECONDS = getattr(settings, "JOBS_RETRY_DELAY_SECONDS", 30)
+
+_TASKS: Dict[str, Callable] = {}
+
+
+class UnknownTask(ValueError):
+    """El nombre no corresponde a ninguna tarea registrada."""
+
+
+def task(name: str):
+    """Registra `fn(job, **payload)` bajo `name`."""
+    def decorator(fn):
+        _TASKS[name] = fn
+        return fn
+    return decorator
+
+
+def registered() -> List[str]:
+    return sorted(_TASKS)
+
+
+def enqueue(
+    name: str,
+    payload: Optional[dict] = None,
+    *,
+    company=None,
+    user=None,
+    priority: int = 0,
+    max_attempts: int = 3,
+    delay: int = 0,
+) -> Job:
+    """
+    Encola un trabajo. Va en la transacción actual: si ésta se revierte,
+    el trabajo nunca existió.
+    """
+    if name not in _TASKS:
+        raise UnknownTask(f"Tarea desconocida: {name}")
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        company=company,
+        created_by=user if getattr(user, "is_authenticated", False) else None,
+        priority=priority,
+        max_attempts=max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def claim(worker: str, limit: int = 1) -> List[Job]:
+    """Toma hasta `limit` trabajos pendientes para `worker`."""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.Status.QUEUED, run_after__lte=now)
+            .order_by("priority", "run_after", "id")
+            .values_list("pk", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        for job in Job.objects.filter(pk__in=ids):
+            job.status = Job.Status.RUNNING
+            job.locked_by = worker
+            job.heartbeat_at = now
+            job.started_at = now
+            job.attempts += 1
+            job.save(update_fields=["status", "locked_by", "heartbeat_at", "started_at", "attempts"])
+    return list(Job.objects.filter(pk__in=ids).order_by("priority", "run_after", "id"))
+
+
+def heartbeat(worker: str, job_ids: Iterable[int]) -> None:
+    """Renueva el lease de los trabajos que `worker` tiene corriendo."""
+    job_ids = list(job_ids)
+    if job_ids:
+        Job.objects.filter(pk__in=job_ids, status=Job.Status.RUNNING, locked_by=worker).update(
+            heartbeat_at=timezone.now()
+        )
+
+
+def requeue_stale() -> int:
+    """
+    Devuelve a la cola los trabajos cuyo worker dejó de latir; los que ya
+    gastaron sus intentos (p. ej. los que tumban al worker) quedan fallidos.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.Status.RUNNING, heartbeat_at__lt=now - timedelta(seconds=LEASE_SECONDS)
+    )
+    stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.Status.FAILED,
+        locked_by="",
+        error="El worker dejó de responder en el último intento.",
+        finished_at=now,
+    )
+    return stale.filter(attempts__lt=F("max_attempts")).update(
+        status=Job.Status.QUEUED, locked_by="", run_after=now
+    )
+
+
+def _finish(job: Job, **fields) -> None:
+    # si otro worker lo re-tomó tras un lease vencido, el resultado es suyo
+    Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING, locked_by=job.locked_by).update(**fields)
+    for field, value in fields.items():
+        setattr(job, field, value)
+
+
+def run_job(job: Job) -> Job:
+    """Ejecuta un trabajo ya reclamado y registra el resultado o el error."""
+    fn = _TASKS.get(job.name)
+    try:
+        if fn is None:
+            raise UnknownTask(f"Tarea desconocida: {job.name}")
+        result = fn(job, **job.payload)
+    except Exception as exc:
+        logger.exception("Job %s (%s) falló en el intento %s", job.pk, job.name, job.attempts)
+        error = "".join(traceback.format_exception(exc))
+        if job.attempts < job.max_attempts and not isinstance(exc, ValueError):
+            delay = RETRY_DELAY_SECONDS * 2 ** (job.attempts - 1)
+            _finish(
+                job,
+                status=Job.Status.QUEUED,
+                locked_by="",
+                error=error,
+                run_after=timezone.now() + timedelta(seconds=delay),
+            )
+        else:
+            _finish(job, status=Job.Status.FAILED, error=error, finished_at=timezone.now())
+        return job
+
+    _finish(job, status=Job.Status.DONE, result=result, error="", finished_at=timezone.now())
+    return job
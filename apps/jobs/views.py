@@ -0,0 +1,27 @@
+# apps/jobs/views.py
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import get_object_or_404, render
+from django.views.decorators.http import require_http_methods
+
+from apps.core.selectors import get_allowed_company_ids
+from .models import Job
+
+
+def can_see(user, job: Job) -> bool:
+    if user.is_superuser or job.created_by_id == user.pk:
+        return True
+    return job.company_id is not None and job.company_id in get_allowed_company_ids(user)
+
+
+@login_required
+@require_http_methods(["GET"])
+def job_status(request, pk: int):
+    """
+    Fragmento HTMX con el avance de un trabajo. Se vuelve a pedir a sí
+    mismo (hx-trigger="every ...") hasta que el trabajo termina.
+    """
+    job = get_object_or_404(Job.objects.defer("payload", "result"), pk=pk)
+    if not can_see(request.user, job):
+        raise PermissionDenied("No tienes acceso a este trabajo.")
+    return render(request, "jobs/_job_status.html", {"job": job})
@@ -1,3 +1,110 @@
-from django.contrib import admin
+# apps/profiles/admin.py
+import json
 
-# Register your models here.
+from django import forms
+from django.contrib import admin, messages
+from django.http import HttpResponse
+from django.shortcuts import redirect, render
+from django.urls import path
+
+from . import models
+from apps.jobs.queue import enqueue
+from .importer import CatalogueImportError, export_catalogue, import_catalogue, read_file
+
+
+class QuestionImportForm(forms.Form):
+    file = forms.FileField(label="Archivo (JSON o CSV)")
+    instrument_code = forms.ChoiceField(
+        label="Instrumento", choices=[("", "(del archivo)")] + models.Question.INSTRUMENT_CHOICES, required=False
+    )
+    instrument_version = forms.CharField(label="Versión", max_length=20, required=False)
+    deactivate_missing = forms.BooleanField(
+        label="Desactivar preguntas que no vienen en el archivo", initial=True, required=False
+    )
+    dry_run = forms.BooleanField(label="Sólo simular (no guardar)", required=False)
+    background = forms.BooleanField(
+        label="Importar en segundo plano (archivos grandes)", required=False
+    )
+
+
+@admin.register(models.Question)
+class QuestionAdmin(admin.ModelAdmin):
+    change_list_template = "admin/profiles/question/change_list.html"
+    list_display = ("code", "instrument_code", "instrument_version", "dimension", "sub_dimension", "weight", "is_active")
+    list_filter = ("instrument_code", "instrument_version", "is_active", "dimension")
+    search_fields = ("code", "text")
+    readonly_fields = ("created_at", "updated_at")
+    actions = ("export_versions",)
+
+    def get_urls(self):
+        custom = [
+            path(
+                "import/",
+                self.admin_site.admin_view(self.import_view),
+                name="profiles_question_import",
+            ),
+        ]
+        return custom + super().get_urls()
+
+    def import_view(self, request):
+        if not self.has_add_permission(request) or not self.has_change_permission(request):
+            return redirect("admin:profiles_question_changelist")
+
+        report = None
+        form = QuestionImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            upload = form.cleaned_data["file"]
+            try:
+                code, version, rows = read_file(upload.read(), upload.name)
+                if form.cleaned_data["background"] and not form.cleaned_data["dry_run"]:
+                    job = enqueue(
+                        "profiles.import_catalogue",
+                        {
+                            "instrument_code": form.cleaned_data["instrument_code"] or code,
+                            "instrument_version": form.cleaned_data["instrument_version"] or version,
+                            "rows": rows,
+                            "deactivate_missing": form.cleaned_data["deactivate_missing"],
+                        },
+                        user=request.user,
+                    )
+                    self.message_user(request, f"Importación en cola (trabajo #{job.pk}).", messages.INFO)
+                    return redirect("admin:jobs_job_change", job.pk)
+                report = import_catalogue(
+                    form.cleaned_data["instrument_code"] or code,
+                    form.cleaned_data["instrument_version"] or version,
+                    rows,
+                    dry_run=form.cleaned_data["dry_run"],
+                    deactivate_missing=form.cleaned_data["deactivate_missing"],
+                )
+            except CatalogueImportError as exc:
+                form.add_error(None, str(exc))
+            else:
+                self.message_user(request, report.summary(), messages.SUCCESS)
+
+        ctx = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Importar versión de instrumento",
+            "form": form,
+            "report": report,
+        }
+        return render(request, "admin/profiles/question/import.html", ctx)
+
+    @admin.action(description="Exportar versión(es) de las preguntas seleccionadas (JSON)")
+    def export_versions(self, request, queryset):
+        versions = queryset.values_list("instrument_code", "instrument_version").distinct().order_by()
+        payload = [export_catalogue(code, version) for code, version in versions]
+        data = payload[0] if len(payload) == 1 else payload
+        response = HttpResponse(
+            json.dumps(data, ensure_ascii=False, indent=2), content_type="application/json"
+        )
+        response["Content-Disposition"] = 'attachment; filename="questions.json"'
+        return response
+
+
+@admin.register(models.Assessment)
+class AssessmentAdmin(admin.ModelAdmin):
+    list_display = ("company", "instrument_code", "instrument_version", "assessment_date", "analyst")
+    list_filter = ("instrument_code", "instrument_version")
+    raw_id_fields = ("company", "analyst")
+    readonly_fields = ("created_at", "updated_at")
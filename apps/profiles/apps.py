@@ -4,3 +4,6 @@ class ProfilesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.profiles"
     label = "profiles"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,130 @@
+# apps/profiles/catalogue.py
+"""
+Catálogo de preguntas en caché, por (instrumento, versión).
+
+Las vistas que pintan respuestas necesitan código, texto, dimensión y peso
+de cada pregunta; en lugar de volver a cargar filas completas de Question
+(una por respuesta) usan este catálogo liviano, que se invalida desde
+signals cuando cambia una pregunta.
+
+El formulario de diligenciamiento pinta primero sólo los encabezados de
+dimensión y carga las preguntas de cada una bajo demanda; por eso el
+catálogo trae ya agrupadas las preguntas activas (``sections``).
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Tuple
+from uuid import UUID
+
+from django.core.cache import cache
+
+from .models import Question
+
+CACHE_TTL = 60 * 60 * 24
+NO_DIMENSION = "Sin dimensión"
+
+
+@dataclass(frozen=True)
+class QuestionInfo:
+    id: UUID
+    code: str
+    text: str
+    dimension: str
+    sub_dimension: str
+    weight: Decimal
+    level_labels: Tuple[str, str, str, str]
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class Section:
+    """Una dimensión del formulario: sus preguntas activas por subdimensión."""
+
+    dimension: str
+    groups: Tuple[Tuple[str, Tuple[QuestionInfo, ...]], ...]  # (subdimensión, preguntas)
+    question_ids: Tuple[UUID, ...]
+
+    @property
+    def size(self) -> int:
+        return len(self.question_ids)
+
+
+@dataclass(frozen=True)
+class Catalogue:
+    instrument_code: str
+    instrument_version: str
+    questions: Tuple[QuestionInfo, ...]  # orden: dimensión, subdimensión, código
+    sections: Tuple[Section, ...] = ()  # sólo activas, en el mismo orden
+
+    @property
+    def by_id(self) -> Dict[UUID, QuestionInfo]:
+        return {q.id: q for q in self.questions}
+
+    @property
+    def active(self) -> List[QuestionInfo]:
+        return [q for q in self.questions if q.is_active]
+
+
+def normalize_instrument_code(raw: str) -> str:
+    """A veces se guarda "INNOVATION_PROFILE v1" o "INNOVATION_PROFILE 1"."""
+    return (raw or "").strip().replace(" v1", "").replace(" V1", "").replace(" 1", "").strip()
+
+
+def _cache_key(instrument_code: str, instrument_version: str) -> str:
+    # v2: el catálogo incluye las secciones del formulario
+    return f"profiles:catalogue:v2:{instrument_code}:{instrument_version}"
+
+
+def _sections(questions: Tuple[QuestionInfo, ...]) -> Tuple[Section, ...]:
+    # las preguntas ya vienen ordenadas por dimensión y subdimensión
+    grouped: Dict[str, Dict[str, List[QuestionInfo]]] = {}
+    for q in questions:
+        if q.is_active:
+            grouped.setdefault((q.dimension or "").strip() or NO_DIMENSION, {}).setdefault(q.sub_dimension, []).append(q)
+    return tuple(
+        Section(
+            dimension=dimension,
+            groups=tuple((sub, tuple(qs)) for sub, qs in subs.items()),
+            question_ids=tuple(q.id for qs in subs.values() for q in qs),
+        )
+        for dimension, subs in grouped.items()
+    )
+
+
+def _load(instrument_code: str, instrument_version: str) -> Catalogue:
+    rows = (
+        Question.objects.filter(instrument_code=instrument_code, instrument_version=instrument_version)
+        .order_by("dimension", "sub_dimension", "code")
+        .values_list(
+            "id", "code", "text", "dimension", "sub_dimension", "weight",
+            "level_1_label", "level_2_label", "level_3_label", "level_4_label", "is_active",
+        )
+    )
+    questions = tuple(
+        QuestionInfo(
+            id=qid,
+            code=code,
+            text=text,
+            dimension=dimension or NO_DIMENSION,
+            sub_dimension=sub_dimension or "",
+            weight=weight,
+            level_labels=(l1, l2, l3, l4),
+            is_active=is_active,
+        )
+        for qid, code, text, dimension, sub_dimension, weight, l1, l2, l3, l4, is_active in rows
+    )
+    return Catalogue(instrument_code, instrument_version, questions, _sections(questions))
+
+
+def get_catalogue(instrument_code: str, instrument_version: str) -> Catalogue:
+    instrument_code = normalize_instrument_code(instrument_code)
+    key = _cache_key(instrument_code, instrument_version)
+    catalogue = cache.get(key)
+    if catalogue is None:
+        catalogue = _load(instrument_code, instrument_version)
+        cache.set(key, catalogue, CACHE_TTL)
+    return catalogue
+
+
+def invalidate_catalogue(instrument_code: str, instrument_version: str) -> None:
+    cache.delete(_cache_key(instrument_code, instrument_version))
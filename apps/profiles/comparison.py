@@ -0,0 +1,97 @@
+# apps/profiles/comparison.py
+"""
+Comparación de evaluaciones de una empresa: matriz pregunta × evaluación.
+
+Sólo se leen tuplas (assessment_id, question_id, answer_value, score) de
+profiles_response; el texto/dimensión/peso sale del catálogo en caché.
+Las preguntas se alinean por `code`, así se pueden comparar versiones
+distintas del mismo instrumento.
+"""
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+
+from .catalogue import QuestionInfo, get_catalogue
+from .models import Assessment, Response
+
+
+def _delta(current: Optional[Decimal], previous: Optional[Decimal]) -> Optional[Decimal]:
+    if current is None or previous is None:
+        return None
+    return current - previous
+
+
+def _deltas(values: List[Optional[Decimal]]) -> List[Optional[Decimal]]:
+    """Delta de cada columna contra la anterior (la primera no tiene)."""
+    return [None] + [_delta(values[i], values[i - 1]) for i in range(1, len(values))]
+
+
+def build_comparison(assessments: Sequence[Assessment]) -> Dict:
+    """
+    `assessments` en orden cronológico (todas del mismo instrumento).
+
+    Devuelve:
+      - rows: [{question, cells: [{answer, score, delta}], change}] por pregunta
+      - dimensions: [{name, cells: [{score, delta}], change}] promedio ponderado
+        por peso de pregunta, por dimensión y evaluación
+    """
+    ids = [a.id for a in assessments]
+    column = {aid: i for i, aid in enumerate(ids)}
+    n = len(ids)
+
+    lookup: Dict = {}
+    for version in {a.instrument_version for a in assessments}:
+        lookup.update(get_catalogue(assessments[0].instrument_code, version).by_id)
+
+    # code -> pregunta representativa (la primera que aparece en las respuestas)
+    questions: Dict[str, QuestionInfo] = {}
+    answers: Dict[str, List] = defaultdict(lambda: [None] * n)
+    scores: Dict[str, List] = defaultdict(lambda: [None] * n)
+
+    tuples = Response.objects.filter(assessment_id__in=ids).values_list(
+        "assessment_id", "question_id", "answer_value", "score"
+    )
+    for assessment_id, question_id, answer_value, score in tuples:
+        q = lookup.get(question_id)
+        if q is None:
+            continue
+        col = column[assessment_id]
+        questions.setdefault(q.code, q)
+        answers[q.code][col] = answer_value
+        scores[q.code][col] = score
+
+    ordered = sorted(questions.values(), key=lambda q: (q.dimension, q.sub_dimension, q.code))
+
+    rows = []
+    dim_num: Dict[str, List[Decimal]] = defaultdict(lambda: [Decimal("0")] * n)
+    dim_den: Dict[str, List[Decimal]] = defaultdict(lambda: [Decimal("0")] * n)
+    for q in ordered:
+        q_scores = scores[q.code]
+        deltas = _deltas(q_scores)
+        rows.append({
+            "question": q,
+            "cells": [
+                {"answer": a, "score": s, "delta": d}
+                for a, s, d in zip(answers[q.code], q_scores, deltas)
+            ],
+            "change": _delta(q_scores[-1], q_scores[0]) if n > 1 else None,
+        })
+        for i, s in enumerate(q_scores):
+            if s is not None:
+                dim_num[q.dimension][i] += s * q.weight
+                dim_den[q.dimension][i] += q.weight
+
+    dimensions = []
+    for name in sorted(dim_num):
+        values = [
+            (num / den).quantize(Decimal("0.01")) if den else None
+            for num, den in zip(dim_num[name], dim_den[name])
+        ]
+        known = [v for v in values if v is not None]
+        dimensions.append({
+            "name": name,
+            "cells": [{"score": v, "delta": d} for v, d in zip(values, _deltas(values))],
+            "change": known[-1] - known[0] if len(known) > 1 else None,
+        })
+
+    return {"rows": rows, "dimensions": dimensions}
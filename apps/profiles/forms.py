@@ -2,6 +2,7 @@
 from django import forms
 from django.conf import settings
 
+from .catalogue import normalize_instrument_code
 from .models import Question, Assessment, Response
 
 
@@ -29,6 +30,27 @@ class AssessmentForm(TailwindModelForm):
         label="Fecha de evaluación",
     )
 
+    copy_from = forms.ModelChoiceField(
+        queryset=Assessment.objects.none(),
+        required=False,
+        label="Partir de evaluación anterior",
+        help_text="Copia sus respuestas; sólo tendrás que editar lo que cambió.",
+    )
+
+    def __init__(self, *args, company=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if company is not None:
+            self.fields["copy_from"].queryset = Assessment.objects.filter(company=company).order_by("-assessment_date")
+
+    def clean(self):
+        cleaned = super().clean()
+        source = cleaned.get("copy_from")
+        if source and normalize_instrument_code(source.instrument_code) != normalize_instrument_code(
+            cleaned.get("instrument_code")
+        ):
+            self.add_error("copy_from", "La evaluación anterior debe ser del mismo instrumento.")
+        return cleaned
+
     class Meta:
         model = Assessment
         # company y analyst los vamos a setear en la vista
@@ -0,0 +1,195 @@
+# apps/profiles/importer.py
+"""
+Importación en lote del catálogo de preguntas de una versión de instrumento.
+
+El archivo (JSON o CSV) trae la versión completa. Se compara contra las filas
+existentes por (instrument_code, instrument_version, code) y, en una sola
+transacción, se crean las nuevas (bulk_create), se actualizan las que
+cambiaron (bulk_update) y se desactivan (is_active=False) las que ya no
+vienen. Nunca se borran preguntas: pueden tener respuestas.
+"""
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from .catalogue import invalidate_catalogue
+from .models import Question
+
+# Columnas del archivo (mismos nombres que en el modelo)
+FIELDS = (
+    "code", "text", "dimension", "sub_dimension",
+    "level_1_label", "level_2_label", "level_3_label", "level_4_label",
+    "weight",
+)
+_COMPARED = FIELDS[1:] + ("is_active",)
+
+
+class CatalogueImportError(ValueError):
+    pass
+
+
+@dataclass
+class ImportReport:
+    instrument_code: str
+    instrument_version: str
+    created: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    deactivated: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    dry_run: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.created or self.updated or self.deactivated)
+
+    def summary(self) -> str:
+        prefix = "[simulación] " if self.dry_run else ""
+        return (
+            f"{prefix}{self.instrument_code} {self.instrument_version}: "
+            f"{len(self.created)} nuevas, {len(self.updated)} actualizadas, "
+            f"{len(self.deactivated)} desactivadas, {self.unchanged} sin cambios"
+        )
+
+
+def read_file(content: bytes, filename: str = "") -> Tuple[Optional[str], Optional[str], List[dict]]:
+    """
+    Devuelve (instrument_code, instrument_version, filas). El JSON puede ser
+    una lista de preguntas o {"instrument_code", "instrument_version",
+    "questions": [...]}; el CSV trae una fila por pregunta con encabezados.
+    """
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise CatalogueImportError("El archivo debe estar en UTF-8")
+    if filename.lower().endswith(".csv"):
+        return None, None, list(csv.DictReader(io.StringIO(text)))
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise CatalogueImportError(f"JSON inválido: {exc}")
+    if isinstance(data, list):
+        return None, None, data
+    if isinstance(data, dict) and isinstance(data.get("questions"), list):
+        return data.get("instrument_code"), data.get("instrument_version"), data["questions"]
+    raise CatalogueImportError("El JSON debe ser una lista de preguntas o un objeto con 'questions'.")
+
+
+def _max_length(name: str) -> Optional[int]:
+    return Question._meta.get_field(name).max_length
+
+
+def _clean_row(i: int, raw: dict) -> dict:
+    # lo que no cabe en las columnas se rechaza aquí: en bulk_create sería un DataError
+    if not isinstance(raw, dict):
+        raise CatalogueImportError(f"Fila {i}: se esperaba un objeto con los campos de la pregunta.")
+    row = {name: (str(raw.get(name) or "")).strip() for name in FIELDS}
+    if not row["code"]:
+        raise CatalogueImportError(f"Fila {i}: falta 'code'.")
+    if not row["text"]:
+        raise CatalogueImportError(f"Fila {i} ({row['code']}): falta 'text'.")
+    for name in FIELDS[:-1]:
+        limit = _max_length(name)
+        if len(row[name]) > limit:
+            raise CatalogueImportError(f"Fila {i} ({row['code'][:30]}): '{name}' supera {limit} caracteres.")
+    weight_field = Question._meta.get_field("weight")
+    try:
+        weight = Decimal(row["weight"] or "1")
+        if weight.is_finite():
+            weight = weight.quantize(Decimal(1).scaleb(-weight_field.decimal_places))
+    except InvalidOperation:
+        weight = None
+    if weight is None or not weight.is_finite() or (
+        abs(weight) >= 10 ** (weight_field.max_digits - weight_field.decimal_places)
+    ):
+        raise CatalogueImportError(f"Fila {i} ({row['code']}): peso inválido '{raw.get('weight')}'.")
+    row["weight"] = weight
+    row["sub_dimension"] = row["sub_dimension"] or None
+    row["is_active"] = True
+    return row
+
+
+def import_catalogue(
+    instrument_code: str,
+    instrument_version: str,
+    rows: Iterable[dict],
+    dry_run: bool = False,
+    deactivate_missing: bool = True,
+    batch_size: int = 500,
+) -> ImportReport:
+    valid_codes = dict(Question.INSTRUMENT_CHOICES)
+    if instrument_code not in valid_codes:
+        raise CatalogueImportError(f"Instrumento desconocido: {instrument_code}")
+    if not instrument_version:
+        raise CatalogueImportError("Falta la versión del instrumento.")
+    if len(str(instrument_version)) > _max_length("instrument_version"):
+        raise CatalogueImportError(
+            f"La versión del instrumento supera {_max_length('instrument_version')} caracteres."
+        )
+
+    incoming: Dict[str, dict] = {}
+    for i, raw in enumerate(rows, start=1):
+        row = _clean_row(i, raw)
+        if row["code"] in incoming:
+            raise CatalogueImportError(f"Código repetido en el archivo: {row['code']}")
+        incoming[row["code"]] = row
+
+    report = ImportReport(instrument_code, instrument_version, dry_run=dry_run)
+    existing = {
+        q.code: q
+        for q in Question.objects.filter(instrument_code=instrument_code, instrument_version=instrument_version)
+    }
+    now = timezone.now()
+
+    to_create, to_update = [], []
+    for code, row in incoming.items():
+        q = existing.get(code)
+        if q is None:
+            to_create.append(Question(instrument_code=instrument_code, instrument_version=instrument_version, **row))
+            report.created.append(code)
+        elif any(getattr(q, name) != row[name] for name in _COMPARED):
+            for name in _COMPARED:
+                setattr(q, name, row[name])
+            q.updated_at = now
+            to_update.append(q)
+            report.updated.append(code)
+        else:
+            report.unchanged += 1
+
+    if deactivate_missing:
+        for code, q in existing.items():
+            if code not in incoming and q.is_active:
+                q.is_active = False
+                q.updated_at = now
+                to_update.append(q)
+                report.deactivated.append(code)
+
+    if dry_run or not report.changed:
+        return report
+
+    with transaction.atomic():
+        Question.objects.bulk_create(to_create, batch_size=batch_size)
+        Question.objects.bulk_update(to_update, _COMPARED + ("updated_at",), batch_size=batch_size)
+        # bulk_* no emite signals: invalidamos el catálogo a mano
+        transaction.on_commit(lambda: invalidate_catalogue(instrument_code, instrument_version))
+    return report
+
+
+def export_catalogue(instrument_code: str, instrument_version: str) -> dict:
+    """Versión completa (sólo activas) en el mismo formato que acepta el import."""
+    rows = (
+        Question.objects.filter(instrument_code=instrument_code, instrument_version=instrument_version, is_active=True)
+        .order_by("dimension", "sub_dimension", "code")
+        .values(*FIELDS)
+    )
+    return {
+        "instrument_code": instrument_code,
+        "instrument_version": instrument_version,
+        "questions": [{**r, "weight": str(r["weight"]), "sub_dimension": r["sub_dimension"] or ""} for r in rows],
+    }
@@ -0,0 +1,79 @@
+# apps/profiles/management/commands/benchmark_uuid_keys.py
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.common.ids import uuid7
+
+GENERATORS = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare insert throughput and index size of uuid4 vs uuid7 keys on a scratch copy "
+        "of the profiles_response layout (PostgreSQL only; tables are dropped afterwards)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2_000_000, help="Responses per generator.")
+        parser.add_argument("--questions", type=int, default=60, help="Questions per assessment.")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **opts):
+        if connection.vendor != "postgresql":
+            raise CommandError("The benchmark needs PostgreSQL (index sizes come from pg_relation_size).")
+        rows, per, batch = opts["rows"], opts["questions"], opts["batch_size"]
+
+        self.stdout.write(f"{'keys':<6} {'seconds':>8} {'rows/s':>10} {'pkey MB':>8} {'unique MB':>10}")
+        for name, generate in GENERATORS.items():
+            table = f"bench_response_{name}"
+            questions = [generate() for _ in range(per)]
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {table}")
+                cursor.execute(f"""
+                    CREATE TABLE {table} (
+                        id uuid PRIMARY KEY,
+                        assessment_id uuid NOT NULL,
+                        question_id uuid NOT NULL,
+                        answer_value integer NOT NULL,
+                        UNIQUE (assessment_id, question_id)
+                    )
+                """)
+                try:
+                    elapsed = self._fill(cursor, table, generate, questions, rows, batch)
+                    cursor.execute(f"""
+                        SELECT pg_relation_size('{table}_pkey'),
+                               pg_relation_size('{table}_assessment_id_question_id_key')
+                    """)
+                    pkey, unique = cursor.fetchone()
+                finally:
+                    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            self.stdout.write(
+                f"{name:<6} {elapsed:>8.1f} {rows / elapsed:>10.0f} "
+                f"{pkey / 2**20:>8.1f} {unique / 2**20:>10.1f}"
+            )
+
+    @staticmethod
+    def _fill(cursor, table, generate, questions, rows, batch):
+        """Inserta como la app: un assessment tras otro, todas sus respuestas juntas."""
+        elapsed = 0.0
+        done = 0
+        assessment = generate()
+        while done < rows:
+            ids, assessments, question_ids = [], [], []
+            for _ in range(min(batch, rows - done)):
+                if done and done % len(questions) == 0:
+                    assessment = generate()
+                ids.append(generate())
+                assessments.append(assessment)
+                question_ids.append(questions[done % len(questions)])
+                done += 1
+            start = time.perf_counter()
+            cursor.execute(
+                f"INSERT INTO {table} SELECT unnest(%s::uuid[]), unnest(%s::uuid[]), unnest(%s::uuid[]), 1",
+                [ids, assessments, question_ids],
+            )
+            elapsed += time.perf_counter() - start
+        return elapsed
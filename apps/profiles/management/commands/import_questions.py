@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.profiles.importer import CatalogueImportError, import_catalogue, read_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a complete instrument version from a JSON/CSV file: create new questions, "
+        "update changed ones and deactivate the ones missing from the file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSON or CSV file.")
+        parser.add_argument("--instrument", help="Instrument code (required for CSV or plain JSON lists).")
+        parser.add_argument("--instrument-version", help="Instrument version.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report the changes.")
+        parser.add_argument(
+            "--keep-missing", action="store_true", help="Do not deactivate questions missing from the file."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], "rb") as fh:
+                code, version, rows = read_file(fh.read(), options["path"])
+            report = import_catalogue(
+                options["instrument"] or code,
+                options["instrument_version"] or version,
+                rows,
+                dry_run=options["dry_run"],
+                deactivate_missing=not options["keep_missing"],
+            )
+        except (OSError, CatalogueImportError) as exc:
+            raise CommandError(str(exc))
+
+        for label, codes in (("created", report.created), ("updated", report.updated),
+                             ("deactivated", report.deactivated)):
+            if codes and options["verbosity"] > 1:
+                self.stdout.write(f"  {label}: {', '.join(codes)}")
+        self.stdout.write(self.style.SUCCESS(report.summary()))
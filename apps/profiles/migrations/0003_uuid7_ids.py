@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:58
+
+import apps.common.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_alter_question_sub_dimension'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='assessment',
+            name='id',
+            field=models.UUIDField(default=apps.common.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='id',
+            field=models.UUIDField(default=apps.common.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='response',
+            name='id',
+            field=models.UUIDField(default=apps.common.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
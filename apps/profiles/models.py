@@ -1,9 +1,9 @@
 # apps/profiles/models.py
-import uuid
 from decimal import Decimal
 from django.conf import settings
 from django.db import models
 
+from apps.common.ids import uuid7
 from apps.inventory.models import TimeStampedModel  # tu base con created_at / updated_at
 
 # leemos el nombre del modelo de compañía, pero NO lo resolvemos aún
@@ -19,7 +19,7 @@ class Question(TimeStampedModel):
         ("TECH_PROFILE", "Tech profile"),
     ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     instrument_code = models.CharField(max_length=50, choices=INSTRUMENT_CHOICES)
     instrument_version = models.CharField(max_length=20)
     code = models.CharField(max_length=30)
@@ -54,7 +54,7 @@ class Assessment(TimeStampedModel):
         ("TECH_PROFILE", "Tech profile"),
     ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
 
     # 👇 usamos el string, NO get_model
     company = models.ForeignKey(
@@ -85,7 +85,7 @@ class Response(TimeStampedModel):
     """
     Respuesta a una pregunta de un assessment concreto.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
 
     assessment = models.ForeignKey(
         "profiles.Assessment",  # string para evitar orden de carga
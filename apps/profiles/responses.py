@@ -0,0 +1,176 @@
+# apps/profiles/responses.py
+"""
+Escritura de respuestas de una evaluación.
+
+Tanto el autosave por pregunta como el envío final pasan por
+`upsert_responses`: un único INSERT ... ON CONFLICT (assessment, question)
+DO UPDATE sobre el índice único, sin leer antes las filas existentes.
+Como bulk_create no emite post_save, cada escritura emite `responses_saved`;
+los resúmenes (benchmarks) sólo se recalculan con el envío final
+(final=True), una vez por cuestionario, y el autosave cuesta sólo su escritura.
+
+`copy_responses` siembra una evaluación nueva con las respuestas de una
+anterior en un solo INSERT ... SELECT, emparejando preguntas por código.
+"""
+import re
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from django.db import connection, transaction
+
+from .catalogue import get_catalogue, normalize_instrument_code
+from .models import Assessment, Question, Response
+from .signals import responses_saved
+
+ANSWER_VALUES = (1, 2, 3, 4)
+
+_FIELD = re.compile(r"^q_(?P<qid>[0-9a-f-]{36})_(?P<name>answer_value|observations)$")
+
+# (question_id, answer_value, observations)
+Item = Tuple[UUID, int, str]
+
+
+class InvalidResponse(ValueError):
+    pass
+
+
+def parse_post(data) -> Dict[UUID, dict]:
+    """
+    Agrupa por pregunta los campos `q_<uuid>_answer_value` / `q_<uuid>_observations`
+    presentes en el POST (el form sólo manda las preguntas modificadas).
+    """
+    found: Dict[UUID, dict] = {}
+    for key in data:
+        m = _FIELD.match(key)
+        if m:
+            found.setdefault(UUID(m["qid"]), {})[m["name"]] = data.get(key)
+    return found
+
+
+def clean_items(assessment: Assessment, posted: Dict[UUID, dict]) -> List[Item]:
+    """
+    Valida contra el catálogo del instrumento (preguntas activas) y la escala
+    1..4. Las preguntas sin valor elegido se ignoran, como en el form completo.
+    """
+    questions = get_catalogue(assessment.instrument_code, assessment.instrument_version).by_id
+    items = []
+    for qid, fields in posted.items():
+        q = questions.get(qid)
+        if q is None or not q.is_active:
+            raise InvalidResponse(f"Pregunta no válida para este instrumento: {qid}")
+        raw = fields.get("answer_value")
+        if not raw:
+            continue
+        try:
+            value = int(raw)
+        except (TypeError, ValueError):
+            value = None
+        if value not in ANSWER_VALUES:
+            raise InvalidResponse(f"Valor fuera de escala para {q.code}: {raw}")
+        items.append((qid, value, fields.get("observations") or ""))
+    return items
+
+
+def upsert_responses(assessment: Assessment, items: Iterable[Item], final: bool = True) -> int:
+    """Inserta o actualiza las respuestas dadas en una sola sentencia."""
+    objs = [
+        Response(
+            assessment=assessment,
+            question_id=qid,
+            answer_value=value,
+            score=Decimal(value),  # 1→1, 2→2, ...
+            observations=observations,
+        )
+        for qid, value, observations in items
+    ]
+    with transaction.atomic():
+        if objs:
+            Response.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=["assessment", "question"],
+                update_fields=["answer_value", "score", "observations", "updated_at"],
+            )
+        responses_saved.send(
+            sender=Response,
+            assessment=assessment,
+            question_ids=[o.question_id for o in objs],
+            items=[(o.question_id, o.answer_value, o.observations) for o in objs],
+            final=final,
+        )
+    return len(objs)
+
+
+def save_posted(assessment: Assessment, data, only: Optional[UUID] = None) -> int:
+    """
+    Parsea, valida y guarda lo que venga en el POST. Con `only` se guarda
+    una sola pregunta (autosave) y no se notifica a los resúmenes.
+    """
+    posted = parse_post(data)
+    if only is not None:
+        posted = {only: posted.get(only, {})}
+    return upsert_responses(assessment, clean_items(assessment, posted), final=only is None)
+
+
+# UUIDv7 en SQL (como apps.common.ids.uuid7): milisegundos en los 48 bits
+# altos de un uuid aleatorio y versión 7 (bits 52-53 sobre la versión 4)
+_UUID7_SQL = (
+    "encode(set_bit(set_bit(overlay(uuid_send(gen_random_uuid()) placing "
+    "substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3) "
+    "FROM 1 FOR 6), 52, 1), 53, 1), 'hex')::uuid"
+)
+
+
+def copy_responses(source: Assessment, target: Assessment) -> int:
+    """
+    Copia las respuestas de `source` a `target` en una sentencia. Las
+    preguntas se emparejan por código dentro del instrumento/versión de
+    `target` (sirve igual si la versión cambió); las que ya no existen o
+    están inactivas se omiten y lo ya respondido en `target` no se pisa.
+    """
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(f"""
+                    INSERT INTO {Response._meta.db_table}
+                        (id, assessment_id, question_id, answer_value, score, observations, created_at, updated_at)
+                    SELECT {_UUID7_SQL}, %(target)s, tq.id, r.answer_value, r.score, r.observations, now(), now()
+                    FROM {Response._meta.db_table} r
+                    JOIN {Question._meta.db_table} sq ON sq.id = r.question_id
+                    JOIN {Question._meta.db_table} tq
+                      ON tq.code = sq.code AND tq.instrument_code = %(code)s
+                     AND tq.instrument_version = %(version)s AND tq.is_active
+                    WHERE r.assessment_id = %(source)s
+                    ON CONFLICT (assessment_id, question_id) DO NOTHING
+                    RETURNING question_id, answer_value, observations
+                """, {
+                    "source": source.pk, "target": target.pk,
+                    "code": normalize_instrument_code(target.instrument_code),
+                    "version": target.instrument_version,
+                })
+                items = cursor.fetchall()
+        else:
+            catalogue = get_catalogue(target.instrument_code, target.instrument_version)
+            by_code = {q.code: q for q in catalogue.questions}
+            answered = set(target.responses.values_list("question_id", flat=True))
+            items = [
+                (by_code[code].id, value, observations)
+                for code, value, observations in source.responses.values_list(
+                    "question__code", "answer_value", "observations"
+                )
+                if code in by_code and by_code[code].is_active and by_code[code].id not in answered
+            ]
+            Response.objects.bulk_create([
+                Response(assessment=target, question_id=qid, answer_value=value, score=Decimal(value),
+                         observations=observations)
+                for qid, value, observations in items
+            ])
+        responses_saved.send(
+            sender=Response,
+            assessment=target,
+            question_ids=[qid for qid, _, _ in items],
+            items=items,
+            final=True,
+        )
+    return len(items)
@@ -0,0 +1,29 @@
+# apps/profiles/signals.py
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from .catalogue import invalidate_catalogue
+from .models import Question
+
+# Escrituras en lote de respuestas (bulk upsert, sin post_save por fila).
+# kwargs: assessment, question_ids, items [(question_id, answer_value, observations)],
+# final (False en el autosave por pregunta)
+responses_saved = Signal()
+
+
+@receiver(pre_save, sender=Question)
+def _question_remember_instrument(sender, instance, raw=False, **kwargs):
+    # Si la pregunta cambia de instrumento/versión, hay que invalidar ambos catálogos
+    instance._previous_instrument = (
+        Question.objects.filter(pk=instance.pk).values_list("instrument_code", "instrument_version").first()
+        if not raw else None
+    )
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def _question_changed(sender, instance, **kwargs):
+    invalidate_catalogue(instance.instrument_code, instance.instrument_version)
+    previous = getattr(instance, "_previous_instrument", None)
+    if previous:
+        invalidate_catalogue(*previous)
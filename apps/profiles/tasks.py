@@ -0,0 +1,17 @@
+# apps/profiles/tasks.py
+"""Trabajos en segundo plano de perfiles (ver apps.jobs.queue)."""
+from apps.jobs.queue import task
+from .importer import import_catalogue
+
+
+@task("profiles.import_catalogue")
+def import_catalogue_job(job, instrument_code, instrument_version, rows, deactivate_missing=True):
+    job.progress(0, len(rows), f"Importando {len(rows)} preguntas")
+    report = import_catalogue(instrument_code, instrument_version, rows, deactivate_missing=deactivate_missing)
+    job.progress(len(rows), len(rows), report.summary())
+    return {
+        "created": len(report.created),
+        "updated": len(report.updated),
+        "deactivated": len(report.deactivated),
+        "unchanged": report.unchanged,
+    }
@@ -13,5 +13,16 @@ urlpatterns = [
     path("<str:company_id>/assessments/new/", views.assessment_create, name="assessment_create"),
     path("<str:company_id>/questions/", views.question_list, name="question_list"),
     path("<str:company_id>/responses/", views.response_list, name="response_list"),
+    path("<str:company_id>/compare/", views.assessment_compare, name="assessment_compare"),
     path("<str:company_id>/assessments/<uuid:assessment_id>/fill/", views.assessment_fill, name="assessment_fill"),
+    path(
+        "<str:company_id>/assessments/<uuid:assessment_id>/fill/<int:index>/",
+        views.assessment_fill_section,
+        name="assessment_fill_section",
+    ),
+    path(
+        "<str:company_id>/assessments/<uuid:assessment_id>/responses/<uuid:question_id>/",
+        views.response_autosave,
+        name="response_autosave",
+    ),
 ]
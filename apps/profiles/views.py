@@ -1,16 +1,22 @@
 # apps/profiles/views.py
 from typing import cast
-from decimal import Decimal
+from uuid import UUID
 from collections import defaultdict
 from django.conf import settings
+from django.db import transaction
 from django.apps import apps as django_apps
 from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponseBadRequest
 from django.shortcuts import get_object_or_404, render, redirect
-from django.db import transaction
+from django.utils import timezone
+from django.views.decorators.http import require_POST
 
 from apps.core.selectors import get_allowed_company_ids
 from apps.core.models import Company as CompanyType
 from .models import Question, Assessment, Response
+from .catalogue import get_catalogue
+from .responses import InvalidResponse, copy_responses, save_posted
+from .comparison import build_comparison
 
 from .forms import AssessmentForm
 
@@ -74,12 +80,15 @@ def assessment_create(request, company_id):
     company = get_object_or_404(Company, id=company_id)
 
     if request.method == "POST":
-        form = AssessmentForm(request.POST)
+        form = AssessmentForm(request.POST, company=company)
         if form.is_valid():
             assessment = form.save(commit=False)
             assessment.company = company
             assessment.analyst = request.user
-            assessment.save()
+            with transaction.atomic():
+                assessment.save()
+                if form.cleaned_data.get("copy_from"):
+                    copy_responses(form.cleaned_data["copy_from"], assessment)
 
             if request.headers.get("HX-Request") == "true":
                 assessments = Assessment.objects.filter(company=company).order_by("-assessment_date")
@@ -90,7 +99,17 @@ def assessment_create(request, company_id):
                 )
             return redirect("profiles:manage", company_id=company_id)
     else:
-        form = AssessmentForm()
+        # "Partir de esta" en la lista llega con ?copy_from=<id>
+        try:
+            source = Assessment.objects.filter(company=company, pk=UUID(request.GET["copy_from"])).first()
+        except (KeyError, ValueError):
+            source = None
+        initial = {
+            "copy_from": source,
+            "instrument_code": source.instrument_code,
+            "instrument_version": source.instrument_version,
+        } if source else {}
+        form = AssessmentForm(company=company, initial=initial)
 
     return render(
         request,
@@ -132,12 +151,30 @@ def response_list(request, company_id):
         return render(request, "403.html", status=403)
 
     company = get_object_or_404(Company, id=company_id)
-    # traemos los últimos 5 assessments con sus respuestas
-    assessments = (
+    # últimos 5 assessments; de las respuestas sólo traemos tuplas y el
+    # texto de cada pregunta sale del catálogo en caché
+    assessments = list(
         Assessment.objects.filter(company=company)
         .order_by("-assessment_date")
-        .prefetch_related("responses__question")[:5]
+        .select_related("analyst")[:5]
     )
+    rows = defaultdict(list)
+    tuples = Response.objects.filter(assessment__in=assessments).values_list(
+        "assessment_id", "question_id", "answer_value", "score"
+    )
+    for assessment_id, question_id, answer_value, score in tuples:
+        rows[assessment_id].append((question_id, answer_value, score))
+
+    for a in assessments:
+        questions = get_catalogue(a.instrument_code, a.instrument_version).by_id
+        a.response_rows = sorted(
+            (
+                {"question": questions[qid], "answer_value": value, "score": score}
+                for qid, value, score in rows[a.id]
+                if qid in questions
+            ),
+            key=lambda r: r["question"].code,
+        )
 
     return render(
         request,
@@ -157,54 +194,14 @@ def assessment_fill(request, company_id, assessment_id):
     company = get_object_or_404(Company, id=company_id)
     assessment = get_object_or_404(Assessment, id=assessment_id, company=company)
 
-    # normalizamos porque a veces se guarda "INNOVATION_PROFILE v1" o "INNOVATION_PROFILE 1"
-    raw_code = (assessment.instrument_code or "").strip()
-    instrument_code = (
-        raw_code.replace(" v1", "")
-        .replace(" V1", "")
-        .replace(" 1", "")
-        .strip()
-    )
-
-    questions_qs = Question.objects.filter(
-        instrument_code=instrument_code,
-        instrument_version=assessment.instrument_version,
-        is_active=True,
-    ).order_by("dimension", "sub_dimension", "code")
-
-    # respuestas ya guardadas
-    existing_responses = {
-        r.question.id: r for r in Response.objects.filter(assessment=assessment)
-    }
-
     # ----------------- POST: guardar -----------------
+    # El form sólo manda las preguntas que cambiaron desde el último autosave
+    # (ver _assessment_fill.html), así que esto suele ser un upsert vacío.
     if request.method == "POST":
-        with transaction.atomic():
-            for q in questions_qs:
-                prefix = f"q_{q.id}"
-                answer_value = request.POST.get(f"{prefix}_answer_value")
-                observations = request.POST.get(f"{prefix}_observations", "")
-
-                if not answer_value:
-                    continue
-
-                answer_value = int(answer_value)
-                score = Decimal(str(answer_value))  # 1→1, 2→2, ...
-
-                if q.id in existing_responses:
-                    resp = existing_responses[q.id]
-                    resp.answer_value = answer_value
-                    resp.score = score
-                    resp.observations = observations
-                    resp.save()
-                else:
-                    Response.objects.create(
-                        assessment=assessment,
-                        question=q,
-                        answer_value=answer_value,
-                        score=score,
-                        observations=observations,
-                    )
+        try:
+            save_posted(assessment, request.POST)
+        except InvalidResponse as exc:
+            return HttpResponseBadRequest(str(exc))
 
         # volvemos a la lista
         assessments = (
@@ -218,23 +215,140 @@ def assessment_fill(request, company_id, assessment_id):
             {"company": company, "assessments": assessments},
         )
 
-    # ----------------- GET: agrupamos -----------------
-    grouped = defaultdict(lambda: defaultdict(list))
+    # ----------------- GET: sólo encabezados -----------------
+    # Las preguntas de cada dimensión llegan después por HTMX
+    # (assessment_fill_section), al abrirla o al aparecer en pantalla.
+    catalogue = get_catalogue(assessment.instrument_code, assessment.instrument_version)
+    answered = set(
+        Response.objects.filter(assessment=assessment).values_list("question_id", flat=True)
+    )
+    sections = [
+        {
+            "index": index,
+            "dimension": section.dimension,
+            "size": section.size,
+            "groups": len(section.groups),
+            "answered": sum(1 for qid in section.question_ids if qid in answered),
+        }
+        for index, section in enumerate(catalogue.sections)
+    ]
+
+    ctx = {
+        "company": company,
+        "assessment": assessment,
+        "sections": sections,
+    }
+    return render(request, "profiles/tabs/_assessment_fill.html", ctx)
+
+
+LEVEL_NAMES = ("básico", "en desarrollo", "consolidado", "avanzado")
+
+
+@login_required
+def assessment_fill_section(request, company_id, assessment_id, index):
+    """
+    Fragmento HTMX con las preguntas de UNA dimensión del formulario: el
+    catálogo en caché da las preguntas y de las respuestas sólo traemos tuplas.
+    """
+    allowed = get_allowed_company_ids(request.user)
+    if allowed and str(company_id) not in [str(x) for x in allowed]:
+        return render(request, "403.html", status=403)
+
+    assessment = get_object_or_404(Assessment, id=assessment_id, company_id=company_id)
+    sections = get_catalogue(assessment.instrument_code, assessment.instrument_version).sections
+    if index >= len(sections):
+        raise Http404("Dimensión inexistente")
+    section = sections[index]
+
+    responses = {
+        qid: (value, score, observations)
+        for qid, value, score, observations in Response.objects.filter(
+            assessment=assessment, question_id__in=section.question_ids
+        ).values_list("question_id", "answer_value", "score", "observations")
+    }
+    groups = []
+    for sub_dimension, questions in section.groups:
+        rows = []
+        for q in questions:
+            value, score, observations = responses.get(q.id, (None, None, ""))
+            rows.append({
+                "question": q,
+                "score": score,
+                "observations": observations,
+                "levels": [
+                    {"value": n, "name": name, "label": label, "checked": value == n}
+                    for n, (name, label) in enumerate(zip(LEVEL_NAMES, q.level_labels), start=1)
+                ],
+            })
+        groups.append((sub_dimension, rows))
+
+    return render(
+        request,
+        "profiles/tabs/_fill_section.html",
+        {"company_id": company_id, "assessment": assessment, "groups": groups},
+    )
+
+
+@login_required
+@require_POST
+def response_autosave(request, company_id, assessment_id, question_id):
+    """
+    Autosave de UNA pregunta (HTMX, con debounce en el cliente): un upsert
+    sobre (assessment, question) y un fragmento con el estado.
+    """
+    allowed = get_allowed_company_ids(request.user)
+    if allowed and str(company_id) not in [str(x) for x in allowed]:
+        return render(request, "403.html", status=403)
+
+    assessment = get_object_or_404(Assessment, id=assessment_id, company_id=company_id)
+    try:
+        saved = save_posted(assessment, request.POST, only=question_id)
+    except InvalidResponse as exc:
+        return render(
+            request, "profiles/tabs/_autosave_status.html", {"error": str(exc)}, status=400
+        )
+    return render(
+        request,
+        "profiles/tabs/_autosave_status.html",
+        {"saved": saved, "saved_at": timezone.localtime()},
+    )
+
 
-    for q in questions_qs:
-        dim = q.dimension or "Sin dimensión"
-        sub = q.sub_dimension or ""
-        grouped[dim][sub].append(q)
+COMPARE_LIMIT = 36
 
-    # 👇 convertir a dict “normal” para que el template sí pueda iterar
-    grouped_clean = {}
-    for dim, subs in grouped.items():
-        grouped_clean[dim] = dict(subs)
+
+@login_required
+def assessment_compare(request, company_id):
+    """
+    Tab de comparación: matriz pregunta × evaluación con deltas entre
+    evaluaciones consecutivas y tendencia de puntaje por dimensión.
+    """
+    allowed = get_allowed_company_ids(request.user)
+    if allowed and str(company_id) not in [str(x) for x in allowed]:
+        return render(request, "403.html", status=403)
+
+    company = get_object_or_404(Company, id=company_id)
+    history = Assessment.objects.filter(company=company)
+
+    instruments = list(
+        history.order_by("instrument_code").values_list("instrument_code", flat=True).distinct()
+    )
+    instrument = request.GET.get("instrument") or (
+        history.order_by("-assessment_date").values_list("instrument_code", flat=True).first()
+    )
+
+    # las COMPARE_LIMIT más recientes, en orden cronológico para las columnas
+    assessments = list(
+        history.filter(instrument_code=instrument)
+        .select_related("analyst")
+        .order_by("-assessment_date", "-created_at")[:COMPARE_LIMIT]
+    )[::-1]
 
     ctx = {
         "company": company,
-        "assessment": assessment,
-        "grouped_questions": grouped_clean,  # ← este es el que usamos en el template
-        "existing_responses": existing_responses,
+        "instruments": instruments,
+        "instrument": instrument,
+        "assessments": assessments,
+        **(build_comparison(assessments) if assessments else {"rows": [], "dimensions": []}),
     }
-    return render(request, "profiles/tabs/_assessment_fill.html", ctx)
\ No newline at end of file
+    return render(request, "profiles/tabs/_compare.html", ctx)
@@ -0,0 +1,47 @@
+# apps/reports/admin.py
+from django.contrib import admin
+from . import models
+
+
+@admin.register(models.EnergyMixSummary)
+class EnergyMixSummaryAdmin(admin.ModelAdmin):
+    list_display = ("company", "energy_source", "equipment_count", "quantity_total",
+                    "utilization_weighted", "refreshed_at")
+    list_filter = ("energy_source",)
+    raw_id_fields = ("company",)
+    readonly_fields = ("refreshed_at",)
+
+
+@admin.register(models.InvestmentRollup)
+class InvestmentRollupAdmin(admin.ModelAdmin):
+    list_display = ("company", "year", "category", "motive", "funding_source",
+                    "investment_count", "amount_total", "executed_total")
+    list_filter = ("year", "category", "motive", "funding_source")
+    raw_id_fields = ("company",)
+    readonly_fields = ("refreshed_at",)
+
+
+@admin.register(models.ProfileDimensionScore)
+class ProfileDimensionScoreAdmin(admin.ModelAdmin):
+    list_display = ("company", "instrument_code", "instrument_version", "dimension", "score",
+                    "municipality", "org_type", "refreshed_at")
+    list_filter = ("instrument_code", "instrument_version", "org_type")
+    raw_id_fields = ("company", "assessment")
+    readonly_fields = ("refreshed_at",)
+
+
+@admin.register(models.ProfileBenchmark)
+class ProfileBenchmarkAdmin(admin.ModelAdmin):
+    list_display = ("instrument_code", "instrument_version", "dimension", "peer_field", "peer_value",
+                    "companies", "p25", "p50", "p75")
+    list_filter = ("instrument_code", "instrument_version", "peer_field")
+    readonly_fields = ("refreshed_at",)
+
+
+@admin.register(models.InventorySnapshot)
+class InventorySnapshotAdmin(admin.ModelAdmin):
+    list_display = ("company", "period", "taken_at", "raw_size")
+    list_filter = ("period",)
+    raw_id_fields = ("company",)
+    exclude = ("payload",)
+    readonly_fields = ("company", "period", "taken_at", "counts", "raw_size")
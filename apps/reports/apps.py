@@ -0,0 +1,13 @@
+# apps/reports/apps.py
+from django.apps import AppConfig
+
+
+class ReportsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.reports"
+    label = "reports"
+    verbose_name = "Reports"
+
+    def ready(self):
+        # Conecta los receivers que mantienen las tablas resumen
+        from . import signals  # noqa: F401
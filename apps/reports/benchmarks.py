@@ -0,0 +1,340 @@
+# apps/reports/benchmarks.py
+"""
+Benchmarking de perfiles: percentil de cada empresa frente a sus pares.
+
+Dos tablas resumen:
+  - ProfileDimensionScore: puntaje ponderado por dimensión de la evaluación
+    más reciente de cada empresa (por instrumento y versión).
+  - ProfileBenchmark: distribución ordenada de esos puntajes por grupo de
+    pares (todo el portafolio, mismo municipio, mismo tipo de organización).
+
+Cuando cambian las respuestas de una empresa se recalculan sus puntajes y
+sólo los grupos en los que estaba o entra; la ficha de la empresa lee unas
+pocas filas y nunca recorre profiles_response.
+"""
+import operator
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from functools import reduce
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, Q, Sum
+
+from apps.profiles.catalogue import NO_DIMENSION, normalize_instrument_code
+from apps.profiles.models import Assessment, Response
+from .models import COMPANY_MODEL, ProfileBenchmark, ProfileDimensionScore
+
+PeerField = ProfileBenchmark.PeerField
+
+# (instrument_code, instrument_version, dimension, peer_field, peer_value)
+GroupKey = Tuple[str, str, str, str, str]
+
+_WEIGHTED = ExpressionWrapper(
+    F("score") * F("question__weight"), output_field=DecimalField(max_digits=14, decimal_places=4)
+)
+
+
+def _groups_of(row) -> List[GroupKey]:
+    base = (row.instrument_code, row.instrument_version, row.dimension)
+    return [
+        (*base, PeerField.ALL, ""),
+        (*base, PeerField.MUNICIPALITY, row.municipality),
+        (*base, PeerField.ORG_TYPE, row.org_type),
+    ]
+
+
+def _latest_assessments(company_ids: List[int]) -> Dict[int, Assessment]:
+    """Última evaluación de cada (empresa, instrumento, versión), por id."""
+    latest = {}
+    qs = (
+        Assessment.objects.filter(company_id__in=company_ids)
+        .order_by("company_id", "instrument_code", "instrument_version", "-assessment_date", "-created_at")
+        .only("id", "company_id", "instrument_code", "instrument_version")
+    )
+    for a in qs:
+        key = (a.company_id, normalize_instrument_code(a.instrument_code), a.instrument_version)
+        latest.setdefault(key, a)
+    return {a.id: a for a in latest.values()}
+
+
+def _dimension_scores(company_ids: List[int]) -> List[ProfileDimensionScore]:
+    Company = django_apps.get_model(COMPANY_MODEL)
+    peers = {
+        cid: (municipality or "", org_type or "")
+        for cid, municipality, org_type in Company.objects.filter(id__in=company_ids).values_list(
+            "id", "municipality", "org_type"
+        )
+    }
+    latest = _latest_assessments(company_ids)
+    rows = (
+        Response.objects.filter(assessment_id__in=list(latest))
+        .values("assessment_id", "question__dimension")
+        .annotate(num=Sum(_WEIGHTED), den=Sum("question__weight"))
+        .order_by()
+    )
+    objs = {}
+    for r in rows:
+        if not r["den"]:
+            continue
+        a = latest[r["assessment_id"]]
+        dimension = r["question__dimension"] or NO_DIMENSION
+        municipality, org_type = peers.get(a.company_id, ("", ""))
+        key = (a.company_id, normalize_instrument_code(a.instrument_code), a.instrument_version, dimension)
+        if key in objs:
+            # "" y NULL caen en la misma dimensión: se combinan
+            prev = objs[key]
+            prev._num += r["num"]
+            prev._den += r["den"]
+            continue
+        obj = ProfileDimensionScore(
+            company_id=a.company_id,
+            assessment_id=a.id,
+            instrument_code=key[1],
+            instrument_version=a.instrument_version,
+            dimension=dimension,
+            municipality=municipality,
+            org_type=org_type,
+        )
+        obj._num, obj._den = r["num"], r["den"]
+        objs[key] = obj
+    for obj in objs.values():
+        obj.score = (Decimal(obj._num) / Decimal(obj._den)).quantize(Decimal("0.01"))
+    return list(objs.values())
+
+
+def _quantile(scores: List[float], q: float) -> Optional[Decimal]:
+    """Cuantil con interpolación lineal sobre una lista ordenada."""
+    if not scores:
+        return None
+    pos = (len(scores) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(scores) - 1)
+    value = scores[lo] + (scores[hi] - scores[lo]) * (pos - lo)
+    return Decimal(str(value)).quantize(Decimal("0.01"))
+
+
+_BENCHMARK_KEY = ["instrument_code", "instrument_version", "dimension", "peer_field", "peer_value"]
+
+
+def _lock_groups(groups: Set[GroupKey]) -> None:
+    """
+    Un grupo lo comparten todas sus empresas: dos refresh simultáneos (p. ej.
+    dos empresas del mismo municipio) se serializan por grupo, así el segundo
+    lee los puntajes que el primero ya confirmó. Locks de transacción en
+    Postgres, siempre en el mismo orden para no bloquearse entre sí.
+    """
+    connection = transaction.get_connection()
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(h) FROM ("
+            " SELECT DISTINCT hashtextextended(k, 0) AS h FROM unnest(%s::text[]) AS k ORDER BY h"
+            ") AS locks",
+            ["|".join(key) for key in groups],
+        )
+
+
+def _refresh_groups(groups: Set[GroupKey]) -> int:
+    """
+    Recalcula los grupos indicados: una consulta por (instrumento, versión).
+    Debe correr dentro de una transacción (los locks de grupo duran hasta el commit).
+    """
+    _lock_groups(groups)
+    by_instrument = defaultdict(set)
+    for key in groups:
+        by_instrument[key[:2]].add(key[2])
+
+    buckets: Dict[GroupKey, List[float]] = {key: [] for key in groups}
+    for (code, version), dimensions in by_instrument.items():
+        rows = ProfileDimensionScore.objects.filter(
+            instrument_code=code, instrument_version=version, dimension__in=dimensions
+        ).values_list("dimension", "municipality", "org_type", "score")
+        for dimension, municipality, org_type, score in rows:
+            for key in (
+                (code, version, dimension, PeerField.ALL, ""),
+                (code, version, dimension, PeerField.MUNICIPALITY, municipality),
+                (code, version, dimension, PeerField.ORG_TYPE, org_type),
+            ):
+                if key in buckets:
+                    buckets[key].append(float(score))
+
+    objs = []
+    empty = set()
+    for (code, version, dimension, field, value), scores in buckets.items():
+        if not scores:
+            empty.add((code, version, dimension, field, value))
+            continue
+        scores.sort()
+        objs.append(ProfileBenchmark(
+            instrument_code=code,
+            instrument_version=version,
+            dimension=dimension,
+            peer_field=field,
+            peer_value=value,
+            companies=len(scores),
+            p25=_quantile(scores, 0.25),
+            p50=_quantile(scores, 0.50),
+            p75=_quantile(scores, 0.75),
+            scores=scores,
+        ))
+
+    # upsert: sólo se borran los grupos que quedaron vacíos
+    if empty:
+        values_by_field = defaultdict(set)
+        for code, version, dimension, field, value in empty:
+            values_by_field[(code, version, dimension, field)].add(value)
+        ProfileBenchmark.objects.filter(reduce(operator.or_, (
+            Q(instrument_code=code, instrument_version=version, dimension=dimension,
+              peer_field=field, peer_value__in=values)
+            for (code, version, dimension, field), values in values_by_field.items()
+        ))).delete()
+    ProfileBenchmark.objects.bulk_create(
+        objs,
+        update_conflicts=True,
+        unique_fields=_BENCHMARK_KEY,
+        update_fields=["companies", "p25", "p50", "p75", "scores", "refreshed_at"],
+    )
+    return len(objs)
+
+
+def refresh_company_benchmarks(company_id: int) -> int:
+    """
+    Recalcula los puntajes de UNA empresa y los grupos de pares afectados
+    (en los que estaba antes y en los que está ahora). Devuelve filas escritas.
+    """
+    current = ProfileDimensionScore.objects.filter(company_id=company_id)
+    groups = {key for row in current for key in _groups_of(row)}
+    objs = _dimension_scores([company_id])
+    groups.update(key for row in objs for key in _groups_of(row))
+
+    with transaction.atomic():
+        current.delete()
+        ProfileDimensionScore.objects.bulk_create(objs)
+        if groups:
+            _refresh_groups(groups)
+    return len(objs)
+
+
+def forget_companies(company_ids: Iterable[int]) -> None:
+    """Saca a empresas que se van a borrar de sus grupos de pares."""
+    current = ProfileDimensionScore.objects.filter(company_id__in=list(company_ids))
+    groups = {key for row in current.iterator() for key in _groups_of(row)}
+    with transaction.atomic():
+        current.delete()
+        if groups:
+            _refresh_groups(groups)
+
+
+def rebuild_benchmarks(company_ids: Optional[Iterable[int]] = None, batch_size: int = 1000) -> int:
+    """
+    Reconstruye los puntajes (de todo el portafolio o de un subconjunto) y
+    todos los grupos de pares que tocan. Devuelve filas de puntaje escritas.
+    """
+    if company_ids is None:
+        Company = django_apps.get_model(COMPANY_MODEL)
+        company_ids = Company.objects.values_list("id", flat=True)
+    company_ids = list(company_ids)
+
+    current = ProfileDimensionScore.objects.filter(company_id__in=company_ids)
+    groups = {key for row in current.iterator() for key in _groups_of(row)}
+    objs = _dimension_scores(company_ids)
+    groups.update(key for row in objs for key in _groups_of(row))
+
+    with transaction.atomic():
+        current.delete()
+        ProfileDimensionScore.objects.bulk_create(objs, batch_size=batch_size)
+        if groups:
+            _refresh_groups(groups)
+    return len(objs)
+
+
+def rebuild_dimension_scores(
+    company_ids: Iterable[int], batch_size: int = 1000
+) -> Tuple[int, Set[GroupKey]]:
+    """
+    Sólo los puntajes de las empresas dadas, sin tocar ProfileBenchmark.
+    Devuelve las filas escritas y los grupos de pares afectados, para que
+    quien reconstruye por lotes (recompute_portfolio) los recalcule una
+    sola vez al final con refresh_peer_groups().
+    """
+    company_ids = list(company_ids)
+    current = ProfileDimensionScore.objects.filter(company_id__in=company_ids)
+    groups = {key for row in current.iterator() for key in _groups_of(row)}
+    objs = _dimension_scores(company_ids)
+    groups.update(key for row in objs for key in _groups_of(row))
+
+    with transaction.atomic():
+        current.delete()
+        ProfileDimensionScore.objects.bulk_create(objs, batch_size=batch_size)
+    return len(objs), groups
+
+
+def refresh_peer_groups(groups: Iterable[GroupKey]) -> int:
+    groups = set(groups)
+    if not groups:
+        return 0
+    with transaction.atomic():
+        return _refresh_groups(groups)
+
+
+def percentile_rank(scores: List[float], value: float) -> Optional[int]:
+    """% de pares por debajo (los empates cuentan la mitad)."""
+    if not scores:
+        return None
+    below = bisect_left(scores, value)
+    equal = bisect_right(scores, value) - below
+    return round((below + equal / 2) * 100 / len(scores))
+
+
+def company_benchmarks(company_id: int) -> List[dict]:
+    """
+    Por cada (instrumento, versión, dimensión) evaluada de la empresa:
+    su puntaje y, por grupo de pares, tamaño del grupo, mediana y percentil.
+    """
+    scores = list(
+        ProfileDimensionScore.objects.filter(company_id=company_id)
+        .order_by("instrument_code", "instrument_version", "dimension")
+    )
+    if not scores:
+        return []
+
+    wanted = {key for row in scores for key in _groups_of(row)}
+    benchmarks = {
+        (b.instrument_code, b.instrument_version, b.dimension, b.peer_field, b.peer_value): b
+        for b in ProfileBenchmark.objects.filter(
+            instrument_code__in={k[0] for k in wanted},
+            dimension__in={k[2] for k in wanted},
+            peer_value__in={k[4] for k in wanted},
+        )
+    }
+
+    labels = dict(PeerField.choices)
+    Company = django_apps.get_model(COMPANY_MODEL)
+    org_types = dict(Company._meta.get_field("org_type").choices or [])
+    result = []
+    for row in scores:
+        peers = []
+        for key in _groups_of(row):
+            b = benchmarks.get(key)
+            if b is None:
+                continue
+            peers.append({
+                "field": key[3],
+                "label": labels[key[3]],
+                "value": org_types.get(key[4], key[4]) if key[3] == PeerField.ORG_TYPE else key[4],
+                "companies": b.companies,
+                "p50": b.p50,
+                "percentile": percentile_rank(b.scores, float(row.score)),
+            })
+        result.append({
+            "instrument_code": row.instrument_code,
+            "instrument_version": row.instrument_version,
+            "dimension": row.dimension,
+            "score": row.score,
+            "peers": peers,
+        })
+    return result
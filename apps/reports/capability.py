@@ -0,0 +1,168 @@
+# apps/reports/capability.py
+"""
+Matriz de capacidades: brechas de saberes/disciplinas y perfil del talento.
+
+Por empresa:
+  - gap_pct: Σ importance × (4 − adoption) / Σ importance × 4  (0 = sin brecha)
+  - education_index: nivel educativo promedio ponderado por personas (1-8)
+  - experience_index: años de experiencia promedio ponderados por personas
+
+Todo se calcula por columnas en la base (un GROUP BY por tabla para todo el
+portafolio), nunca objeto por objeto. Los resultados se cachean por empresa
+y se invalidan desde signals al cambiar WorkforceProfile/DisciplineAssessment.
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from django.core.cache import cache
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+
+from apps.inventory.models import DisciplineAssessment, WorkforceProfile
+
+MAX_ADOPTION = 4
+CACHE_TTL = 60 * 60 * 24
+
+# Orden del campo WorkforceProfile.education_level -> índice 1..8
+EDUCATION_RANK = {
+    code: rank
+    for rank, (code, _label) in enumerate(
+        WorkforceProfile._meta.get_field("education_level").choices, start=1
+    )
+}
+EDUCATION_MAX = len(EDUCATION_RANK)
+
+_EDUCATION = Case(
+    *[When(education_level=code, then=Value(rank)) for code, rank in EDUCATION_RANK.items()],
+    default=Value(0),
+    output_field=IntegerField(),
+)
+
+# Métricas por las que se puede ordenar el ranking (siempre de mayor a menor)
+RANK_METRICS = {
+    "gap_pct": "Brecha de saberes",
+    "education_index": "Índice educativo",
+    "experience_index": "Experiencia",
+    "people": "Personas",
+}
+
+
+def _cache_key(company_id: int) -> str:
+    return f"reports:capability:{company_id}"
+
+
+def invalidate_company_capability(company_id: int) -> None:
+    cache.delete(_cache_key(company_id))
+
+
+def invalidate_company_capabilities(company_ids: Iterable[int]) -> int:
+    """Borra las métricas en caché de varias empresas; se recalculan al leerlas."""
+    keys = [_cache_key(cid) for cid in company_ids]
+    cache.delete_many(keys)
+    return len(keys)
+
+
+def _ratio(num, den, places="0.01") -> Optional[Decimal]:
+    if not den:
+        return None
+    return (Decimal(num) / Decimal(den)).quantize(Decimal(places))
+
+
+def _compute(company_ids: List[int]) -> Dict[int, dict]:
+    """Calcula las métricas para varias empresas con 2 consultas agregadas."""
+    result = {
+        cid: {
+            "company_id": cid,
+            "disciplines": 0,
+            "gap_pct": None,
+            "people": 0,
+            "education_index": None,
+            "experience_index": None,
+        }
+        for cid in company_ids
+    }
+
+    disciplines = (
+        DisciplineAssessment.objects.filter(company_id__in=company_ids)
+        .values("company_id")
+        .annotate(
+            items=Count("id"),
+            gap=Sum(F("importance_score") * (MAX_ADOPTION - F("adoption_level"))),
+            weight=Sum(F("importance_score") * MAX_ADOPTION),
+        )
+        .order_by()
+    )
+    for row in disciplines:
+        r = result[row["company_id"]]
+        r["disciplines"] = row["items"]
+        r["gap_pct"] = _ratio((row["gap"] or 0) * 100, row["weight"], "0.1")
+
+    workforce = (
+        WorkforceProfile.objects.filter(company_id__in=company_ids)
+        .values("company_id")
+        .annotate(
+            people=Sum("people_count"),
+            education_people=Sum("people_count", filter=~Q(education_level="")),
+            education_sum=Sum(F("people_count") * _EDUCATION),
+            experience_people=Sum("people_count", filter=Q(avg_experience_years__isnull=False)),
+            experience_sum=Sum(F("people_count") * F("avg_experience_years")),
+        )
+        .order_by()
+    )
+    for row in workforce:
+        r = result[row["company_id"]]
+        r["people"] = row["people"] or 0
+        r["education_index"] = _ratio(row["education_sum"] or 0, row["education_people"])
+        r["experience_index"] = _ratio(row["experience_sum"] or 0, row["experience_people"], "0.1")
+
+    return result
+
+
+def company_capabilities(company_ids: Iterable[int]) -> Dict[int, dict]:
+    """
+    Métricas por empresa, primero desde caché; las faltantes se calculan
+    juntas en un solo lote y se guardan de nuevo por empresa.
+    """
+    company_ids = list(company_ids)
+    keys = {_cache_key(cid): cid for cid in company_ids}
+    cached = cache.get_many(list(keys))
+    found = {keys[k]: v for k, v in cached.items()}
+
+    missing = [cid for cid in company_ids if cid not in found]
+    if missing:
+        computed = _compute(missing)
+        cache.set_many({_cache_key(cid): data for cid, data in computed.items()}, CACHE_TTL)
+        found.update(computed)
+    return found
+
+
+def company_capability(company_id: int) -> dict:
+    return company_capabilities([company_id])[company_id]
+
+
+def top_gaps(company_id: int, limit: int = 5):
+    """Saberes con mayor brecha ponderada (importancia × niveles faltantes)."""
+    return (
+        DisciplineAssessment.objects.filter(company_id=company_id)
+        .annotate(gap=F("importance_score") * (MAX_ADOPTION - F("adoption_level")))
+        .filter(gap__gt=0)
+        .order_by("-gap", "item")
+        .values("item", "importance_score", "adoption_level", "gap")[:limit]
+    )
+
+
+def rank_companies(rows: Dict[int, dict], metric: str = "gap_pct") -> List[dict]:
+    """
+    Ordena las empresas por `metric` de mayor a menor y asigna `rank`
+    (1 = primero; en gap_pct, la empresa con más brecha). Las empresas sin
+    dato para la métrica quedan al final, sin rank.
+    """
+    if metric not in RANK_METRICS:
+        raise ValueError(f"Métrica no soportada: {metric}")
+    with_value = [r for r in rows.values() if r[metric] is not None]
+    without = [r for r in rows.values() if r[metric] is None]
+    with_value.sort(key=lambda r: r[metric], reverse=True)
+    for i, r in enumerate(with_value, start=1):
+        r["rank"] = i
+    for r in without:
+        r["rank"] = None
+    return with_value + without
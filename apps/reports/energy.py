@@ -0,0 +1,136 @@
+# apps/reports/energy.py
+"""
+Mezcla energética por empresa y del portafolio.
+
+La tabla `EnergyMixSummary` guarda, por (empresa, fuente), el número de
+equipos, la cantidad total y la cantidad ponderada por % de utilización.
+Las participaciones (%) se derivan al leer, sobre pocas filas.
+"""
+from decimal import Decimal
+from typing import Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.inventory.models import EquipmentEnergy
+from .models import EnergyMixSummary
+
+HUNDRED = Decimal("100")
+ZERO = Decimal("0")
+
+# Σ quantity × utilization_pct; se divide entre 100 en Python (evita división entera)
+_UTILIZATION = ExpressionWrapper(
+    F("equipment__quantity") * Coalesce(F("equipment__utilization_pct"), Value(ZERO)),
+    output_field=DecimalField(max_digits=16, decimal_places=2),
+)
+
+
+def _aggregate(qs, *group_by: str):
+    return qs.values(*group_by).annotate(
+        equipment_count=Count("id"),
+        quantity_total=Coalesce(Sum("equipment__quantity"), 0),
+        utilization_pct_sum=Coalesce(
+            Sum(_UTILIZATION), Value(ZERO), output_field=DecimalField(max_digits=16, decimal_places=2)
+        ),
+    )
+
+
+def _summary(company_id: int, row: dict) -> EnergyMixSummary:
+    return EnergyMixSummary(
+        company_id=company_id,
+        energy_source_id=row["energy_source_id"],
+        equipment_count=row["equipment_count"],
+        quantity_total=row["quantity_total"],
+        utilization_weighted=(Decimal(row["utilization_pct_sum"]) / HUNDRED).quantize(Decimal("0.01")),
+    )
+
+
+def refresh_company_energy_mix(company_id: int) -> int:
+    """
+    Recalcula las filas resumen de UNA empresa (un GROUP BY sobre sus enlaces).
+    Devuelve el número de filas escritas.
+    """
+    rows = _aggregate(
+        EquipmentEnergy.objects.filter(company_id=company_id, equipment__deleted_at__isnull=True),
+        "energy_source_id",
+    )
+    objs = [_summary(company_id, r) for r in rows]
+    with transaction.atomic():
+        EnergyMixSummary.objects.filter(company_id=company_id).delete()
+        EnergyMixSummary.objects.bulk_create(objs)
+    return len(objs)
+
+
+def rebuild_energy_mix(company_ids: Optional[Iterable[int]] = None, batch_size: int = 1000) -> int:
+    """
+    Reconstruye la tabla completa (o un subconjunto de empresas) con una sola
+    consulta agregada. Pensado para backfill y para cambios de definición.
+    """
+    # el enlace no tiene borrado lógico propio: vive mientras viva el equipo
+    links = EquipmentEnergy.objects.filter(equipment__deleted_at__isnull=True)
+    summaries = EnergyMixSummary.objects.all()
+    if company_ids is not None:
+        company_ids = list(company_ids)
+        links = links.filter(company_id__in=company_ids)
+        summaries = summaries.filter(company_id__in=company_ids)
+
+    objs = [
+        _summary(r["company_id"], r)
+        for r in _aggregate(links, "company_id", "energy_source_id")
+    ]
+    with transaction.atomic():
+        summaries.delete()
+        EnergyMixSummary.objects.bulk_create(objs, batch_size=batch_size)
+    return len(objs)
+
+
+def _with_shares(rows: List[dict]) -> List[dict]:
+    """Agrega participación por cantidad y por utilización (0-100)."""
+    total_qty = sum((r["quantity_total"] or 0) for r in rows)
+    total_util = sum((Decimal(r["utilization_weighted"] or 0) for r in rows), ZERO)
+    for r in rows:
+        r["quantity_share"] = (
+            (Decimal(r["quantity_total"]) * HUNDRED / total_qty).quantize(Decimal("0.1")) if total_qty else ZERO
+        )
+        r["utilization_share"] = (
+            (Decimal(r["utilization_weighted"]) * HUNDRED / total_util).quantize(Decimal("0.1")) if total_util else ZERO
+        )
+    return rows
+
+
+def company_energy_mix(company_id: int) -> List[dict]:
+    """Mezcla energética de una empresa, leída de la tabla resumen."""
+    rows = list(
+        EnergyMixSummary.objects.filter(company_id=company_id)
+        .order_by("-quantity_total", "energy_source__code")
+        .values(
+            "energy_source__code",
+            "energy_source__name",
+            "equipment_count",
+            "quantity_total",
+            "utilization_weighted",
+        )
+    )
+    return _with_shares(rows)
+
+
+def portfolio_energy_mix(company_ids: Optional[Iterable[int]] = None) -> List[dict]:
+    """
+    Mezcla energética agregada del portafolio (todas las empresas o las
+    indicadas). Agrupa las filas resumen, nunca el M2M.
+    """
+    qs = EnergyMixSummary.objects.all()
+    if company_ids is not None:
+        qs = qs.filter(company_id__in=list(company_ids))
+    rows = list(
+        qs.values("energy_source__code", "energy_source__name")
+        .annotate(
+            companies=Count("company_id"),
+            equipment_count=Sum("equipment_count"),
+            quantity_total=Sum("quantity_total"),
+            utilization_weighted=Sum("utilization_weighted"),
+        )
+        .order_by("-quantity_total", "energy_source__code")
+    )
+    return _with_shares(rows)
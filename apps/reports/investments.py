@@ -0,0 +1,127 @@
+# apps/reports/investments.py
+"""
+Rollup de inversiones por año / categoría / motivo / fuente.
+
+`InvestmentRollup` se recalcula por empresa cuando cambia alguna de sus
+inversiones; los reportes de portafolio sólo agrupan esa tabla compacta.
+"""
+from decimal import Decimal
+from typing import Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.inventory.models import (
+    FundingSource,
+    Investment,
+    InvestmentCategory,
+    InvestmentMotive,
+    InvestmentStatus,
+)
+from .models import InvestmentRollup
+
+ZERO = Decimal("0")
+_MONEY = DecimalField(max_digits=18, decimal_places=2)
+
+# Dimensiones por las que se puede agrupar el reporte -> etiquetas de choices
+DIMENSIONS = {
+    "year": None,
+    "category": dict(InvestmentCategory.choices),
+    "motive": dict(InvestmentMotive.choices),
+    "funding_source": dict(FundingSource.choices),
+}
+
+
+def _aggregate(qs, *group_by: str):
+    # investment_year ya es el año efectivo (ver Investment.save)
+    return qs.values(*group_by, "investment_year", "category", "motive", "funding_source").annotate(
+        investment_count=Count("id"),
+        amount_total=Coalesce(Sum("amount_cop"), Value(ZERO), output_field=_MONEY),
+        executed_total=Coalesce(
+            Sum("amount_cop", filter=Q(status=InvestmentStatus.EXECUTED)), Value(ZERO), output_field=_MONEY
+        ),
+    ).order_by()
+
+
+def _rollup(company_id: int, row: dict) -> InvestmentRollup:
+    return InvestmentRollup(
+        company_id=company_id,
+        year=row["investment_year"],
+        category=row["category"],
+        motive=row["motive"],
+        funding_source=row["funding_source"],
+        investment_count=row["investment_count"],
+        amount_total=row["amount_total"],
+        executed_total=row["executed_total"],
+    )
+
+
+def refresh_company_investments(company_id: int) -> int:
+    """Recalcula el rollup de UNA empresa. Devuelve filas escritas."""
+    objs = [
+        _rollup(company_id, r)
+        for r in _aggregate(Investment.objects.filter(company_id=company_id))
+    ]
+    with transaction.atomic():
+        InvestmentRollup.objects.filter(company_id=company_id).delete()
+        InvestmentRollup.objects.bulk_create(objs)
+    return len(objs)
+
+
+def rebuild_investment_rollup(company_ids: Optional[Iterable[int]] = None, batch_size: int = 1000) -> int:
+    """Reconstruye el rollup completo (o de un subconjunto) con una sola consulta agregada."""
+    investments = Investment.objects.all()
+    rollups = InvestmentRollup.objects.all()
+    if company_ids is not None:
+        company_ids = list(company_ids)
+        investments = investments.filter(company_id__in=company_ids)
+        rollups = rollups.filter(company_id__in=company_ids)
+
+    objs = [_rollup(r["company_id"], r) for r in _aggregate(investments, "company_id")]
+    with transaction.atomic():
+        rollups.delete()
+        InvestmentRollup.objects.bulk_create(objs, batch_size=batch_size)
+    return len(objs)
+
+
+def investment_totals(
+    by: str,
+    company_ids: Optional[Iterable[int]] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+) -> List[dict]:
+    """
+    Totales del portafolio agrupados por `by` (year, category, motive o
+    funding_source). Cada fila trae `key`, `label`, `companies`,
+    `investment_count`, `amount_total` y `executed_total`.
+    """
+    if by not in DIMENSIONS:
+        raise ValueError(f"Dimensión no soportada: {by}")
+
+    qs = InvestmentRollup.objects.all()
+    if company_ids is not None:
+        qs = qs.filter(company_id__in=list(company_ids))
+    if year_from is not None:
+        qs = qs.filter(year__gte=year_from)
+    if year_to is not None:
+        qs = qs.filter(year__lte=year_to)
+
+    rows = list(
+        qs.values(by)
+        .annotate(
+            companies=Count("company_id", distinct=True),
+            investment_count=Sum("investment_count"),
+            amount_total=Sum("amount_total"),
+            executed_total=Sum("executed_total"),
+        )
+        .order_by(F("year").desc(nulls_last=True) if by == "year" else F("amount_total").desc())
+    )
+    labels = DIMENSIONS[by]
+    for r in rows:
+        r["key"] = r.pop(by)
+        if by == "year":
+            r["label"] = r["key"] or "Sin año"
+        else:
+            r["label"] = labels.get(r["key"], r["key"])
+    return rows
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.reports.benchmarks import rebuild_benchmarks
+
+
+class Command(BaseCommand):
+    help = "Rebuild profile dimension scores and peer benchmarks (all companies or the given ids)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("company_ids", nargs="*", type=int, help="Company ids (default: all).")
+
+    def handle(self, *args, **options):
+        ids = options["company_ids"] or None
+        written = rebuild_benchmarks(ids)
+        self.stdout.write(self.style.SUCCESS(f"Profile benchmarks rebuilt: {written} dimension scores."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.reports.energy import rebuild_energy_mix
+
+
+class Command(BaseCommand):
+    help = "Rebuild the energy mix summary table (all companies or the given ids)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("company_ids", nargs="*", type=int, help="Company ids (default: all).")
+
+    def handle(self, *args, **options):
+        ids = options["company_ids"] or None
+        written = rebuild_energy_mix(ids)
+        self.stdout.write(self.style.SUCCESS(f"Energy mix rebuilt: {written} rows."))
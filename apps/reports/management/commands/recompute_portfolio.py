@@ -0,0 +1,112 @@
+import json
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.apps import apps as django_apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.reports.benchmarks import refresh_peer_groups
+from apps.reports.models import COMPANY_MODEL
+from apps.reports.recompute import STAGES, recompute_chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild every company's derived data (energy mix, investment rollup, dimension scores and "
+        "benchmarks) and invalidate its cached capability metrics, in chunks on a process pool. "
+        "Completed chunks are written to a checkpoint file, so an interrupted run resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("company_ids", nargs="*", type=int, help="Company ids (default: all).")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--chunk-size", type=int, default=200)
+        parser.add_argument(
+            "--stages", default=",".join(STAGES), help=f"Comma-separated subset of: {', '.join(STAGES)}."
+        )
+        parser.add_argument("--checkpoint", default="recompute_portfolio.checkpoint.json")
+        parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint.")
+
+    def _load_checkpoint(self, path, stages, restart):
+        if restart or not os.path.exists(path):
+            return {"stages": stages, "done": [], "groups": [], "counts": {}}
+        with open(path) as fh:
+            state = json.load(fh)
+        if state["stages"] != stages:
+            raise CommandError(
+                f"{path} is from a run with stages {','.join(state['stages'])}; use --restart to discard it."
+            )
+        self.stdout.write(f"Resuming: {len(state['done'])} companies already done.")
+        return state
+
+    def _save_checkpoint(self, path, state):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as fh:
+            json.dump(state, fh)
+        os.replace(tmp, path)
+
+    def handle(self, *args, **opts):
+        stages = [s.strip() for s in opts["stages"].split(",") if s.strip()]
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            raise CommandError(f"Unknown stages: {', '.join(sorted(unknown))}")
+        path = opts["checkpoint"]
+        state = self._load_checkpoint(path, stages, opts["restart"])
+
+        Company = django_apps.get_model(COMPANY_MODEL)
+        ids = opts["company_ids"] or list(Company.objects.order_by("pk").values_list("pk", flat=True))
+        done = set(state["done"])
+        pending = [cid for cid in ids if cid not in done]
+        size = max(1, opts["chunk_size"])
+        chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+        groups = {tuple(g) for g in state["groups"]}
+        totals = Counter(state["counts"])
+
+        # Sin conexiones abiertas al hacer fork: cada worker abre la suya.
+        connections.close_all()
+        started = time.monotonic()
+        failed = []
+        pool = ProcessPoolExecutor(
+            max_workers=max(1, opts["workers"]), mp_context=multiprocessing.get_context("fork")
+        )
+        try:
+            futures = {pool.submit(recompute_chunk, chunk, stages): chunk for chunk in chunks}
+            for n, future in enumerate(as_completed(futures), start=1):
+                chunk = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    failed.append(chunk)
+                    self.stderr.write(f"Chunk {chunk[0]}..{chunk[-1]} failed: {exc!r}")
+                    continue
+                done.update(result["company_ids"])
+                groups.update(tuple(g) for g in result["groups"])
+                totals.update(result["counts"])
+                state.update(done=sorted(done), groups=sorted(groups), counts=dict(totals))
+                self._save_checkpoint(path, state)
+
+                elapsed = time.monotonic() - started
+                eta = elapsed / n * (len(chunks) - n)
+                self.stdout.write(
+                    f"[{n}/{len(chunks)}] companies {chunk[0]}..{chunk[-1]} "
+                    f"({len(done)}/{len(ids)}) {elapsed:.0f}s elapsed, ~{eta:.0f}s left"
+                )
+        except KeyboardInterrupt:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise CommandError(f"Interrupted; run again to resume from {path}.")
+        pool.shutdown()
+
+        if failed:
+            raise CommandError(
+                f"{len(failed)} chunk(s) failed; fix the cause and run again to resume from {path}."
+            )
+        if "scores" in stages:
+            totals["benchmarks"] = refresh_peer_groups(groups)
+        if os.path.exists(path):
+            os.remove(path)
+        summary = ", ".join(f"{k}={v}" for k, v in totals.items())
+        self.stdout.write(self.style.SUCCESS(f"Portfolio recomputed for {len(ids)} companies: {summary}."))
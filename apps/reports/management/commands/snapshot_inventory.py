@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.reports.snapshots import take_snapshots
+
+
+class Command(BaseCommand):
+    help = "Freeze each company's live inventory into a compressed snapshot for a period (e.g. 2025)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("period", help="Period label, e.g. 2025 or 2025-06.")
+        parser.add_argument("company_ids", nargs="*", type=int, help="Company ids (default: all).")
+
+    def handle(self, *args, **options):
+        written = take_snapshots(options["period"], options["company_ids"] or None)
+        self.stdout.write(self.style.SUCCESS(f"Inventory snapshots written for {options['period']}: {written}."))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:29
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('inventory', '0002_alter_equipment_purchase_origin'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnergyMixSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('equipment_count', models.PositiveIntegerField(default=0)),
+                ('quantity_total', models.PositiveIntegerField(default=0)),
+                ('utilization_weighted', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='energy_mix_rows', to='core.company')),
+                ('energy_source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mix_rows', to='inventory.energysource')),
+            ],
+            options={
+                'verbose_name': 'Energy mix summary',
+                'verbose_name_plural': 'Energy mix summaries',
+                'db_table': 'reports_energy_mix',
+                'constraints': [models.UniqueConstraint(fields=('company', 'energy_source'), name='uq_energy_mix_company_source')],
+            },
+        ),
+    ]
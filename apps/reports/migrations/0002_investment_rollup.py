@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:31
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvestmentRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('category', models.CharField(choices=[('EQUIPMENT', 'Equipment / Machinery'), ('TECH_DEVELOPMENT', 'Technological development')], max_length=30)),
+                ('motive', models.CharField(choices=[('REPLACEMENT', 'Replacement'), ('CAPACITY_EXPANSION', 'Capacity expansion'), ('MODERNIZATION_AUTOMATION', 'Modernization / Automation'), ('QUALITY_COMPLIANCE', 'Quality / Compliance'), ('NEW_PRODUCT', 'New product'), ('ENERGY_EFFICIENCY', 'Energy efficiency'), ('DIGITALIZATION', 'Digitalization'), ('R_AND_D', 'R&D / Tech development'), ('CERTIFICATION', 'Certification'), ('OTHER', 'Other')], max_length=40)),
+                ('funding_source', models.CharField(choices=[('OWN_FUNDS', 'Own funds'), ('BANK_CREDIT', 'Bank credit'), ('SUPPLIER_CREDIT', 'Supplier credit'), ('LEASING', 'Leasing'), ('PUBLIC_GRANT', 'Public grant'), ('COFINANCING', 'Cofinancing'), ('VENTURE', 'Venture / Equity'), ('OTHER', 'Other')], max_length=80)),
+                ('investment_count', models.PositiveIntegerField(default=0)),
+                ('amount_total', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=18)),
+                ('executed_total', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=18)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='investment_rollups', to='core.company')),
+            ],
+            options={
+                'verbose_name': 'Investment rollup',
+                'verbose_name_plural': 'Investment rollups',
+                'db_table': 'reports_investment_rollup',
+                'indexes': [models.Index(fields=['year', 'funding_source'], name='reports_inv_year_efa0f9_idx'), models.Index(fields=['year', 'motive'], name='reports_inv_year_a6f496_idx'), models.Index(fields=['year', 'category'], name='reports_inv_year_c67ff7_idx')],
+                'constraints': [models.UniqueConstraint(fields=('company', 'year', 'category', 'motive', 'funding_source'), name='uq_investment_rollup_key')],
+            },
+        ),
+    ]
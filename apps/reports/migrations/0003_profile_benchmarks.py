@@ -0,0 +1,61 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('profiles', '0002_alter_question_sub_dimension'),
+        ('reports', '0002_investment_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileBenchmark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('instrument_code', models.CharField(max_length=50)),
+                ('instrument_version', models.CharField(max_length=20)),
+                ('dimension', models.CharField(max_length=100)),
+                ('peer_field', models.CharField(choices=[('all', 'Todo el portafolio'), ('municipality', 'Municipio'), ('org_type', 'Tipo de organización')], max_length=20)),
+                ('peer_value', models.CharField(blank=True, max_length=128)),
+                ('companies', models.PositiveIntegerField(default=0)),
+                ('p25', models.DecimalField(decimal_places=2, max_digits=6, null=True)),
+                ('p50', models.DecimalField(decimal_places=2, max_digits=6, null=True)),
+                ('p75', models.DecimalField(decimal_places=2, max_digits=6, null=True)),
+                ('scores', models.JSONField(default=list)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Profile benchmark',
+                'verbose_name_plural': 'Profile benchmarks',
+                'db_table': 'reports_profile_benchmark',
+                'constraints': [models.UniqueConstraint(fields=('instrument_code', 'instrument_version', 'dimension', 'peer_field', 'peer_value'), name='uq_profile_benchmark_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProfileDimensionScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('instrument_code', models.CharField(max_length=50)),
+                ('instrument_version', models.CharField(max_length=20)),
+                ('dimension', models.CharField(max_length=100)),
+                ('score', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('municipality', models.CharField(blank=True, max_length=128)),
+                ('org_type', models.CharField(blank=True, max_length=32)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('assessment', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='dimension_scores', to='profiles.assessment')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dimension_scores', to='core.company')),
+            ],
+            options={
+                'verbose_name': 'Profile dimension score',
+                'verbose_name_plural': 'Profile dimension scores',
+                'db_table': 'reports_dimension_score',
+                'indexes': [models.Index(fields=['instrument_code', 'instrument_version', 'dimension', 'municipality'], name='reports_dim_instrum_570cd1_idx'), models.Index(fields=['instrument_code', 'instrument_version', 'dimension', 'org_type'], name='reports_dim_instrum_713296_idx')],
+                'constraints': [models.UniqueConstraint(fields=('company', 'instrument_code', 'instrument_version', 'dimension'), name='uq_dimension_score_key')],
+            },
+        ),
+    ]
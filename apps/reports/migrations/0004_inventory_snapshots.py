@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('reports', '0003_profile_benchmarks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventorySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=16)),
+                ('taken_at', models.DateTimeField()),
+                ('counts', models.JSONField(default=dict)),
+                ('payload', models.BinaryField()),
+                ('raw_size', models.PositiveIntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inventory_snapshots', to='core.company')),
+            ],
+            options={
+                'verbose_name': 'Inventory snapshot',
+                'verbose_name_plural': 'Inventory snapshots',
+                'db_table': 'reports_inventory_snapshot',
+                'ordering': ('company', '-period'),
+                'constraints': [models.UniqueConstraint(fields=('company', 'period'), name='uq_inventory_snapshot_period')],
+            },
+        ),
+    ]
@@ -0,0 +1,192 @@
+# apps/reports/models.py
+from decimal import Decimal
+from django.conf import settings
+from django.db import models
+
+from apps.inventory.models import FundingSource, InvestmentCategory, InvestmentMotive
+
+COMPANY_MODEL = getattr(settings, "COMPANY_MODEL", "core.Company")
+
+
+class EnergyMixSummary(models.Model):
+    """
+    Mezcla energética pre-agregada por (empresa, fuente de energía).
+
+    Se mantiene desde signals de Equipment / EquipmentEnergy; los dashboards
+    leen estas filas en lugar de recorrer el M2M en cada request.
+    Guardamos sumas (aditivas) y calculamos participaciones al leer.
+    """
+    company = models.ForeignKey(COMPANY_MODEL, on_delete=models.CASCADE, related_name="energy_mix_rows")
+    energy_source = models.ForeignKey(
+        "inventory.EnergySource", on_delete=models.CASCADE, related_name="mix_rows"
+    )
+    # Nº de equipos (filas) que usan la fuente
+    equipment_count = models.PositiveIntegerField(default=0)
+    # Σ Equipment.quantity
+    quantity_total = models.PositiveIntegerField(default=0)
+    # Σ quantity × utilization_pct / 100 (unidades equivalentes en uso)
+    utilization_weighted = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "reports_energy_mix"
+        verbose_name = "Energy mix summary"
+        verbose_name_plural = "Energy mix summaries"
+        constraints = [
+            models.UniqueConstraint(fields=["company", "energy_source"], name="uq_energy_mix_company_source")
+        ]
+
+    def __str__(self):
+        return f"{self.company_id} - {self.energy_source_id} ({self.quantity_total})"
+
+
+class InvestmentRollup(models.Model):
+    """
+    Totales de inversión pre-agregados por
+    (empresa, año, categoría, motivo, fuente de financiación).
+
+    `year` es el año efectivo (Investment.investment_year, que se sincroniza
+    con investment_date); NULL = inversión sin año conocido.
+    """
+    company = models.ForeignKey(COMPANY_MODEL, on_delete=models.CASCADE, related_name="investment_rollups")
+    year = models.PositiveSmallIntegerField(null=True, blank=True)
+    category = models.CharField(max_length=30, choices=InvestmentCategory.choices)
+    motive = models.CharField(max_length=40, choices=InvestmentMotive.choices)
+    funding_source = models.CharField(max_length=80, choices=FundingSource.choices)
+
+    investment_count = models.PositiveIntegerField(default=0)
+    amount_total = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal("0"))
+    # Monto con status EXECUTED (el resto es planeado / en curso)
+    executed_total = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal("0"))
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "reports_investment_rollup"
+        verbose_name = "Investment rollup"
+        verbose_name_plural = "Investment rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["company", "year", "category", "motive", "funding_source"],
+                name="uq_investment_rollup_key",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["year", "funding_source"]),
+            models.Index(fields=["year", "motive"]),
+            models.Index(fields=["year", "category"]),
+        ]
+
+    def __str__(self):
+        return f"{self.company_id} {self.year or '-'} {self.category}/{self.funding_source}"
+
+
+class ProfileDimensionScore(models.Model):
+    """
+    Puntaje por dimensión de la evaluación más reciente de cada empresa,
+    por (instrumento, versión). Promedio ponderado por Question.weight.
+
+    Guarda municipio y tipo de organización de la empresa para armar los
+    grupos de pares sin volver a unir con core_company.
+    """
+    company = models.ForeignKey(COMPANY_MODEL, on_delete=models.CASCADE, related_name="dimension_scores")
+    # SET_NULL: al borrar la evaluación la fila sigue hasta el refresh, así
+    # se sabe qué grupos de pares hay que recalcular
+    assessment = models.ForeignKey(
+        "profiles.Assessment", on_delete=models.SET_NULL, null=True, related_name="dimension_scores"
+    )
+    instrument_code = models.CharField(max_length=50)
+    instrument_version = models.CharField(max_length=20)
+    dimension = models.CharField(max_length=100)
+    score = models.DecimalField(max_digits=6, decimal_places=2)
+
+    municipality = models.CharField(max_length=128, blank=True)
+    org_type = models.CharField(max_length=32, blank=True)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "reports_dimension_score"
+        verbose_name = "Profile dimension score"
+        verbose_name_plural = "Profile dimension scores"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["company", "instrument_code", "instrument_version", "dimension"],
+                name="uq_dimension_score_key",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["instrument_code", "instrument_version", "dimension", "municipality"]),
+            models.Index(fields=["instrument_code", "instrument_version", "dimension", "org_type"]),
+        ]
+
+    def __str__(self):
+        return f"{self.company_id} {self.instrument_code} {self.dimension}: {self.score}"
+
+
+class ProfileBenchmark(models.Model):
+    """
+    Distribución de puntajes por (instrumento, versión, dimensión, grupo de pares).
+
+    `peer_field` es "all", "municipality" u "org_type" y `peer_value` el valor
+    del grupo ("" para "all"). `scores` es la lista ordenada de puntajes del
+    grupo: el percentil de una empresa sale de una búsqueda binaria en ella.
+    """
+    class PeerField(models.TextChoices):
+        ALL = "all", "Todo el portafolio"
+        MUNICIPALITY = "municipality", "Municipio"
+        ORG_TYPE = "org_type", "Tipo de organización"
+
+    instrument_code = models.CharField(max_length=50)
+    instrument_version = models.CharField(max_length=20)
+    dimension = models.CharField(max_length=100)
+    peer_field = models.CharField(max_length=20, choices=PeerField.choices)
+    peer_value = models.CharField(max_length=128, blank=True)
+
+    companies = models.PositiveIntegerField(default=0)
+    p25 = models.DecimalField(max_digits=6, decimal_places=2, null=True)
+    p50 = models.DecimalField(max_digits=6, decimal_places=2, null=True)
+    p75 = models.DecimalField(max_digits=6, decimal_places=2, null=True)
+    scores = models.JSONField(default=list)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "reports_profile_benchmark"
+        verbose_name = "Profile benchmark"
+        verbose_name_plural = "Profile benchmarks"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["instrument_code", "instrument_version", "dimension", "peer_field", "peer_value"],
+                name="uq_profile_benchmark_key",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.instrument_code} {self.dimension} [{self.peer_field}={self.peer_value}] n={self.companies}"
+
+
+class InventorySnapshot(models.Model):
+    """
+    Inventario completo de una empresa congelado para un periodo (p. ej. "2025").
+
+    `payload` es el JSON de todas las secciones (ver reports.snapshots)
+    comprimido con zlib; los reportes históricos leen esta única fila en vez
+    de reconstruir el estado desde las tablas vivas. `counts` (filas por
+    sección) permite listar snapshots sin descomprimir.
+    """
+    company = models.ForeignKey(COMPANY_MODEL, on_delete=models.CASCADE, related_name="inventory_snapshots")
+    period = models.CharField(max_length=16)
+    taken_at = models.DateTimeField()
+    counts = models.JSONField(default=dict)
+    payload = models.BinaryField()
+    raw_size = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "reports_inventory_snapshot"
+        verbose_name = "Inventory snapshot"
+        verbose_name_plural = "Inventory snapshots"
+        ordering = ("company", "-period")
+        constraints = [
+            models.UniqueConstraint(fields=["company", "period"], name="uq_inventory_snapshot_period")
+        ]
+
+    def __str__(self):
+        return f"{self.company_id} - {self.period}"
@@ -0,0 +1,45 @@
+# apps/reports/recompute.py
+"""
+Reconstrucción por lotes de todos los datos derivados de una empresa
+(manage.py recompute_portfolio). Cada lote corre en su propio proceso y
+lee y escribe por conjuntos: una consulta agregada y un bulk_create por
+tabla resumen, nunca empresa por empresa.
+
+Etapas:
+  - energy:      EnergyMixSummary
+  - investments: InvestmentRollup
+  - scores:      ProfileDimensionScore (los grupos de pares se recalculan
+                 una sola vez al final, con los grupos que devolvió cada lote)
+  - capability:  invalida las métricas de capacidades en la caché compartida
+                 (settings.CACHES); la web las recalcula al leerlas
+"""
+from typing import Iterable, List
+
+from .benchmarks import rebuild_dimension_scores
+from .capability import invalidate_company_capabilities
+from .energy import rebuild_energy_mix
+from .investments import rebuild_investment_rollup
+
+STAGES = ("energy", "investments", "scores", "capability")
+
+
+def recompute_chunk(company_ids: List[int], stages: Iterable[str] = STAGES) -> dict:
+    """
+    Un lote de empresas. Devuelve algo que se pueda enviar entre procesos
+    y guardar en el checkpoint: ids, filas por etapa y grupos de pares.
+    """
+    stages = set(stages)
+    counts, groups = {}, set()
+    if "energy" in stages:
+        counts["energy"] = rebuild_energy_mix(company_ids)
+    if "investments" in stages:
+        counts["investments"] = rebuild_investment_rollup(company_ids)
+    if "scores" in stages:
+        counts["scores"], groups = rebuild_dimension_scores(company_ids)
+    if "capability" in stages:
+        counts["capability_invalidated"] = invalidate_company_capabilities(company_ids)
+    return {
+        "company_ids": list(company_ids),
+        "counts": counts,
+        "groups": sorted([str(part) for part in key] for key in groups),
+    }
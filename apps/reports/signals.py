@@ -0,0 +1,223 @@
+# apps/reports/signals.py
+"""
+Receivers que mantienen las tablas resumen de reports de forma incremental:
+sólo se recalculan las empresas tocadas y siempre después del commit.
+"""
+from functools import partial
+from weakref import WeakKeyDictionary
+
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.core.signals import companies_deleted, companies_deleting, companies_merged, companies_merging
+from apps.inventory.models import (
+    DisciplineAssessment,
+    Equipment,
+    EquipmentEnergy,
+    Investment,
+    WorkforceProfile,
+)
+from apps.profiles.models import Assessment, Response
+from apps.profiles.signals import responses_saved
+from .benchmarks import forget_companies, refresh_company_benchmarks
+from .capability import invalidate_company_capability
+from .energy import refresh_company_energy_mix
+from .investments import refresh_company_investments
+from .models import COMPANY_MODEL, EnergyMixSummary, InvestmentRollup
+
+
+# claves (refresh, company_id) pendientes por conexión; el callback las saca
+_pending = WeakKeyDictionary()
+
+
+def _refresh_on_commit(refresh, *company_ids):
+    """
+    Agenda `refresh(company_id)` para después del commit, una sola vez por
+    transacción: guardar 150 respuestas seguidas no recalcula 150 veces.
+    Cada llamada agenda su callback, pero sólo el primero que corre con la
+    clave pendiente recalcula y la retira; los demás no hacen nada. Si hay
+    rollback Django descarta los callbacks y la clave queda sin efecto: la
+    próxima transacción que toque la empresa agenda el suyo y recalcula.
+    """
+    connection = transaction.get_connection()
+    pending = _pending.setdefault(connection, set())
+    for cid in {c for c in company_ids if c}:
+        key = (refresh, cid)
+        pending.add(key)
+        transaction.on_commit(partial(_run_pending, pending, key))
+
+
+def _run_pending(pending, key):
+    if key not in pending:
+        return
+    pending.discard(key)
+    refresh, company_id = key
+    refresh(company_id)
+
+
+def _refresh_energy_on_commit(*company_ids):
+    _refresh_on_commit(refresh_company_energy_mix, *company_ids)
+
+
+def _company_of_equipment(equipment_id):
+    return (
+        Equipment.all_objects.filter(pk=equipment_id).values_list("company_id", flat=True).first()
+    )
+
+
+# ---------------- Mezcla energética ----------------
+
+@receiver(pre_save, sender=Equipment)
+def _equipment_remember_company(sender, instance, raw=False, **kwargs):
+    # Si el equipo cambia de empresa hay que recalcular también la anterior
+    instance._previous_company_id = _company_of_equipment(instance.pk) if instance.pk and not raw else None
+
+
+@receiver(post_save, sender=Equipment)
+def _equipment_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _refresh_energy_on_commit(instance.company_id, getattr(instance, "_previous_company_id", None))
+
+
+@receiver(post_delete, sender=Equipment)
+def _equipment_deleted(sender, instance, **kwargs):
+    _refresh_energy_on_commit(instance.company_id)
+
+
+@receiver(post_save, sender=EquipmentEnergy)
+@receiver(post_delete, sender=EquipmentEnergy)
+def _equipment_energy_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _refresh_energy_on_commit(instance.company_id)
+
+
+@receiver(m2m_changed, sender=Equipment.energy_sources.through)
+def _equipment_energy_m2m_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    `form.save_m2m()` usa set()/add() sobre el through, que no emite post_save
+    por fila; lo cubrimos con m2m_changed.
+    """
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            _refresh_energy_on_commit(instance.company_id)
+        return
+
+    # Lado inverso: EnergySource.equipments.add/remove/clear
+    if action == "pre_clear":
+        instance._cleared_company_ids = list(
+            instance.equipments.values_list("company_id", flat=True).distinct()
+        )
+    elif action == "post_clear":
+        _refresh_energy_on_commit(*getattr(instance, "_cleared_company_ids", []))
+    elif action in ("post_add", "post_remove") and pk_set:
+        _refresh_energy_on_commit(
+            *Equipment.objects.filter(pk__in=pk_set).values_list("company_id", flat=True).distinct()
+        )
+
+
+# ---------------- Rollup de inversiones ----------------
+
+@receiver(pre_save, sender=Investment)
+def _investment_remember_company(sender, instance, raw=False, **kwargs):
+    instance._previous_company_id = (
+        Investment.all_objects.filter(pk=instance.pk).values_list("company_id", flat=True).first()
+        if instance.pk and not raw else None
+    )
+
+
+@receiver(post_save, sender=Investment)
+@receiver(post_delete, sender=Investment)
+def _investment_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _refresh_on_commit(
+        refresh_company_investments, instance.company_id, getattr(instance, "_previous_company_id", None)
+    )
+
+
+# ---------------- Matriz de capacidades (caché) ----------------
+
+@receiver(post_save, sender=WorkforceProfile)
+@receiver(post_delete, sender=WorkforceProfile)
+@receiver(post_save, sender=DisciplineAssessment)
+@receiver(post_delete, sender=DisciplineAssessment)
+def _capability_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _refresh_on_commit(invalidate_company_capability, instance.company_id)
+
+
+# ---------------- Benchmarking de perfiles ----------------
+
+@receiver(post_save, sender=Response)
+@receiver(post_delete, sender=Response)
+def _response_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # el formulario crea las respuestas con la evaluación ya cargada
+    assessment = instance._state.fields_cache.get("assessment")
+    company_id = (
+        assessment.company_id if assessment is not None
+        else Assessment.objects.filter(pk=instance.assessment_id).values_list("company_id", flat=True).first()
+    )
+    _refresh_on_commit(refresh_company_benchmarks, company_id)
+
+
+@receiver(responses_saved, sender=Response)
+def _responses_bulk_saved(sender, assessment, final=True, **kwargs):
+    if not final:
+        return  # autosave: se recalcula con el envío final
+    _refresh_on_commit(refresh_company_benchmarks, assessment.company_id)
+
+
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=Assessment)
+def _assessment_changed(sender, instance, raw=False, **kwargs):
+    # cambia cuál es la evaluación más reciente
+    if raw:
+        return
+    _refresh_on_commit(refresh_company_benchmarks, instance.company_id)
+
+
+@receiver(post_save, sender=django_apps.get_model(COMPANY_MODEL))
+def _company_changed(sender, instance, created=False, raw=False, **kwargs):
+    # municipio / tipo de organización definen los grupos de pares
+    if raw or created:
+        return
+    _refresh_on_commit(refresh_company_benchmarks, instance.pk)
+
+
+# ---------------- Borrado masivo de empresas ----------------
+
+@receiver(companies_deleting)
+def _companies_deleting(sender, company_ids, **kwargs):
+    # después ya no quedan puntajes para saber a qué grupos pertenecían
+    forget_companies(company_ids)
+
+
+@receiver(companies_deleted)
+def _companies_deleted(sender, company_ids, **kwargs):
+    for company_id in company_ids:
+        invalidate_company_capability(company_id)
+
+
+# ---------------- Fusión de empresas ----------------
+
+@receiver(companies_merging)
+def _companies_merging(sender, target_id, source_ids, **kwargs):
+    # los resúmenes de origen no se suman: se recalculan los del destino
+    EnergyMixSummary.objects.filter(company_id__in=source_ids).delete()
+    InvestmentRollup.objects.filter(company_id__in=source_ids).delete()
+    forget_companies(source_ids)
+
+
+@receiver(companies_merged)
+def _companies_merged(sender, target_id, source_ids, **kwargs):
+    _refresh_energy_on_commit(target_id)
+    _refresh_on_commit(refresh_company_investments, target_id)
+    _refresh_on_commit(refresh_company_benchmarks, target_id)
+    _refresh_on_commit(invalidate_company_capability, target_id, *source_ids)
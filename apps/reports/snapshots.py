@@ -0,0 +1,167 @@
+# apps/reports/snapshots.py
+"""
+Snapshots del inventario de una empresa por periodo.
+
+`take_snapshots(period)` congela, para cada empresa, todas las secciones del
+inventario (sólo filas vivas) en un documento JSON comprimido con zlib
+(InventorySnapshot.payload). Cada sección se guarda como columnas + filas,
+sin repetir nombres de campo por fila:
+
+    {"version": 1, "period": "2025", "taken_at": "...",
+     "company": {"id": 3, "name": ..., "tax_id": ..., ...},
+     "sections": {"equipment": {"fields": ["id", "name", ...], "rows": [[...], ...]}, ...}}
+
+Se lee una sección por consulta para un lote de empresas (no una consulta
+por empresa y sección), y se escribe con un upsert por lote.
+"""
+import json
+import zlib
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.apps import apps as django_apps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from apps.inventory.models import (
+    DisciplineAssessment,
+    Equipment,
+    EquipmentEnergy,
+    EquipmentMaintenance,
+    Investment,
+    Material,
+    PlantLayout,
+    SoftwareAsset,
+    TechnicalService,
+    WorkforceProfile,
+    WorkMethod,
+)
+from .models import COMPANY_MODEL, InventorySnapshot
+
+VERSION = 1
+SKIPPED = {"deleted_at", "updated_at", "search_vector"}
+COMPANY_FIELDS = ("id", "name", "tax_id", "municipality", "org_type")
+
+# nombre -> (queryset vivo, ruta al id de empresa, columnas extra)
+SECTIONS = {
+    "equipment": (Equipment.objects, "company_id", ()),
+    "energy_links": (
+        EquipmentEnergy.objects.filter(equipment__deleted_at__isnull=True),
+        "company_id",
+        ("energy_source__code",),
+    ),
+    "maintenance": (EquipmentMaintenance.objects, "company_id", ()),
+    "services": (TechnicalService.objects, "company_id", ()),
+    "methods": (WorkMethod.objects, "company_id", ()),
+    "layout": (PlantLayout.objects, "company_id", ()),
+    "software": (SoftwareAsset.objects, "company_id", ()),
+    "materials": (Material.objects, "company_id", ()),
+    "investments": (Investment.objects, "company_id", ()),
+    "workforce": (WorkforceProfile.objects, "company_id", ()),
+    "disciplines": (DisciplineAssessment.objects, "company_id", ()),
+}
+
+
+def _columns(model, extra=()) -> List[str]:
+    return [f.attname for f in model._meta.concrete_fields if f.attname not in SKIPPED] + list(extra)
+
+
+def _encode(document: dict) -> bytes:
+    return json.dumps(document, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+
+
+def build_documents(company_ids: List[int], period: str, taken_at=None) -> Dict[int, dict]:
+    """Documento de snapshot por empresa; una consulta por sección para todo el lote."""
+    taken_at = taken_at or timezone.now()
+    Company = django_apps.get_model(COMPANY_MODEL)
+    documents = {
+        row[0]: {
+            "version": VERSION,
+            "period": period,
+            "taken_at": taken_at,
+            "company": dict(zip(COMPANY_FIELDS, row)),
+            "sections": {},
+        }
+        for row in Company.objects.filter(pk__in=company_ids).values_list(*COMPANY_FIELDS)
+    }
+    for name, (qs, company_path, extra) in SECTIONS.items():
+        columns = _columns(qs.model, extra)
+        by_company = defaultdict(list)
+        for row in qs.filter(**{f"{company_path}__in": list(documents)}).order_by("pk").values_list(
+            company_path, *columns
+        ):
+            by_company[row[0]].append(list(row[1:]))
+        for company_id, document in documents.items():
+            document["sections"][name] = {"fields": columns, "rows": by_company.get(company_id, [])}
+    return documents
+
+
+def _snapshot(company_id: int, document: dict) -> InventorySnapshot:
+    raw = _encode(document)
+    return InventorySnapshot(
+        company_id=company_id,
+        period=document["period"],
+        taken_at=document["taken_at"],
+        counts={name: len(section["rows"]) for name, section in document["sections"].items()},
+        payload=zlib.compress(raw, 9),
+        raw_size=len(raw),
+    )
+
+
+def take_snapshots(
+    period: str,
+    company_ids: Optional[Iterable[int]] = None,
+    batch_size: int = 200,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    Congela (o re-congela) el inventario de las empresas dadas, o de todas,
+    para `period`. Devuelve el número de snapshots escritos. `progress`
+    recibe (empresas hechas, total) después de cada lote.
+    """
+    Company = django_apps.get_model(COMPANY_MODEL)
+    ids = list(company_ids) if company_ids is not None else list(
+        Company.objects.order_by("pk").values_list("pk", flat=True)
+    )
+    taken_at = timezone.now()
+    written = 0
+    for start in range(0, len(ids), batch_size):
+        documents = build_documents(ids[start:start + batch_size], period, taken_at)
+        objs = [_snapshot(company_id, doc) for company_id, doc in documents.items()]
+        with transaction.atomic():
+            InventorySnapshot.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=["company", "period"],
+                update_fields=["taken_at", "counts", "payload", "raw_size"],
+            )
+        written += len(objs)
+        if progress:
+            progress(min(start + batch_size, len(ids)), len(ids))
+    return written
+
+
+def take_snapshot(company_id: int, period: str) -> int:
+    return take_snapshots(period, [company_id])
+
+
+def load_snapshot(company_id: int, period: str) -> Optional[dict]:
+    """Documento completo del periodo (una fila, descomprimida), o None."""
+    payload = (
+        InventorySnapshot.objects.filter(company_id=company_id, period=period)
+        .values_list("payload", flat=True)
+        .first()
+    )
+    return json.loads(zlib.decompress(bytes(payload))) if payload is not None else None
+
+
+def section_rows(document: dict, name: str) -> List[dict]:
+    """Filas de una sección como dicts (para plantillas y exportaciones)."""
+    section = document["sections"].get(name) or {"fields": [], "rows": []}
+    return [dict(zip(section["fields"], row)) for row in section["rows"]]
+
+
+def company_snapshots(company_id: int):
+    """Periodos disponibles con conteos, sin leer el payload."""
+    return InventorySnapshot.objects.filter(company_id=company_id).defer("payload").order_by("-period")
@@ -0,0 +1,30 @@
+# apps/reports/tasks.py
+"""Trabajos en segundo plano de reportes (ver apps.jobs.queue)."""
+from apps.jobs.queue import task
+from .benchmarks import rebuild_benchmarks
+from .energy import rebuild_energy_mix
+from .investments import rebuild_investment_rollup
+from .snapshots import take_snapshots
+
+
+@task("reports.take_snapshots")
+def take_snapshots_job(job, period, company_ids=None):
+    def progress(done, total):
+        job.progress(done, total, f"Snapshot {period}: {done}/{total} empresas")
+
+    return {"written": take_snapshots(period, company_ids, progress=progress)}
+
+
+@task("reports.rebuild_energy_mix")
+def rebuild_energy_mix_job(job, company_ids=None):
+    return {"written": rebuild_energy_mix(company_ids)}
+
+
+@task("reports.rebuild_investment_rollup")
+def rebuild_investment_rollup_job(job, company_ids=None):
+    return {"written": rebuild_investment_rollup(company_ids)}
+
+
+@task("reports.rebuild_benchmarks")
+def rebuild_benchmarks_job(job, company_ids=None):
+    return {"written": rebuild_benchmarks(company_ids)}
@@ -0,0 +1,14 @@
+# apps/reports/urls.py
+from django.urls import path
+from . import views
+
+app_name = "reports"
+
+urlpatterns = [
+    path("energy/", views.energy_mix, name="energy_mix"),
+    path("investments/", views.investments, name="investments"),
+    path("maintenance/", views.maintenance, name="maintenance"),
+    path("capability/", views.capability, name="capability"),
+    path("snapshots/<int:company_id>/take/", views.inventory_snapshot_take, name="inventory_snapshot_take"),
+    path("snapshots/<int:company_id>/<str:period>/", views.inventory_snapshot, name="inventory_snapshot"),
+]
@@ -0,0 +1,165 @@
+# apps/reports/views.py
+from typing import Optional, Set
+
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponseBadRequest, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods
+
+from apps.core.models import Company
+from apps.core.guards import query_guard
+from apps.core.permissions import require_company_access
+from apps.core.replica import replica_reads
+from apps.core.selectors import get_allowed_company_ids
+from apps.inventory.scheduling import DUE_SOON_DAYS, maintenance_due, split_due
+from apps.jobs.queue import enqueue
+from .capability import RANK_METRICS, company_capabilities, rank_companies
+from .energy import portfolio_energy_mix
+from .investments import investment_totals
+from .snapshots import load_snapshot
+
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _scoped_company_ids(user) -> Optional[Set[int]]:
+    """
+    Empresas visibles para el usuario en reportes de portafolio.
+    None significa 'sin filtro' (superuser).
+    """
+    if getattr(user, "is_superuser", False):
+        return None
+    return get_allowed_company_ids(user)
+
+
+@replica_reads
+@login_required
+@require_http_methods(["GET"])
+def energy_mix(request):
+    """
+    Mezcla energética del portafolio, leída de la tabla resumen.
+    """
+    rows = portfolio_energy_mix(_scoped_company_ids(request.user))
+    ctx = {
+        "rows": rows,
+        "page_title": "Mezcla energética del portafolio",
+    }
+    return render(request, "reports/energy_mix.html", ctx)
+
+
+@replica_reads
+@login_required
+@require_http_methods(["GET"])
+def investments(request):
+    """
+    Inversiones del portafolio por año, fuente de financiación y motivo.
+    Filtros opcionales ?year_from=&year_to=. Lee sólo InvestmentRollup.
+    """
+    company_ids = _scoped_company_ids(request.user)
+    year_from = _int_or_none(request.GET.get("year_from"))
+    year_to = _int_or_none(request.GET.get("year_to"))
+    filters = {"company_ids": company_ids, "year_from": year_from, "year_to": year_to}
+
+    ctx = {
+        "by_year": investment_totals("year", **filters),
+        "by_funding_source": investment_totals("funding_source", **filters),
+        "by_motive": investment_totals("motive", **filters),
+        "by_category": investment_totals("category", **filters),
+        "year_from": year_from,
+        "year_to": year_to,
+        "page_title": "Inversiones del portafolio",
+    }
+    return render(request, "reports/investments.html", ctx)
+
+
+@replica_reads
+@login_required
+@require_http_methods(["GET"])
+def maintenance(request):
+    """
+    Mantenimientos vencidos y por vencer en todo el portafolio visible.
+    ?days= ajusta la ventana de 'por vencer' (por defecto DUE_SOON_DAYS).
+    """
+    days = _int_or_none(request.GET.get("days"))
+    days = days if days is not None and 0 <= days <= 365 else DUE_SOON_DAYS
+    overdue, due_soon = split_due(maintenance_due(_scoped_company_ids(request.user), within_days=days))
+    ctx = {
+        "overdue": overdue,
+        "due_soon": due_soon,
+        "within_days": days,
+        "page_title": "Mantenimientos del portafolio",
+    }
+    return render(request, "reports/maintenance.html", ctx)
+
+
+@replica_reads
+@login_required
+@require_http_methods(["GET"])
+def capability(request):
+    """
+    Ranking de empresas por brecha de saberes, índice educativo o
+    experiencia (?metric=). Métricas cacheadas por empresa.
+    """
+    metric = request.GET.get("metric", "gap_pct")
+    if metric not in RANK_METRICS:
+        metric = "gap_pct"
+
+    company_ids = _scoped_company_ids(request.user)
+    companies = Company.objects.all() if company_ids is None else Company.objects.filter(id__in=company_ids)
+    names = dict(companies.values_list("id", "name"))
+
+    rows = rank_companies(company_capabilities(names.keys()), metric)
+    for r in rows:
+        r["company_name"] = names[r["company_id"]]
+
+    ctx = {
+        "rows": rows,
+        "metric": metric,
+        "metrics": RANK_METRICS,
+        "page_title": "Capacidades del portafolio",
+    }
+    return render(request, "reports/capability.html", ctx)
+
+
+@replica_reads
+@query_guard("export")
+@login_required
+@require_company_access(lambda request, company_id, period: company_id)
+@require_http_methods(["GET"])
+def inventory_snapshot(request, company_id: int, period: str):
+    """
+    Inventario congelado de la empresa en `period`, como JSON descargable.
+    Una sola fila (InventorySnapshot), nada de las tablas vivas.
+    """
+    document = load_snapshot(company_id, period)
+    if document is None:
+        raise Http404("No hay snapshot para ese periodo.")
+    response = JsonResponse(document)
+    response["Content-Disposition"] = f'attachment; filename="inventario-{company_id}-{period}.json"'
+    return response
+
+
+@login_required
+@require_company_access(lambda request, company_id: company_id)
+@require_http_methods(["POST"])
+def inventory_snapshot_take(request, company_id: int):
+    """
+    Encola el snapshot del periodo (por defecto el año en curso) y devuelve
+    el fragmento de avance del trabajo, que se refresca solo.
+    """
+    company = get_object_or_404(Company, pk=company_id)
+    period = (request.POST.get("period") or str(timezone.localdate().year)).strip()
+    if len(period) > 16:
+        return HttpResponseBadRequest("Periodo inválido.")
+    job = enqueue(
+        "reports.take_snapshots",
+        {"period": period, "company_ids": [company.pk]},
+        company=company,
+        user=request.user,
+    )
+    return render(request, "jobs/_job_status.html", {"job": job})
@@ -45,11 +45,15 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     "django_filters",
     "apps.accounts",
     "apps.core",
     "apps.inventory",
     "apps.profiles",
+    "apps.reports",
+    "apps.audit",
+    "apps.jobs",
 ]
 
 MIDDLEWARE = [
@@ -58,6 +62,10 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.audit.middleware.AuditMiddleware',
+    'apps.core.rls.CompanyRLSMiddleware',
+    'apps.core.replica.ReplicaMiddleware',
+    'apps.core.guards.QueryGuardMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -115,6 +123,20 @@ DATABASES = {
     }
 }
 
+# Réplica de lectura opcional para reportes y listados del admin
+# (apps/core/replica.py). En tests es una segunda BD local aparte
+# (DB_REPLICA_HOST=127.0.0.1 python manage.py test apps.core.tests).
+if os.environ.get("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.environ["DB_REPLICA_HOST"],
+        "PORT": os.environ.get("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"NAME": f"test_{DATABASES['default']['NAME']}_replica"},
+    }
+DATABASE_ROUTERS = ["apps.core.replica.ReplicaRouter"]
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_CHECK_SECONDS = 5
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -170,3 +192,32 @@ PROGRAM = {
 }
 
 COMPANY_MODEL = "core.Company"
+
+# Seguridad por filas en Postgres (apps/core/rls.py): la BD filtra por las
+# empresas del usuario en cada request. Desactivada por defecto.
+COMPANY_RLS = os.environ.get("COMPANY_RLS", "False") == "True"
+
+# Caché compartida entre procesos (web y run_jobs): el catálogo de preguntas y
+# las métricas se invalidan desde donde se escriben, que ya no siempre es el
+# proceso web. La tabla la crea la migración jobs 0002 (createcachetable).
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "portal_cache",
+    }
+}
+
+# Trabajos en segundo plano (apps/jobs): un trabajo "running" sin latido en
+# este tiempo vuelve a la cola; los reintentos esperan 30s, 60s, 120s...
+JOBS_LEASE_SECONDS = int(os.environ.get("JOBS_LEASE_SECONDS", "300"))
+JOBS_RETRY_DELAY_SECONDS = 30
+
+# Límites por tipo de endpoint (apps/core/guards.py): statement_timeout de
+# Postgres en ms (SET LOCAL por request) y máximo de filas por consulta
+# (None = sin límite). Un tipo ausente no tiene límites.
+QUERY_GUARDS = {
+    "htmx": {"timeout_ms": 5000, "max_rows": 20000},
+    "page": {"timeout_ms": 15000, "max_rows": 50000},
+    "admin": {"timeout_ms": 15000, "max_rows": 20000},
+    "export": {"timeout_ms": 120000, "max_rows": None},
+}
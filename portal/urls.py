@@ -16,6 +16,7 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from django.views.generic import TemplateView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -23,5 +24,9 @@ urlpatterns = [
     path("accounts/", include("django.contrib.auth.urls")),  # ← login/logout/reset/etc.
     path("inventory/", include("apps.inventory.urls", namespace="inventory")),
     path("profiles/", include("apps.profiles.urls", namespace="profiles")),
+    path("reports/", include("apps.reports.urls", namespace="reports")),
+    path("jobs/", include("apps.jobs.urls", namespace="jobs")),
+    # service worker en la raíz para que su scope cubra todo el portal
+    path("sw.js", TemplateView.as_view(template_name="sw.js", content_type="application/javascript"), name="service_worker"),
 ]
 
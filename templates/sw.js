@@ -0,0 +1,41 @@
+// templates/sw.js — service worker del portal (servido en /sw.js para cubrir todo el sitio)
+// Red primero para los fragmentos de los tabs del inventario (listas y
+// formularios); sin conexión, la última copia en caché. Nada más se guarda:
+// ni admin, ni reportes, ni descargas. La caché se borra al cerrar sesión
+// (ver components/_offline_sync.html). Las escrituras no pasan por aquí: las
+// encola _offline_sync.html y se envían en lote a inventory/sync/.
+const CACHE = "atec-pages-v2";
+const CACHEABLE = /^\/inventory\/(equipment|services|maintenance|methods|layout|software|materials|investments|workforce|disciplines)\/\d+\/(list|new|edit)\/$/;
+
+self.addEventListener("install", () => self.skipWaiting());
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    caches.keys()
+      .then((keys) => Promise.all(keys.filter((k) => k !== CACHE).map((k) => caches.delete(k))))
+      .then(() => self.clients.claim())
+  );
+});
+
+self.addEventListener("fetch", (event) => {
+  const request = event.request;
+  const url = new URL(request.url);
+  if (request.method !== "GET" || url.origin !== self.location.origin || !CACHEABLE.test(url.pathname)) return;
+
+  // La misma URL devuelve página completa o sólo el fragmento según HX-Request
+  const key = request.headers.get("HX-Request")
+    ? request.url + (request.url.includes("?") ? "&" : "?") + "_hx=1"
+    : request.url;
+
+  event.respondWith(
+    fetch(request)
+      .then((response) => {
+        if (response.ok) {
+          const copy = response.clone();
+          caches.open(CACHE).then((cache) => cache.put(key, copy));
+        }
+        return response;
+      })
+      .catch(() => caches.match(key))
+  );
+});